@@ -0,0 +1,207 @@
+"""
+Analitik per item: menu terlaris, heatmap omzet hari x jam, dan pasangan
+item yang sering dibeli bersama.
+
+Semua baris order_items (JOIN orders) dimuat sekali ke array kolom NumPy
+yang ringkas; perhitungan berikutnya murni vectorized (bincount, matmul),
+tanpa query per permintaan dan tanpa loop Python per baris. refresh() hanya
+mengambil item dengan order_items.id di atas id terbesar yang sudah dimuat,
+lalu membuang item milik order yang dihapus sejak refresh sebelumnya.
+
+Dipakai lewat AsyncDatabase dari thread worker:
+
+    analytics = ItemAnalytics()
+    adb.submit(analytics.report, 5, since, on_result=...)
+"""
+import threading
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from database_handler import Database
+
+
+DAY_NAMES = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+
+@dataclass
+class TopItem:
+    item_id: int
+    name: str
+    qty: int
+    revenue: int
+
+
+@dataclass
+class ItemPair:
+    a: str
+    b: str
+    orders: int  # jumlah order yang berisi kedua item
+
+
+@dataclass
+class AnalyticsReport:
+    """Hasil ItemAnalytics.report."""
+    top_items: list = field(default_factory=list)  # [TopItem], omzet terbesar dulu
+    heatmap: Optional[np.ndarray] = None  # omzet (7, 24): baris Senin..Minggu, kolom jam 0..23
+    pairs: list = field(default_factory=list)  # [ItemPair], paling sering dulu
+    orders: int = 0
+    items: int = 0
+
+
+class ItemAnalytics:
+    """Kolom item di memori + perhitungan vectorized di atasnya."""
+
+    CHUNK_SIZE = 50_000
+    # Batas elemen matriks order x item per blok saat menghitung co-occurrence
+    PAIR_BLOCK_CELLS = 1 << 22
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.row_id = np.empty(0, np.int64)  # order_items.id
+        self.order_id = np.empty(0, np.int64)
+        self.item = np.empty(0, np.int32)  # menu_items.id
+        self.ts = np.empty(0, np.int64)  # created_at, epoch detik (jam lokal)
+        self.qty = np.empty(0, np.int32)
+        self.subtotal = np.empty(0, np.int64)
+        self._loaded = False
+        self._voided_at = None  # watermark voided_orders.voided_at
+
+    # ---------- Load ----------
+
+    def refresh(self, db: Database) -> int:
+        """Muat item baru (dan buang item order yang dihapus); return jumlah item baru."""
+        with self._lock:
+            # Watermark dibaca sebelum item, jadi order yang dihapus di antaranya
+            # tetap terbuang di refresh berikutnya (membuang dua kali tidak apa-apa)
+            voided_at = db.voided_watermark()
+            if self._loaded:
+                self._drop_orders(db.list_voided_since(self._voided_at))
+                after = int(self.row_id.max()) if len(self.row_id) else 0
+            else:
+                after = None
+
+            chunks = [np.array(rows, dtype=np.int64).reshape(-1, 6)
+                      for rows in db.iter_item_facts(after, self.CHUNK_SIZE)]
+            added = self._append(chunks, dedupe=after is None)
+            self._voided_at = voided_at
+            self._loaded = True
+            return added
+
+    def _append(self, chunks: list, dedupe: bool) -> int:
+        if not chunks:
+            return 0
+        new = np.concatenate(chunks)
+        if dedupe:
+            # Order yang sedang diarsipkan bisa sesaat ada di arsip dan di database utama
+            _, first = np.unique(new[:, 0], return_index=True)
+            new = new[first]
+
+        self.row_id = np.concatenate([self.row_id, new[:, 0]])
+        self.order_id = np.concatenate([self.order_id, new[:, 1]])
+        self.item = np.concatenate([self.item, new[:, 2].astype(np.int32)])
+        self.ts = np.concatenate([self.ts, new[:, 3]])
+        self.qty = np.concatenate([self.qty, new[:, 4].astype(np.int32)])
+        self.subtotal = np.concatenate([self.subtotal, new[:, 5]])
+        return len(new)
+
+    def _drop_orders(self, order_ids: list[int]):
+        if not order_ids:
+            return
+        keep = ~np.isin(self.order_id, np.asarray(order_ids, dtype=np.int64))
+        if keep.all():
+            return
+        for name in ("row_id", "order_id", "item", "ts", "qty", "subtotal"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    # ---------- Perhitungan ----------
+
+    def _window(self, since: Optional[datetime]) -> np.ndarray:
+        if since is None:
+            return np.ones(len(self.ts), dtype=bool)
+        # Epoch dari teks jam lokal, jadi dihitung seolah UTC juga di sini
+        epoch = int((since - datetime(1970, 1, 1)).total_seconds())
+        return self.ts >= epoch
+
+    def top_items(self, n: int = 5, since: Optional[datetime] = None) -> list[tuple[int, int, int]]:
+        """(item_id, qty, omzet) n item dengan omzet terbesar."""
+        mask = self._window(since)
+        item = self.item[mask]
+        if not len(item):
+            return []
+        revenue = np.bincount(item, weights=self.subtotal[mask])
+        qty = np.bincount(item, weights=self.qty[mask])
+        ranked = np.argsort(-revenue, kind="stable")[:n]
+        return [(int(i), int(qty[i]), int(revenue[i])) for i in ranked if revenue[i] > 0]
+
+    def heatmap(self, since: Optional[datetime] = None) -> np.ndarray:
+        """Omzet per (hari, jam) sebagai array (7, 24); hari 0 = Senin."""
+        mask = self._window(since)
+        ts = self.ts[mask]
+        # 1970-01-01 adalah Kamis (index 3 kalau Senin = 0)
+        slot = ((ts // 86400 + 3) % 7) * 24 + (ts % 86400) // 3600
+        return np.bincount(slot, weights=self.subtotal[mask], minlength=7 * 24).reshape(7, 24)
+
+    def co_occurrence(self, since: Optional[datetime] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (codes, counts): counts[a, b] = jumlah order yang berisi item codes[a]
+        dan codes[b]; diagonal = jumlah order per item.
+        Dihitung sebagai M.T @ M dengan M matriks 0/1 order x item, per blok
+        rentang order id (item ganda dalam satu order tetap bernilai 1).
+        """
+        mask = self._window(since)
+        item = self.item[mask]
+        codes = np.flatnonzero(np.bincount(item)) if len(item) else np.empty(0, np.int64)
+        k = len(codes)
+        counts = np.zeros((k, k), dtype=np.int64)
+        if not k:
+            return codes, counts
+
+        # Kode item rapat 0..k-1 tanpa sort
+        lookup = np.zeros(int(codes[-1]) + 1, dtype=np.int64)
+        lookup[codes] = np.arange(k)
+        order = np.argsort(self.order_id[mask])
+        ids = self.order_id[mask][order]
+        col = lookup[item[order]]
+
+        block = max(1, self.PAIR_BLOCK_CELLS // k)
+        edges = np.arange(ids[0], ids[-1] + block + 1, block)
+        bounds = np.searchsorted(ids, edges)
+        m = np.zeros((block, k), dtype=np.float32)
+        for lo, start, end in zip(edges, bounds[:-1], bounds[1:]):
+            if start == end:
+                continue
+            m[:] = 0
+            m[ids[start:end] - lo, col[start:end]] = 1
+            counts += (m.T @ m).astype(np.int64)
+        return codes, counts
+
+    def top_pairs(self, n: int = 5, since: Optional[datetime] = None) -> list[tuple[int, int, int]]:
+        """(item_id_a, item_id_b, jumlah order) n pasangan paling sering."""
+        codes, counts = self.co_occurrence(since)
+        a, b = np.triu_indices(len(codes), k=1)
+        together = counts[a, b]
+        ranked = np.argsort(-together, kind="stable")[:n]
+        return [(int(codes[a[i]]), int(codes[b[i]]), int(together[i])) for i in ranked if together[i] > 0]
+
+    def _count_orders(self, mask: np.ndarray) -> int:
+        ids = self.order_id[mask]
+        return int(np.count_nonzero(np.bincount(ids - ids.min()))) if len(ids) else 0
+
+    def report(self, db: Database, top_n: int = 5, since: Optional[datetime] = None) -> AnalyticsReport:
+        """refresh() lalu hitung semuanya; nama item diambil dari katalog menu."""
+        self.refresh(db)
+        names = {m.id: m.name for m in db.get_menu(include_inactive=True)}
+        with self._lock:
+            mask = self._window(since)
+            return AnalyticsReport(
+                top_items=[TopItem(i, names.get(i, f"#{i}"), q, r) for i, q, r in self.top_items(top_n, since)],
+                heatmap=self.heatmap(since),
+                pairs=[ItemPair(names.get(a, f"#{a}"), names.get(b, f"#{b}"), c)
+                       for a, b, c in self.top_pairs(top_n, since)],
+                orders=self._count_orders(mask),
+                items=int(mask.sum()),
+            )
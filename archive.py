@@ -0,0 +1,43 @@
+"""
+Pindahkan order lama dari pesanan_warung.db ke file arsip per tahun/bulan
+(<nama db>_archive/orders_2024.db, ...), supaya database utama tetap kecil.
+
+Aman dijalankan saat aplikasi kasir hidup: order dipindah per batch kecil
+dengan jeda, dan aplikasi tetap bisa membaca order yang sudah diarsipkan.
+Ruang kosong di database utama dipakai ulang untuk order baru; ukuran file
+baru mengecil setelah VACUUM.
+
+    python archive.py --older-than-days 365 --by year
+    python archive.py --older-than-days 90 --by month --batch-size 200
+"""
+import argparse
+import sys
+
+from database_handler import Database
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Arsipkan order lama ke file per tahun/bulan")
+    ap.add_argument("--db", default="pesanan_warung.db")
+    ap.add_argument("--archive-dir", help="default: <nama db>_archive di sebelah database")
+    ap.add_argument("--older-than-days", type=int, default=Database.ARCHIVE_AFTER_DAYS)
+    ap.add_argument("--by", choices=Database.ARCHIVE_GRANULARITIES, default="year")
+    ap.add_argument("--batch-size", type=int, default=Database.ARCHIVE_BATCH_SIZE)
+    ap.add_argument("--pause-ms", type=float, default=Database.ARCHIVE_BATCH_PAUSE * 1000,
+                    help="jeda antar batch supaya kasir tidak tertahan")
+    args = ap.parse_args(argv)
+
+    db = Database(args.db, wal=True, archive_dir=args.archive_dir)
+    try:
+        db.init_schema()
+        result = db.archive_orders(args.older_than_days, args.by, args.batch_size, args.pause_ms / 1000)
+    finally:
+        db.close()
+
+    print(f"{result.moved} order dipindah dalam {result.batches} batch "
+          f"({result.elapsed_s:.1f} s) -> {', '.join(result.partitions) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
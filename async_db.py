@@ -0,0 +1,166 @@
+import threading
+
+from database_handler import Database
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class DbRequest:
+    """Satu panggilan Database yang dijalankan di thread worker."""
+
+    __slots__ = ("method", "args", "kwargs", "on_result", "on_error", "key", "cancelled")
+
+    def __init__(self, method, args, kwargs, on_result, on_error, key):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self):
+        """Hasil request ini tidak akan dikirim ke callback (kalau belum jalan, query dilewati)."""
+        self.cancelled = True
+
+
+class _DbTask(QRunnable):
+    def __init__(self, owner: "AsyncDatabase", req: DbRequest):
+        super().__init__()
+        self.owner = owner
+        self.req = req
+
+    def run(self):
+        req = self.req
+        if req.cancelled:
+            return
+        try:
+            db = self.owner._thread_db()
+            if callable(req.method):
+                result = req.method(db, *req.args, **req.kwargs)
+            else:
+                result = getattr(db, req.method)(*req.args, **req.kwargs)
+        except Exception as e:
+            self.owner._finished.emit(req, None, e)
+        else:
+            self.owner._finished.emit(req, result, None)
+
+
+class AsyncDatabase(QObject):
+    """
+    Facade async di atas Database supaya query tidak jalan di thread GUI.
+
+    Setiap thread worker memegang clone Database sendiri (aturan sqlite3:
+    satu koneksi per thread). Tulis (create_order, delete_order, ...) lewat
+    pool dengan satu thread supaya berurutan; baca lewat pool terpisah.
+    Hasil dikirim balik ke thread GUI lewat signal, lalu ke callback.
+
+    Request dengan `key` yang sama saling menggantikan: request lama otomatis
+    dibatalkan, jadi hasil basi (mis. detail order yang sudah tidak dipilih)
+    tidak pernah ditampilkan.
+    """
+
+    WRITE_METHODS = {
+        "init_schema", "create_order", "create_orders_bulk", "delete_order",
+        "reserve_order_nos", "release_order_nos", "void_orders", "reclaim_space",
+        "add_menu_item", "update_menu_item", "archive_orders", "register_feed_listener",
+        "unregister_feed_listener", "prune_order_events", "enable_incremental_vacuum",
+    }
+    READ_THREADS = 2
+
+    # (request, result, error) — dipancarkan dari thread worker
+    _finished = Signal(object, object, object)
+
+    def __init__(self, db: Database, parent=None):
+        super().__init__(parent)
+        if db.path == ":memory:" or db.path.startswith("file::memory:"):
+            raise ValueError("AsyncDatabase membutuhkan database berbasis file")
+
+        self.db = db
+        # Thread ident -> clone. Bukan threading.local: thread QThreadPool bukan
+        # buatan Python, jadi state lokalnya tidak bertahan antar task
+        self._clones = {}
+        self._clones_lock = threading.Lock()
+        self._latest = {}  # key -> DbRequest terakhir
+        self._closed = False
+
+        # Thread worker tidak pernah kedaluwarsa: tiap thread memegang clone
+        # (dua koneksi di WAL) yang baru ditutup di close(); kalau thread mati
+        # saat idle, thread penggantinya membuka clone baru dan koneksi menumpuk
+        self._read_pool = QThreadPool(self)
+        self._read_pool.setMaxThreadCount(self.READ_THREADS)
+        self._read_pool.setExpiryTimeout(-1)
+        self._write_pool = QThreadPool(self)
+        self._write_pool.setMaxThreadCount(1)
+        self._write_pool.setExpiryTimeout(-1)
+
+        self._finished.connect(self._on_finished)
+
+    def submit(self, method, *args, on_result=None, on_error=None, key=None, **kwargs) -> DbRequest:
+        """
+        Jalankan db.<method>(*args, **kwargs) di thread worker.
+        method juga boleh fungsi fn(db, *args, **kwargs) untuk pekerjaan baca
+        yang lebih besar (mis. ekspor); fungsi selalu lewat pool baca.
+        on_result(result) / on_error(exc) dipanggil di thread GUI.
+        """
+        if self._closed:
+            raise RuntimeError("AsyncDatabase sudah ditutup")
+
+        req = DbRequest(method, args, kwargs, on_result, on_error, key)
+        if key is not None:
+            prev = self._latest.get(key)
+            if prev is not None:
+                prev.cancel()
+            self._latest[key] = req
+
+        pool = self._write_pool if method in self.WRITE_METHODS else self._read_pool
+        pool.start(_DbTask(self, req))
+        return req
+
+    def cancel(self, key):
+        """Batalkan request terakhir dengan key tertentu."""
+        req = self._latest.pop(key, None)
+        if req is not None:
+            req.cancel()
+
+    def close(self):
+        """Tunggu semua request selesai lalu tutup koneksi milik thread worker."""
+        self._closed = True
+        for req in self._latest.values():
+            req.cancel()
+        self._latest.clear()
+
+        self._read_pool.waitForDone()
+        self._write_pool.waitForDone()
+
+        with self._clones_lock:
+            clones, self._clones = self._clones, {}
+        for db in clones.values():
+            db.close()
+
+    def _thread_db(self) -> Database:
+        ident = threading.get_ident()
+        db = self._clones.get(ident)
+        if db is None:
+            # check_same_thread=False hanya supaya close() bisa dipanggil dari
+            # thread GUI setelah pool selesai; selama hidup clone hanya dipakai
+            # oleh thread pemiliknya
+            db = self.db.clone(check_same_thread=False)
+            with self._clones_lock:
+                self._clones[ident] = db
+        return db
+
+    @Slot(object, object, object)
+    def _on_finished(self, req: DbRequest, result, error):
+        if req.key is not None and self._latest.get(req.key) is req:
+            del self._latest[req.key]
+        if req.cancelled:
+            return
+
+        if error is not None:
+            if req.on_error is not None:
+                req.on_error(error)
+            else:
+                print(f"Warning: {getattr(req.method, '__name__', req.method)} gagal: {error!r}")
+        elif req.on_result is not None:
+            req.on_result(result)
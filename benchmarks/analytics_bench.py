@@ -0,0 +1,102 @@
+"""
+Analitik item (analytics.ItemAnalytics) vs cara naif: GROUP BY SQL per
+permintaan dan loop Python atas sqlite3.Row. Mengukur load awal, refresh
+incremental setelah order baru, dan waktu hitung top-N / heatmap / pasangan.
+
+    python -m benchmarks.analytics_bench --orders 450000 --db /tmp/analytics.db
+"""
+import argparse
+import os
+import sys
+import time
+
+from collections import Counter
+from itertools import combinations
+
+from analytics import ItemAnalytics
+from benchmarks.datagen import build_database
+from database_handler import Database
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def sql_top_items(db: Database, n: int):
+    return db.reader.execute("""
+        SELECT item_id, SUM(qty), SUM(subtotal) AS revenue
+        FROM order_items GROUP BY item_id ORDER BY revenue DESC LIMIT ?
+    """, (n,)).fetchall()
+
+
+def sql_heatmap(db: Database):
+    return db.reader.execute("""
+        SELECT (CAST(strftime('%w', o.created_at) AS INTEGER) + 6) % 7,
+               CAST(strftime('%H', o.created_at) AS INTEGER), SUM(i.subtotal)
+        FROM order_items i JOIN orders o ON o.id = i.order_id
+        GROUP BY 1, 2
+    """).fetchall()
+
+
+def python_pairs(db: Database, n: int):
+    """Loop Python per baris: kelompokkan item per order lalu hitung pasangan."""
+    baskets = {}
+    for r in db.reader.execute("SELECT order_id, item_id FROM order_items"):
+        baskets.setdefault(r["order_id"], set()).add(r["item_id"])
+    pairs = Counter()
+    for items in baskets.values():
+        pairs.update(combinations(sorted(items), 2))
+    return pairs.most_common(n)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=450_000)
+    ap.add_argument("--db", default="analytics_bench.db")
+    ap.add_argument("--new-orders", type=int, default=200, help="order baru sebelum refresh incremental")
+    ap.add_argument("--reuse", action="store_true", help="pakai --db yang sudah ada")
+    args = ap.parse_args(argv)
+
+    if not (args.reuse and os.path.exists(args.db)):
+        build_database(args.db, args.orders)
+
+    db = Database(args.db, wal=True)
+    db.init_schema()
+    analytics = ItemAnalytics()
+
+    loaded, load_ms = timed(analytics.refresh, db)
+    mem_mb = sum(getattr(analytics, c).nbytes for c in
+                 ("row_id", "order_id", "item", "ts", "qty", "subtotal")) / 1e6
+    print(f"load awal: {loaded} item, {load_ms:.0f} ms, kolom {mem_mb:.1f} MB")
+
+    menu = db.get_menu()
+    for k in range(args.new_orders):
+        m = menu[k % len(menu)]
+        db.create_order([{"item_id": m.id, "name": m.name, "price": m.price, "qty": 1, "note": ""}])
+    added, refresh_ms = timed(analytics.refresh, db)
+    print(f"refresh incremental: {added} item baru, {refresh_ms:.1f} ms")
+
+    print(f"{'':>10} {'numpy ms':>9} {'naif ms':>9}")
+    _, np_ms = timed(analytics.top_items, 5)
+    _, naive_ms = timed(sql_top_items, db, 5)
+    print(f"{'top-N':>10} {np_ms:9.1f} {naive_ms:9.1f}  (SQL GROUP BY)")
+    _, np_ms = timed(analytics.heatmap)
+    _, naive_ms = timed(sql_heatmap, db)
+    print(f"{'heatmap':>10} {np_ms:9.1f} {naive_ms:9.1f}  (SQL GROUP BY)")
+    np_pairs, np_ms = timed(analytics.top_pairs, 5)
+    py_pairs, naive_ms = timed(python_pairs, db, 5)
+    print(f"{'pasangan':>10} {np_ms:9.1f} {naive_ms:9.1f}  (loop Python)")
+
+    if [c for *_, c in np_pairs] != [c for _, c in py_pairs]:
+        print("GAGAL: hasil pasangan berbeda")
+        return 1
+    _, report_ms = timed(analytics.report, db, 5)
+    print(f"report lengkap (refresh + semua): {report_ms:.1f} ms")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Simulasi kasir menekan panah bawah di daftar View Orders: tiap baris
+menampilkan detail item (lalu sesekali cetak struk dan melihat grafik
+bulan yang sama), dengan dan tanpa ResultCache + prefetch tetangga.
+
+Latensi yang diukur adalah yang dirasakan GUI: peek cache, atau query
+list_order_items kalau belum ada. Prefetch di aplikasi berjalan di thread
+worker; di sini waktunya dicatat terpisah.
+
+    python -m benchmarks.cache_bench --db /tmp/analytics.db --rows 2000
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from database_handler import Database
+from result_cache import ResultCache
+
+
+PREFETCH_RADIUS = 10
+
+
+def percentile(samples: list, p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def browse(db: Database, order_ids: list, print_every: int) -> dict:
+    detail_ms, prefetch_ms, print_ms = [], [], []
+    for row, order_id in enumerate(order_ids):
+        t0 = time.perf_counter()
+        items = db.peek_order_items(order_id)
+        if items is None:
+            items = db.list_order_items(order_id)
+        detail_ms.append((time.perf_counter() - t0) * 1000)
+
+        if db.cache is not None:
+            neighbours = order_ids[row + 1:row + 1 + PREFETCH_RADIUS] + order_ids[max(0, row - PREFETCH_RADIUS):row]
+            t0 = time.perf_counter()
+            db.prefetch_order_items(neighbours)
+            prefetch_ms.append((time.perf_counter() - t0) * 1000)
+
+        if row % print_every == 0:
+            t0 = time.perf_counter()
+            order, items = db.get_order_with_items(order_id)
+            created = order.created_at
+            db.get_monthly_sales(int(created[5:7]), int(created[:4]))
+            print_ms.append((time.perf_counter() - t0) * 1000)
+
+    result = {
+        "detail_p50": statistics.median(detail_ms),
+        "detail_p99": percentile(detail_ms, 99),
+        "print_p50": statistics.median(print_ms),
+    }
+    if prefetch_ms:
+        result["prefetch_p50"] = statistics.median(prefetch_ms)
+    return result
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--db", required=True, help="database hasil benchmarks.datagen")
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--print-every", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    plain = Database(args.db, wal=True)
+    order_ids = [r.id for r in plain.list_orders_page(limit=args.rows)]
+
+    results = {"tanpa cache": browse(plain, order_ids, args.print_every)}
+    plain.close()
+
+    cache = ResultCache()
+    cached = Database(args.db, wal=True, cache=cache)
+    results["cache+prefetch"] = browse(cached, order_ids, args.print_every)
+    # Bolak-balik lagi (panah atas): semuanya sudah di cache
+    results["kembali (cache)"] = browse(cached, order_ids[::-1], args.print_every)
+    cached.close()
+
+    print(f"{len(order_ids)} baris")
+    print(f"{'':>16} {'detail p50':>11} {'detail p99':>11} {'struk p50':>10} {'prefetch p50':>13}")
+    for name, r in results.items():
+        prefetch = f"{r['prefetch_p50']:13.3f}" if "prefetch_p50" in r else f"{'-':>13}"
+        print(f"{name:>16} {r['detail_p50']:11.3f} {r['detail_p99']:11.3f} {r['print_p50']:10.3f} {prefetch}")
+    print("cache:", cache.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Ukuran file database sebelum/sesudah order_items dinormalisasi (item_id
+ke menu_items, bukan item_name per baris).
+
+Membuat database sintetis (skema baru), menurunkan salinan berskema lama
+(item_name TEXT) dari data yang sama, lalu memigrasi salinan lama itu lewat
+init_schema. Ketiga file di-VACUUM sebelum diukur.
+
+    python -m benchmarks.catalog_size --orders 200000 --dir /tmp/catalog
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from benchmarks.datagen import build_database
+from database_handler import Database
+
+
+LEGACY_ORDER_ITEMS = """
+CREATE TABLE order_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id INTEGER NOT NULL,
+    item_name TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    qty INTEGER NOT NULL,
+    note TEXT,
+    subtotal INTEGER NOT NULL,
+    FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+)
+"""
+
+
+def make_legacy_copy(src: str, dst: str):
+    """Salin orders + order_items dengan item_name (skema sebelum katalog menu)."""
+    if os.path.exists(dst):
+        os.remove(dst)
+    conn = sqlite3.connect(dst)
+    conn.execute("""
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_no TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL,
+            total INTEGER NOT NULL
+        )
+    """)
+    conn.execute(LEGACY_ORDER_ITEMS)
+    conn.execute("ATTACH DATABASE ? AS src", (src,))
+    with conn:
+        conn.execute("INSERT INTO orders SELECT id, order_no, created_at, total FROM src.orders")
+        conn.execute("""
+            INSERT INTO order_items(id, order_id, item_name, price, qty, note, subtotal)
+            SELECT i.id, i.order_id, m.name, i.price, i.qty, i.note, i.subtotal
+            FROM src.order_items i JOIN src.menu_items m ON m.id = i.item_id
+        """)
+    conn.execute("DETACH DATABASE src")
+    conn.execute("CREATE INDEX idx_orders_created_at ON orders(created_at)")
+    conn.execute("CREATE INDEX idx_order_items_order_id ON order_items(order_id)")
+    conn.close()
+
+
+def vacuum_size(path: str) -> int:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path)
+
+
+def table_bytes(path: str, name: str) -> int:
+    """Byte halaman tabel + index-nya (butuh SQLite dengan dbstat; 0 kalau tidak ada)."""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = ? "
+            "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?)",
+            (name, name)
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=200_000)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--dir", default=".")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.dir, exist_ok=True)
+    normalized = os.path.join(args.dir, "catalog_normalized.db")
+    legacy = os.path.join(args.dir, "catalog_legacy.db")
+    migrated = os.path.join(args.dir, "catalog_migrated.db")
+
+    build_database(normalized, args.orders, args.years)
+    make_legacy_copy(normalized, legacy)
+    if os.path.exists(migrated):
+        os.remove(migrated)
+    with open(legacy, "rb") as f_src, open(migrated, "wb") as f_dst:
+        f_dst.write(f_src.read())
+
+    t0 = time.perf_counter()
+    db = Database(migrated, order_no_width=4)
+    db.init_schema()
+    db.close()
+    migrate_s = time.perf_counter() - t0
+
+    sizes = {name: vacuum_size(path) for name, path in
+             (("legacy", legacy), ("normalized", normalized), ("migrated", migrated))}
+
+    print(f"{args.orders} order")
+    print(f"{'':>12} {'file MB':>9} {'order_items MB':>15}")
+    for name, path in (("legacy", legacy), ("normalized", normalized), ("migrated", migrated)):
+        items_mb = table_bytes(path, "order_items") / 1e6
+        print(f"{name:>12} {sizes[name] / 1e6:9.2f} {items_mb:15.2f}")
+    saved = 1 - sizes["migrated"] / sizes["legacy"]
+    print(f"migrasi: {migrate_s:.2f} s, file {saved:.1%} lebih kecil")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Bandingkan waktu per refresh grafik penjualan: rebuild penuh (cara lama:
+figure.clear() + tight_layout() + draw()) vs SalesChart yang memakai ulang
+axes dan batang.
+
+Headless (backend Agg), tidak butuh display Qt.
+
+    python -m benchmarks.chart_refresh --refreshes 200
+"""
+import argparse
+import calendar
+import random
+import statistics
+import sys
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from sales_chart import MONTH_NAMES, SalesChart, format_rupiah_axis
+
+
+def legacy_refresh(figure: Figure, canvas, month: int, year: int, sales_data):
+    """Salinan refresh_sales_chart sebelum SalesChart, sebagai pembanding."""
+    _, num_days = calendar.monthrange(year, month)
+    sales_dict = {day: total for day, total in sales_data}
+    days = list(range(1, num_days + 1))
+    totals = [sales_dict.get(day, 0) for day in days]
+
+    figure.clear()
+    ax = figure.add_subplot(111)
+    ax.bar(days, totals, color='#4A90D9', edgecolor='#2E5D8C', linewidth=0.5)
+    ax.set_xlabel('Tanggal', fontsize=9)
+    ax.set_ylabel('Total Penjualan (Rp)', fontsize=9)
+    ax.set_title(f'GRAFIK PENJUALAN: {MONTH_NAMES[month - 1]} {year}', fontsize=11, fontweight='bold')
+    ax.set_xticks(days)
+    ax.set_xticklabels(days, rotation=45 if num_days > 20 else 0, ha='right' if num_days > 20 else 'center', fontsize=7)
+    ax.yaxis.set_major_formatter(format_rupiah_axis)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    ax.set_axisbelow(True)
+    figure.tight_layout()
+    canvas.draw()
+
+
+def make_inputs(n: int, seed: int = 42):
+    """Urutan (month, year, sales_data) seperti orang menahan panah spinbox tahun."""
+    rng = random.Random(seed)
+    inputs = []
+    for i in range(n):
+        month = 1 + (i // 10) % 12
+        year = 2020 + i % 10
+        _, num_days = calendar.monthrange(year, month)
+        sales = [(d, rng.randrange(50_000, 2_000_000, 1000)) for d in range(1, num_days + 1)]
+        inputs.append((month, year, sales))
+    return inputs
+
+
+def _measure(fn, inputs) -> list[float]:
+    times = []
+    for month, year, sales in inputs:
+        t0 = time.perf_counter()
+        fn(month, year, sales)
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--refreshes", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    inputs = make_inputs(args.refreshes)
+
+    fig_old = Figure(figsize=(8, 3), dpi=100)
+    canvas_old = FigureCanvasAgg(fig_old)
+    old = _measure(lambda m, y, s: legacy_refresh(fig_old, canvas_old, m, y, s), inputs)
+
+    fig_new = Figure(figsize=(8, 3), dpi=100)
+    canvas_new = FigureCanvasAgg(fig_new)
+    chart = SalesChart(fig_new, canvas_new)
+    # draw_idle pada canvas Agg langsung menggambar, jadi perbandingannya adil
+    new = _measure(chart.update, inputs)
+
+    print(f"{'':>12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, t in (("rebuild", old), ("incremental", new)):
+        p95 = statistics.quantiles(t, n=20)[-1]
+        print(f"{name:>12} {statistics.mean(t):9.2f} {statistics.median(t):9.2f} {p95:9.2f}")
+    print(f"speedup: {statistics.mean(old) / statistics.mean(new):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
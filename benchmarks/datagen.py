@@ -0,0 +1,150 @@
+"""
+Generator data sintetis (seeded) untuk benchmark: menu warung yang realistis
+dan N order yang tersebar di beberapa tahun, dengan jam ramai pagi hari.
+
+    python -m benchmarks.datagen --orders 100000 --years 3 --out bench.db
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from database_handler import Database
+
+
+# Sama dengan Database.DEFAULT_MENU (katalog database baru), urutan sesuai MENU_WEIGHTS
+MENU = [
+    ("Nasi Kuning", 10000),
+    ("Nasi Goreng", 12000),
+    ("Mie Tiaw Goreng", 15000),
+    ("Bubur Ayam", 8000),
+    ("Lontong Sayur", 10000),
+    ("Es Teh", 3000),
+    ("Teh Hangat", 5000),
+    ("Air Mineral", 4000),
+    ("Es Jeruk Kecil", 7000),
+]
+# Menu makanan lebih sering dipesan daripada minuman
+MENU_WEIGHTS = [14, 16, 8, 10, 9, 18, 10, 9, 6]
+
+NOTES = ["tanpa sambal", "pedas", "kurang manis", "dibungkus", "tidak pakai bawang", "extra telur"]
+
+# Jam buka warung sarapan dan bobot keramaian tiap jam
+HOURS = [6, 7, 8, 9, 10, 11, 12, 13]
+HOUR_WEIGHTS = [8, 20, 24, 16, 10, 8, 9, 5]
+
+
+def generate_orders(n_orders: int, years: int, seed: int, end: Optional[datetime] = None):
+    """
+    Yield (created_at: datetime, items: [{name, price, qty, note}]) urut waktu.
+    Output sama persis untuk seed yang sama.
+    """
+    rng = random.Random(seed)
+    end = end or datetime(2026, 1, 1)
+    start = end - timedelta(days=365 * years)
+    span = (end - start).total_seconds()
+
+    # Offset hari di dalam rentang, diurutkan supaya id ikut urutan waktu
+    days = sorted(rng.randrange(int(span // 86400)) for _ in range(n_orders))
+    for day in days:
+        hour = rng.choices(HOURS, HOUR_WEIGHTS)[0]
+        created = start + timedelta(days=day, hours=hour, seconds=rng.randrange(3600))
+
+        picks = rng.sample(range(len(MENU)), k=rng.choices([1, 2, 3, 4, 5], [30, 35, 20, 10, 5])[0])
+        picks.sort(key=lambda i: -MENU_WEIGHTS[i] * rng.random())
+        items = []
+        for i in picks:
+            name, price = MENU[i]
+            items.append({
+                "name": name,
+                "price": price,
+                "qty": rng.choices([1, 2, 3, 4], [60, 25, 10, 5])[0],
+                "note": rng.choice(NOTES) if rng.random() < 0.15 else "",
+            })
+        yield created, items
+
+
+def populate(db: Database, n_orders: int, years: int = 3, seed: int = 1234, batch: int = 10_000) -> None:
+    """
+    Isi database kosong (schema sudah di-init) dengan order sintetis.
+    Insert langsung per batch dalam satu transaksi besar, jauh lebih cepat
+    daripada create_order satu per satu; nomor urut harian tetap konsisten
+    dengan order_seq.
+    """
+    conn = db.conn
+    item_ids = {m.name: m.id for m in db.get_menu(include_inactive=True)}
+    seq = {}  # 'YYYYMMDD' -> nomor terakhir
+    cur = conn.cursor()
+    cur.execute("BEGIN;")
+    try:
+        next_id = (cur.execute("SELECT COALESCE(MAX(id), 0) FROM orders").fetchone()[0]) + 1
+        orders, rows = [], []
+        for created, items in generate_orders(n_orders, years, seed):
+            day = created.strftime("%Y%m%d")
+            seq[day] = seq.get(day, 0) + 1
+            total = sum(it["price"] * it["qty"] for it in items)
+            orders.append((next_id, db._format_order_no(day, seq[day]),
+                           created.strftime("%Y-%m-%d %H:%M:%S"), total))
+            for it in items:
+                rows.append((next_id, item_ids[it["name"]], it["price"], it["qty"], it["note"],
+                             it["price"] * it["qty"]))
+            next_id += 1
+
+            if len(orders) >= batch:
+                _flush(cur, orders, rows)
+                orders, rows = [], []
+        _flush(cur, orders, rows)
+
+        cur.executemany("""
+            INSERT INTO order_seq(day, last_seq) VALUES(?, ?)
+            ON CONFLICT(day) DO UPDATE SET last_seq = MAX(last_seq, excluded.last_seq)
+        """, seq.items())
+        cur.execute("COMMIT;")
+    except Exception:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK;")
+        raise
+
+
+def _flush(cur, orders, rows):
+    cur.executemany("INSERT INTO orders(id, order_no, created_at, total) VALUES(?, ?, ?, ?)", orders)
+    cur.executemany(
+        "INSERT INTO order_items(order_id, item_id, price, qty, note, subtotal) VALUES(?, ?, ?, ?, ?, ?)",
+        rows
+    )
+
+
+def build_database(path: str, n_orders: int, years: int = 3, seed: int = 1234) -> None:
+    """Buat file database baru berisi n_orders order sintetis."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db = Database(path, order_no_width=4)
+    try:
+        db.init_schema()
+        populate(db, n_orders, years, seed)
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Generator database sintetis untuk benchmark")
+    ap.add_argument("--orders", type=int, default=100_000)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    build_database(args.out, args.orders, args.years, args.seed)
+    size_mb = os.path.getsize(args.out) / 1e6
+    print(f"{args.orders} order -> {args.out} ({size_mb:.1f} MB, {time.perf_counter() - t0:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Microbenchmark jalur panas Database dan ReceiptPrinter.generate_receipt_html
+pada database sintetis berbagai ukuran. Hasil ditulis sebagai JSON supaya
+dua run (mis. sebelum/sesudah perubahan) bisa dibandingkan.
+
+Tidak butuh display Qt.
+
+    python -m benchmarks.db_bench --sizes 1000,100000 --out after.json
+    python -m benchmarks.db_bench --sizes 1000,100000 --out after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+from datetime import datetime
+
+from benchmarks.datagen import MENU, build_database
+from database_handler import Database
+
+
+def _stats(samples_s: list[float]) -> dict:
+    us = sorted(s * 1e6 for s in samples_s)
+    return {
+        "n": len(us),
+        "mean_us": round(statistics.mean(us), 2),
+        "p50_us": round(us[len(us) // 2], 2),
+        "p95_us": round(us[min(len(us) - 1, int(len(us) * 0.95))], 2),
+        "min_us": round(us[0], 2),
+    }
+
+
+def _time_calls(fn, args_list) -> dict:
+    samples = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    return _stats(samples)
+
+
+def run_size(path: str, iterations: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    db = Database(path, order_no_width=4)
+    results = {}
+
+    max_id = db.conn.execute("SELECT MAX(id) FROM orders").fetchone()[0] or 1
+    order_ids = [(rng.randint(1, max_id),) for _ in range(iterations)]
+    months = db.conn.execute("SELECT DISTINCT substr(created_at, 1, 7) FROM orders").fetchall()
+    month_args = [
+        (int(m[5:7]), int(m[:4])) for m in (rng.choice(months)[0] for _ in range(iterations))
+    ] if months else [(1, 2026)]
+
+    results["generate_order_no"] = _time_calls(db.generate_order_no, [()] * iterations)
+
+    # list_orders memuat seluruh tabel; cukup beberapa kali
+    results["list_orders"] = _time_calls(db.list_orders, [()] * max(3, iterations // 50))
+    results["list_orders_page"] = _time_calls(db.list_orders_page, [()] * iterations)
+    results["list_order_items"] = _time_calls(db.list_order_items, order_ids)
+    results["get_monthly_sales"] = _time_calls(db.get_monthly_sales, month_args)
+
+    order_items = [
+        [{"name": n, "price": p, "qty": rng.randint(1, 3), "note": ""} for n, p in rng.sample(MENU, 3)]
+        for _ in range(iterations)
+    ]
+    results["create_order"] = _time_calls(db.create_order, [(it,) for it in order_items])
+
+    delete_ids = rng.sample(range(1, max_id + 1), min(iterations, max_id))
+    results["delete_order"] = _time_calls(db.delete_order, [(i,) for i in delete_ids])
+
+    try:
+        from receipt_printer import ReceiptPrinter
+    except ImportError as e:  # PySide6 tidak terpasang
+        results["generate_receipt_html"] = {"skipped": str(e)}
+    else:
+        printer = ReceiptPrinter()
+        receipts = []
+        for (oid,) in order_ids:
+            detail = db.get_order_with_items(oid)
+            if detail is not None:
+                receipts.append(detail)
+        results["generate_receipt_html"] = _time_calls(printer.generate_receipt_html, receipts)
+
+    db.close()
+    return results
+
+
+def compare(baseline: dict, current: dict) -> None:
+    print(f"{'size':>9} {'operation':<24} {'before p50':>12} {'after p50':>12} {'ratio':>7}")
+    for size, ops in current["results"].items():
+        base_ops = baseline.get("results", {}).get(size, {})
+        for op, st in ops.items():
+            b = base_ops.get(op)
+            if not b or "p50_us" not in b or "p50_us" not in st:
+                continue
+            ratio = st["p50_us"] / b["p50_us"] if b["p50_us"] else float("nan")
+            print(f"{size:>9} {op:<24} {b['p50_us']:>12.1f} {st['p50_us']:>12.1f} {ratio:>6.2f}x")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Microbenchmark Database")
+    ap.add_argument("--sizes", default="1000,100000",
+                    help="jumlah order, dipisah koma (mis. 1000,100000,1000000)")
+    ap.add_argument("--iterations", type=int, default=200)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--data-dir", help="simpan/pakai ulang database sintetis di folder ini")
+    ap.add_argument("--out", help="file JSON hasil")
+    ap.add_argument("--compare", help="JSON hasil run sebelumnya sebagai pembanding")
+    args = ap.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="cashier_bench_")
+    os.makedirs(data_dir, exist_ok=True)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "seed": args.seed,
+        "results": {},
+    }
+
+    try:
+        for size in sizes:
+            source = os.path.join(data_dir, f"bench_{size}_{args.years}y_{args.seed}.db")
+            if not os.path.exists(source):
+                t0 = time.perf_counter()
+                build_database(source, size, args.years, args.seed)
+                print(f"[{size}] data dibuat dalam {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+
+            # Benchmark menulis (create/delete): jalankan di salinan
+            work = os.path.join(data_dir, f"work_{size}.db")
+            shutil.copyfile(source, work)
+            try:
+                report["results"][str(size)] = run_size(work, args.iterations, args.seed)
+            finally:
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(work + suffix):
+                        os.remove(work + suffix)
+
+            for op, st in report["results"][str(size)].items():
+                if "p50_us" in st:
+                    print(f"[{size}] {op:<24} p50 {st['p50_us']:>10.1f} us  p95 {st['p95_us']:>10.1f} us")
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Latensi change feed (order_feed.OrderFeed) antar proses: proses writer
+menyimpan order lewat create_order dengan jeda acak (sesekali menghapus
+order), subscriber di proses ini mencatat kapan tiap event diterima.
+Diukur dua kali: dengan notifikasi UDP dan polling data_version saja.
+Juga memeriksa tidak ada event yang hilang, ganda, atau tidak urut.
+
+    python -m benchmarks.feed_latency --orders 500 --interval-ms 10
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from database_handler import Database
+from order_feed import OrderFeed
+
+
+def writer(db_path: str, orders: int, interval_ms: float, seed: int) -> int:
+    """Dijalankan di proses terpisah; cetak 'kind order_id waktu_commit' per commit."""
+    rng = random.Random(seed)
+    db = Database(db_path, wal=True)
+    menu = db.get_menu()
+    print("ready", flush=True)
+    sys.stdin.readline()  # tunggu subscriber siap
+    created = []
+    for n in range(orders):
+        time.sleep(rng.uniform(0, 2 * interval_ms) / 1000)
+        if created and n % 10 == 9:
+            order_id = created.pop(rng.randrange(len(created)))
+            db.delete_order(order_id, "uji feed")
+            print(f"voided {order_id} {time.time()}", flush=True)
+            continue
+        m = rng.choice(menu)
+        order_id, _ = db.create_order([{"item_id": m.id, "price": m.price, "qty": 1, "note": ""}])
+        created.append(order_id)
+        print(f"created {order_id} {time.time()}", flush=True)
+    db.close()
+    return 0
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run(db_path: str, orders: int, interval_ms: float, notify: bool, poll_ms: int) -> dict:
+    feed = OrderFeed(db_path, poll_ms=poll_ms, notify=notify)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.feed_latency", "--writer", "--db", db_path,
+         "--orders", str(orders), "--interval-ms", str(interval_ms)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    received = []  # (kind, order_id, seq, waktu terima)
+    try:
+        proc.stdout.readline()
+        proc.stdin.write("go\n")
+        proc.stdin.flush()
+        for event in feed.events(idle_timeout=5):
+            received.append((event.kind, event.order_id, event.seq, time.time()))
+            if len(received) >= orders:
+                break
+        committed = [line.split() for line in proc.stdout]
+        proc.wait()
+    finally:
+        feed.close()
+
+    commit_at = {(kind, int(order_id)): float(t) for kind, order_id, t in committed}
+    latencies = [(t - commit_at[(kind, order_id)]) * 1000
+                 for kind, order_id, _, t in received if (kind, order_id) in commit_at]
+    seqs = [seq for _, _, seq, _ in received]
+    return {
+        "latencies": latencies,
+        "missing": len(commit_at) - len({(k, i) for k, i, _, _ in received}),
+        "duplicates": len(seqs) - len(set(seqs)),
+        "ordered": seqs == sorted(seqs),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=500)
+    ap.add_argument("--interval-ms", type=float, default=10, help="rata-rata jeda antar order")
+    ap.add_argument("--poll-ms", type=int, default=OrderFeed.POLL_MS)
+    ap.add_argument("--db", help="default: database baru di folder sementara")
+    ap.add_argument("--writer", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.writer:
+        return writer(args.db, args.orders, args.interval_ms, seed=1)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "feed.db")
+        db = Database(db_path, wal=True)
+        db.init_schema()
+        db.close()
+
+        print(f"{args.orders} commit, jeda rata-rata {args.interval_ms} ms, poll {args.poll_ms} ms")
+        print(f"{'':>18} {'p50 ms':>8} {'p99 ms':>8} {'maks ms':>8}")
+        for name, notify in (("UDP + data_version", True), ("data_version saja", False)):
+            r = run(db_path, args.orders, args.interval_ms, notify, args.poll_ms)
+            lat = r["latencies"]
+            print(f"{name:>18} {percentile(lat, 50):8.2f} {percentile(lat, 99):8.2f} {max(lat):8.2f}")
+            if r["missing"] or r["duplicates"] or not r["ordered"]:
+                print(f"GAGAL: {r['missing']} hilang, {r['duplicates']} ganda, urut={r['ordered']}")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Bandingkan jalur simpan pesanan: langsung (Database.create_order, satu commit
+SQLite per order) vs OrderJournal (append + fsync journal, group commit di
+background). Diukur throughput dan latensi per order yang dirasakan kasir,
+ditambah waktu sampai semua order journal benar-benar ada di database.
+
+    python -m benchmarks.journal_bench --orders 2000 --dir /tmp/jbench
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.datagen import generate_orders
+from database_handler import Database
+from order_journal import OrderJournal
+
+
+def _fresh_db(path: str, wal: bool) -> Database:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db = Database(path, wal=wal)
+    db.init_schema()
+    return db
+
+
+def _summary(name: str, lat_ms: list[float], elapsed: float) -> str:
+    p99 = statistics.quantiles(lat_ms, n=100)[-1] if len(lat_ms) >= 2 else lat_ms[0]
+    return (f"{name:>16} {len(lat_ms) / elapsed:10.0f} {statistics.median(lat_ms):9.3f} "
+            f"{p99:9.3f} {max(lat_ms):9.3f}")
+
+
+def bench_direct(path: str, orders: list, wal: bool):
+    db = _fresh_db(path, wal)
+    lat = []
+    t0 = time.perf_counter()
+    for items in orders:
+        t = time.perf_counter()
+        db.create_order(items)
+        lat.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - t0
+    db.close()
+    return lat, elapsed
+
+
+def bench_journal(path: str, orders: list, wal: bool, flush_every: int, flush_interval_ms: int):
+    db = _fresh_db(path, wal)
+    journal_path = path + ".journal"
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+    journal = OrderJournal(db, journal_path, flush_every, flush_interval_ms)
+
+    lat = []
+    t0 = time.perf_counter()
+    for items in orders:
+        t = time.perf_counter()
+        journal.submit(items)
+        lat.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - t0
+    journal.close()  # flush terakhir
+    durable = time.perf_counter() - t0
+
+    count = db.conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    db.close()
+    if count != len(orders):
+        raise SystemExit(f"journal: {count} order di database, seharusnya {len(orders)}")
+    return lat, elapsed, durable
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=2000)
+    ap.add_argument("--dir", default=".")
+    ap.add_argument("--journal-mode", choices=("rollback", "wal"), default="wal")
+    ap.add_argument("--flush-every", type=int, default=OrderJournal.FLUSH_EVERY)
+    ap.add_argument("--flush-interval-ms", type=int, default=OrderJournal.FLUSH_INTERVAL_MS)
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.dir, exist_ok=True)
+    wal = args.journal_mode == "wal"
+    orders = [items for _, items in generate_orders(args.orders, 1, seed=7)]
+
+    direct_lat, direct_s = bench_direct(os.path.join(args.dir, "direct.db"), orders, wal)
+    journal_lat, journal_s, durable_s = bench_journal(
+        os.path.join(args.dir, "journal.db"), orders, wal, args.flush_every, args.flush_interval_ms
+    )
+
+    print(f"{args.orders} order, SQLite {args.journal_mode}, "
+          f"flush tiap {args.flush_every} order / {args.flush_interval_ms} ms")
+    print(f"{'':>16} {'order/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    print(_summary("create_order", direct_lat, direct_s))
+    print(_summary("journal.submit", journal_lat, journal_s))
+    print(f"semua order journal ter-commit setelah {durable_s:.2f} s "
+          f"(langsung: {direct_s:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Memori dan waktu membaca seluruh order (default 1 juta) dalam beberapa
+representasi baris:
+
+- sqlite3.Row + fetchall, diakses lewat nama kolom (cara lama list_orders
+  dan reload_orders);
+- OrderRow (NamedTuple) lewat Database.list_orders, diakses lewat atribut;
+- Database.iter_orders (fetchmany per FETCH_CHUNK), tanpa menyimpan list;
+- tuple biasa + fetchall sebagai batas bawah.
+
+Waktu diukur tanpa tracemalloc; memori puncak (tracemalloc) di putaran
+terpisah. Juga scan item (iter_order_item_rows) lama vs baru.
+
+    python -m benchmarks.rows_bench --orders 1000000 --db rows_bench.db
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from benchmarks.datagen import build_database
+from database_handler import Database
+
+
+def rows_fetchall(db: Database) -> tuple:
+    """Cara lama: list sqlite3.Row, lalu baca kolom lewat nama seperti reload_orders."""
+    rows = db.reader.execute("SELECT id, order_no, created_at, total FROM orders ORDER BY id DESC").fetchall()
+    total = 0
+    for o in rows:
+        total += o["total"]
+        o["id"], o["order_no"], o["created_at"]
+    return total, rows
+
+
+def records_list(db: Database) -> tuple:
+    rows = db.list_orders()
+    total = 0
+    for o in rows:
+        total += o.total
+        o.id, o.order_no, o.created_at
+    return total, rows
+
+
+def records_stream(db: Database) -> tuple:
+    total = 0
+    for o in db.iter_orders():
+        total += o.total
+        o.id, o.order_no, o.created_at
+    return total, None
+
+
+def tuples_fetchall(db: Database) -> tuple:
+    cur = db.reader.cursor()
+    cur.row_factory = None
+    rows = cur.execute("SELECT id, order_no, created_at, total FROM orders ORDER BY id DESC").fetchall()
+    total = 0
+    for o in rows:
+        total += o[3]
+        o[0], o[1], o[2]
+    return total, rows
+
+
+def items_rows_old(db: Database) -> tuple:
+    """iter_order_item_rows versi lama: sqlite3.Row per fetchmany, akses lewat nama."""
+    cur = db.reader.execute("""
+        SELECT o.id AS order_id, o.order_no, o.created_at, o.total,
+               i.id AS item_id, m.name AS item_name, i.price, i.qty, i.note, i.subtotal
+        FROM orders o
+        LEFT JOIN order_items i ON i.order_id = o.id
+        LEFT JOIN menu_items m ON m.id = i.item_id
+        ORDER BY o.id, i.id
+    """)
+    total = 0
+    while True:
+        rows = cur.fetchmany(1000)
+        if not rows:
+            break
+        for r in rows:
+            total += r["subtotal"] or 0
+    return total, None
+
+
+def items_records(db: Database) -> tuple:
+    total = 0
+    for r in db.iter_order_item_rows(after_id=0):
+        total += r.subtotal or 0
+    return total, None
+
+
+CASES = [
+    ("orders: sqlite3.Row list", rows_fetchall),
+    ("orders: OrderRow list", records_list),
+    ("orders: iter_orders", records_stream),
+    ("orders: tuple list", tuples_fetchall),
+    ("items: sqlite3.Row scan", items_rows_old),
+    ("items: OrderExportRow scan", items_records),
+]
+
+
+def measure(db: Database, fn, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        result, rows = fn(db)
+        elapsed = time.perf_counter() - t0
+        del rows
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    _, rows = fn(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return {"ms": best * 1000, "peak_mb": peak / 1e6, "check": result}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=1_000_000)
+    ap.add_argument("--db", default="rows_bench.db")
+    ap.add_argument("--reuse", action="store_true", help="pakai --db yang sudah ada")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    if not (args.reuse and os.path.exists(args.db)):
+        build_database(args.db, args.orders)
+
+    db = Database(args.db, wal=True)
+    n = db.reader.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    print(f"{n} order, sqlite {sqlite3.sqlite_version}")
+    print(f"{'':>28} {'waktu ms':>10} {'puncak MB':>10}")
+    results = {}
+    for name, fn in CASES:
+        r = results[name] = measure(db, fn, args.repeat)
+        print(f"{name:>28} {r['ms']:10.0f} {r['peak_mb']:10.1f}")
+    db.close()
+
+    orders = [r["check"] for name, r in results.items() if name.startswith("orders")]
+    items = [r["check"] for name, r in results.items() if name.startswith("items")]
+    if len(set(orders)) != 1 or len(set(items)) != 1:
+        print("GAGAL: hasil berbeda antar representasi")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
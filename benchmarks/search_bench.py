@@ -0,0 +1,80 @@
+"""
+Latensi pencarian pesanan (Database.search_orders, index FTS5 atas nama item
+dan catatan) pada database besar, plus waktu backfill index untuk database
+lama yang belum punya order_items_fts.
+
+Default ~450 ribu order = ~1 juta baris order_items.
+
+    python -m benchmarks.search_bench --orders 450000 --db /tmp/search.db
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.datagen import build_database
+from database_handler import Database
+
+
+# Awalan yang diketik kasir: umum (ribuan hasil) sampai jarang
+QUERIES = ["n", "na", "nasi", "nasi gor", "es", "teh ha", "ped", "tanpa samb", "extra tel", "bawang"]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=450_000)
+    ap.add_argument("--db", default="search_bench.db")
+    ap.add_argument("--runs", type=int, default=50)
+    ap.add_argument("--limit", type=int, default=200)
+    ap.add_argument("--reuse", action="store_true", help="pakai --db yang sudah ada")
+    args = ap.parse_args(argv)
+
+    if not (args.reuse and os.path.exists(args.db)):
+        t0 = time.perf_counter()
+        build_database(args.db, args.orders)
+        print(f"database dibuat ({time.perf_counter() - t0:.1f} s)")
+
+    # Backfill: hapus index lalu biarkan init_schema membangunnya ulang
+    db = Database(args.db, wal=True)
+    db.conn.executescript("""
+        DROP TABLE IF EXISTS order_items_fts;
+        DROP TRIGGER IF EXISTS trg_order_items_fts_ins;
+        DROP TRIGGER IF EXISTS trg_order_items_fts_del;
+        DROP TRIGGER IF EXISTS trg_order_items_fts_upd;
+        DROP TRIGGER IF EXISTS trg_menu_items_fts_rename;
+    """)
+    t0 = time.perf_counter()
+    db.init_schema()
+    backfill_s = time.perf_counter() - t0
+    n_items = db.conn.execute("SELECT COUNT(*) FROM order_items").fetchone()[0]
+    print(f"backfill FTS {n_items} item: {backfill_s:.2f} s")
+
+    print(f"{'query':>12} {'hasil':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    worst = 0.0
+    for q in QUERIES:
+        samples = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            rows = db.search_orders(q, limit=args.limit)
+            samples.append((time.perf_counter() - t0) * 1000)
+        samples.sort()
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        worst = max(worst, p99)
+        print(f"{q:>12} {len(rows):6d} {statistics.median(samples):8.2f} {p99:8.2f}")
+
+    # Dengan filter tanggal (30 hari terakhir data sintetis)
+    samples = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        rows = db.search_orders("nasi", "2025-12-02", "2025-12-31", limit=args.limit)
+        samples.append((time.perf_counter() - t0) * 1000)
+    print(f"{'nasi/30hr':>12} {len(rows):6d} {statistics.median(samples):8.2f} {max(samples):8.2f}")
+    print(f"p99 terburuk: {worst:.2f} ms")
+
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
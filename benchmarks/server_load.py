@@ -0,0 +1,150 @@
+"""
+Load test order_server di localhost: beberapa "tablet" (koneksi keep-alive)
+mengirim campuran POST /orders dan GET (daftar, detail, grafik bulanan)
+selama beberapa detik. Melaporkan request/detik dan latensi p50/p99 per
+jenis request, lalu memeriksa tidak ada nomor order ganda.
+
+Server dijalankan di proses terpisah (seperti di warung), database baru di
+folder sementara kecuali --db diisi.
+
+    python -m benchmarks.server_load --clients 32 --seconds 10 --write-ratio 0.3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from database_handler import Database
+
+
+async def request(reader, writer, method: str, path: str, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    data = json.loads(await reader.readexactly(length))
+    return status, data
+
+
+async def client(port: int, deadline: float, write_ratio: float, menu: list, seed: int, samples: dict):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    known_ids = []
+    try:
+        while time.perf_counter() < deadline:
+            r = rng.random()
+            if r < write_ratio:
+                kind = "POST /orders"
+                picks = rng.sample(menu, rng.randint(1, 3))
+                args = ("POST", "/orders", {"items": [
+                    {"item_id": m["id"], "qty": rng.randint(1, 3), "note": ""} for m in picks
+                ]})
+            elif r < write_ratio + (1 - write_ratio) * 0.5 and known_ids:
+                kind = "GET /orders/<id>"
+                args = ("GET", f"/orders/{rng.choice(known_ids)}")
+            elif r < write_ratio + (1 - write_ratio) * 0.8:
+                kind = "GET /orders"
+                args = ("GET", "/orders?limit=50")
+            else:
+                kind = "GET /sales/monthly"
+                args = ("GET", "/sales/monthly?year=2025&month=12")
+
+            t0 = time.perf_counter()
+            status, data = await request(reader, writer, *args)
+            samples.setdefault(kind, []).append((time.perf_counter() - t0) * 1000)
+            if status >= 400:
+                samples.setdefault("error", []).append(f"{kind}: {status} {data}")
+            elif kind == "POST /orders":
+                known_ids.append(data["id"])
+            elif kind == "GET /orders" and not known_ids:
+                known_ids.extend(o["id"] for o in data["orders"][:20])
+    finally:
+        writer.close()
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run(port: int, clients: int, seconds: float, write_ratio: float) -> dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, menu = await request(reader, writer, "GET", "/menu")
+    writer.close()
+
+    samples = {}
+    deadline = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, deadline, write_ratio, menu["items"], seed, samples) for seed in range(clients)
+    ))
+    return {"elapsed": time.perf_counter() - t0, "samples": samples}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--seconds", type=float, default=10)
+    ap.add_argument("--write-ratio", type=float, default=0.3)
+    ap.add_argument("--db", help="default: database baru di folder sementara")
+    ap.add_argument("--max-batch", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "server_load.db")
+        proc = subprocess.Popen(
+            [sys.executable, "order_server.py", "--db", db_path, "--port", "0",
+             "--max-batch", str(args.max_batch)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            line = proc.stdout.readline()
+            port = int(re.search(r":(\d+) ", line).group(1))
+            result = asyncio.run(run(port, args.clients, args.seconds, args.write_ratio))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        samples = result["samples"]
+        errors = samples.pop("error", [])
+        total = sum(len(v) for v in samples.values())
+        print(f"{args.clients} klien, {result['elapsed']:.1f} s: {total / result['elapsed']:.0f} req/s")
+        print(f"{'':>20} {'jumlah':>7} {'p50 ms':>8} {'p99 ms':>8}")
+        every = [x for v in samples.values() for x in v]
+        for kind, values in sorted(samples.items()) + [("semua", every)]:
+            print(f"{kind:>20} {len(values):7d} {percentile(values, 50):8.2f} {percentile(values, 99):8.2f}")
+
+        db = Database(db_path)
+        dup = db.conn.execute(
+            "SELECT COUNT(*) - COUNT(DISTINCT order_no) FROM orders"
+        ).fetchone()[0]
+        db.close()
+
+    failed = False
+    if errors:
+        print(f"GAGAL: {len(errors)} request error, mis. {errors[0]}")
+        failed = True
+    if dup:
+        print(f"GAGAL: {dup} nomor order ganda")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Ukur waktu startup aplikasi kasir: import modul, frame pertama MainWindow
+selesai di-paint, dan paint pertama sesudah grid menu terisi (menu dimuat
+di thread worker, jadi frame pertama masih tanpa menu). --max-ms berlaku
+untuk yang terakhir, saat kasir benar-benar bisa mulai mencatat pesanan.
+Setiap sampel dijalankan di proses Python baru supaya import benar-benar
+dingin (modul belum ada di sys.modules).
+
+Bisa jalan di CI tanpa display:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.startup --runs 5 --max-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def child(db_path: str):
+    """Satu kali startup; cetak hasil ukur sebagai JSON di baris terakhir."""
+    t0 = time.perf_counter()
+    import main as app_main
+    from async_db import AsyncDatabase
+    from database_handler import Database
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+    t_import = time.perf_counter()
+
+    app = QApplication([sys.argv[0]])
+    app_main.load_stylesheet(app)
+    db = Database(db_path, wal=True)
+    db.init_schema()
+    adb = AsyncDatabase(db)
+    w = app_main.MainWindow(adb)
+
+    painted = {}
+    tab = w.new_order_tab
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                now = time.perf_counter()
+                painted.setdefault("first", now)
+                if tab.rows and "menu" not in painted:
+                    painted["menu"] = now
+                    # Keluar sesudah paint ini selesai diproses
+                    app.quit()
+            return False
+
+    spy = FirstPaint()
+    tab.installEventFilter(spy)
+    w.show()
+    QTimer.singleShot(30_000, app.quit)  # jaga-jaga kalau menu tidak pernah dimuat
+    app.exec()
+    if "menu" not in painted:
+        raise RuntimeError("grid menu tidak terisi dalam 30 s")
+
+    result = {
+        "import_ms": (t_import - t0) * 1000,
+        "first_paint_ms": (painted["first"] - t0) * 1000,
+        "menu_ready_ms": (painted["menu"] - t0) * 1000,
+        "matplotlib_loaded": "matplotlib" in sys.modules,
+    }
+    adb.close()
+    db.close()
+    print(json.dumps(result))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--max-ms", type=float, help="gagal (exit 1) kalau median sampai menu tampil melebihi ini")
+    ap.add_argument("--child", metavar="DB", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            db_path = os.path.join(tmp, f"startup{i}.db")
+            t0 = time.perf_counter()
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--child", db_path],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            wall = (time.perf_counter() - t0) * 1000
+            sample = json.loads(out.strip().splitlines()[-1])
+            sample["process_ms"] = wall
+            samples.append(sample)
+
+    print(f"{'':>16} {'median ms':>10} {'max ms':>9}")
+    for key in ("import_ms", "first_paint_ms", "menu_ready_ms", "process_ms"):
+        values = [s[key] for s in samples]
+        print(f"{key:>16} {statistics.median(values):10.1f} {max(values):9.1f}")
+
+    failed = False
+    if any(s["matplotlib_loaded"] for s in samples):
+        print("GAGAL: matplotlib ter-import sebelum frame pertama")
+        failed = True
+    median_ready = statistics.median(s["menu_ready_ms"] for s in samples)
+    if args.max_ms is not None and median_ready > args.max_ms:
+        print(f"GAGAL: sampai menu tampil {median_ready:.1f} ms > {args.max_ms} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
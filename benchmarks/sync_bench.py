@@ -0,0 +1,121 @@
+"""
+Sync warung -> pusat (store_sync): snapshot pertama vs batch harian.
+Dua warung sintetis dengan riwayat --orders order; tiap "hari" menambah
+--day-orders order dan menghapus sebagian. Mengukur ukuran file dan waktu
+export/import, lalu memeriksa isi pusat sama dengan tiap warung, juga
+setelah batch diputar ulang dan batch yang tumpang tindih (ack tertinggal).
+
+    python -m benchmarks.sync_bench --orders 200000 --day-orders 800 --days 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.datagen import build_database
+from database_handler import Database
+from store_sync import CentralDatabase, export_changes, read_ack, write_ack
+
+
+STORES = ("warung-a", "warung-b")
+
+
+def simulate_day(db: Database, orders: int, voids: int, rng: random.Random):
+    menu = db.get_menu()
+    for _ in range(orders):
+        picks = rng.sample(menu, rng.randint(1, 3))
+        db.create_order([{"item_id": m.id, "price": m.price, "qty": rng.randint(1, 3), "note": ""}
+                         for m in picks])
+    recent = [r.id for r in db.list_orders_page(limit=orders)]
+    db.void_orders(rng.sample(recent, voids), reason="batal", pause_s=0, reclaim=False)
+
+
+def sync(db: Database, central: CentralDatabase, store: str, work: str) -> tuple:
+    """Export + import + ack; return (ExportResult, ImportResult, export ms)."""
+    ack_path = os.path.join(work, f"{store}.ack")
+    t0 = time.perf_counter()
+    exported = export_changes(db, store, read_ack(ack_path), work)
+    export_ms = (time.perf_counter() - t0) * 1000
+    if exported.path is None:
+        return exported, None, export_ms
+    imported = central.import_batch(exported.path)
+    write_ack(ack_path, store, imported.to_seq)
+    return exported, imported, export_ms
+
+
+def compare(db: Database, central: CentralDatabase, store: str) -> bool:
+    orders = items = total = 0
+    for order, order_items in db.iter_orders_with_items(after_id=0):
+        orders += 1
+        items += len(order_items)
+        total += order.total
+    got = central.conn.execute("""
+        SELECT (SELECT COUNT(*) FROM store_orders WHERE store_id = ?),
+               (SELECT COUNT(*) FROM store_order_items WHERE store_id = ?),
+               (SELECT COALESCE(SUM(total), 0) FROM store_orders WHERE store_id = ?)
+    """, (store, store, store)).fetchone()
+    if tuple(got) != (orders, items, total):
+        print(f"GAGAL {store}: warung {(orders, items, total)} != pusat {tuple(got)}")
+        return False
+    return True
+
+
+def report(label: str, exported, imported, export_ms: float):
+    import_ms = imported.elapsed_s * 1000 if imported else 0.0
+    print(f"{label:>22} {exported.orders:8d} {exported.voided:6d} {exported.bytes / 1e3:10.1f} "
+          f"{export_ms:10.1f} {import_ms:10.1f}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orders", type=int, default=200_000, help="riwayat per warung")
+    ap.add_argument("--day-orders", type=int, default=800)
+    ap.add_argument("--day-voids", type=int, default=20)
+    ap.add_argument("--days", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(7)
+    ok = True
+    with tempfile.TemporaryDirectory() as work:
+        dbs = {}
+        for n, store in enumerate(STORES):
+            path = os.path.join(work, f"{store}.db")
+            build_database(path, args.orders // (n + 1), seed=n)
+            dbs[store] = Database(path, wal=True)
+            dbs[store].init_schema()
+        central = CentralDatabase(os.path.join(work, "pusat.db"))
+
+        print(f"{'':>22} {'order':>8} {'hapus':>6} {'file KB':>10} {'export ms':>10} {'import ms':>10}")
+        for store, db in dbs.items():
+            report(f"{store} snapshot", *sync(db, central, store, work))
+
+        for day in range(1, args.days + 1):
+            for store, db in dbs.items():
+                simulate_day(db, args.day_orders, args.day_voids, rng)
+                exported, imported, export_ms = sync(db, central, store, work)
+                report(f"{store} hari {day}", exported, imported, export_ms)
+
+        # Putar ulang batch terakhir, lalu ekspor dari ack lama (ack belum sampai ke warung)
+        store, db = STORES[0], dbs[STORES[0]]
+        again = central.import_batch(exported.path)
+        ack_path = os.path.join(work, f"{store}.ack")
+        old_ack = read_ack(ack_path) - args.day_orders // 2
+        simulate_day(db, args.day_orders, args.day_voids, rng)
+        overlap = export_changes(db, store, old_ack, work)
+        imported = central.import_batch(overlap.path)
+        print(f"putar ulang: skipped={again.skipped}; tumpang tindih: {overlap.orders} order dikirim, "
+              f"{imported.orders} diterapkan")
+
+        for store, db in dbs.items():
+            ok = compare(db, central, store) and ok
+            db.close()
+        central.close()
+    if ok:
+        print("isi pusat sama dengan semua warung")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,368 @@
+import functools
+import os
+import random
+import re
+import socket
 import sqlite3
+import time
 
-from datetime import datetime
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+from query_stats import InstrumentedConnection, QueryStats
+from result_cache import ResultCache
+from trace_recorder import TraceRecorder
 
 
 def rupiah(n: int) -> str:
     return f"Rp{n:,}".replace(",", ".")
 
+
+DateLike = Union[date, str]
+
+
+def _as_date(d: DateLike) -> date:
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(d)
+
+
+def day_bounds(date_from: Optional[DateLike], date_to: Optional[DateLike]) -> tuple[str, str]:
+    """
+    Rentang tanggal inklusif -> batas teks created_at [start, end).
+    None berarti tanpa batas di sisi itu.
+    """
+    start = "" if date_from is None else f"{_as_date(date_from).isoformat()} 00:00:00"
+    end = "9999" if date_to is None else f"{(_as_date(date_to) + timedelta(days=1)).isoformat()} 00:00:00"
+    return start, end
+
+
+@dataclass
+class BulkResult:
+    """Hasil create_orders_bulk."""
+    created: list = field(default_factory=list)   # [(order_id, order_no)] sesuai urutan input
+    rejected: list = field(default_factory=list)  # [(index order pertama di batch, pesan error)]
+
+
+@dataclass
+class ArchiveResult:
+    """Hasil archive_orders."""
+    moved: int = 0
+    batches: int = 0
+    partitions: list = field(default_factory=list)  # nama arsip yang tersentuh, mis. ['2024']
+    elapsed_s: float = 0.0
+
+
+@dataclass
+class VoidResult:
+    """Hasil void_orders."""
+    deleted: int = 0
+    chunks: int = 0
+    pages_freed: int = 0
+    elapsed_s: float = 0.0
+
+
+@dataclass(frozen=True)
+class MenuItem:
+    """Satu baris menu_items."""
+    id: int
+    name: str
+    price: int
+    active: bool = True
+
+
+# Record hasil baca yang sering dipanggil. NamedTuple = tuple biasa
+# (__slots__ kosong): dibuat langsung dari tuple hasil sqlite3 tanpa
+# sqlite3.Row, diakses lewat atribut (o.total) atau index (o[3]).
+
+class OrderRow(NamedTuple):
+    """Satu baris orders."""
+    id: int
+    order_no: str
+    created_at: str
+    total: int
+
+
+class OrderItemRow(NamedTuple):
+    """Satu item order (list_order_items, get_order_with_items)."""
+    item_name: str
+    price: int
+    qty: int
+    note: Optional[str]
+    subtotal: int
+    order_id: Optional[int]  # None untuk order yang masih tertunda di journal
+
+
+class OrderExportRow(NamedTuple):
+    """Satu baris orders JOIN order_items (iter_order_item_rows)."""
+    order_id: int
+    order_no: str
+    created_at: str
+    total: int
+    order_item_id: Optional[int]  # id baris order_items; None kalau order tanpa item
+    item_id: Optional[int]  # menu_items.id, sama seperti order_items.item_id
+    item_name: Optional[str]
+    price: Optional[int]
+    qty: Optional[int]
+    note: Optional[str]
+    subtotal: Optional[int]
+
+
+def iter_records(cur: sqlite3.Cursor, record, chunk_size: int = 1000) -> Iterator:
+    """
+    Baris cursor sebagai `record` (NamedTuple), diambil per fetchmany.
+    Cursor harus dibuat dengan row_factory None (lihat Database._cursor).
+    """
+    make = functools.partial(tuple.__new__, record)
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from map(make, rows)
+    finally:
+        cur.close()
+
+
+def _is_busy_error(e: sqlite3.OperationalError) -> bool:
+    msg = str(e).lower()
+    return "database is locked" in msg or "database is busy" in msg
+
+
+def retry_on_busy(method):
+    """
+    Ulangi method tulis kalau database sedang dikunci proses lain (SQLITE_BUSY),
+    dengan backoff eksponensial + jitter. busy_timeout sudah menunggu di level
+    SQLite; ini lapisan terakhir untuk kasus yang tetap lolos.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        delay = self.BUSY_RETRY_DELAY
+        for attempt in range(self.busy_retries + 1):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not _is_busy_error(e) or attempt == self.busy_retries:
+                    raise
+                time.sleep(delay * (1 + random.random()))
+                delay = min(delay * 2, self.BUSY_RETRY_MAX_DELAY)
+    return wrapper
+
+
 class Database:
-    def __init__(self, path: str):
-        self.conn = sqlite3.connect(path)
-        self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA foreign_keys = ON;")
+    # Lebar angka urut pada nomor order (001, 002, ...). Naikkan ke 4 kalau
+    # sehari bisa lebih dari 999 order supaya nomor tetap terurut secara teks.
+    ORDER_NO_WIDTH = 3
+
+    BUSY_TIMEOUT_MS = 5000
+    BUSY_RETRIES = 5
+    BUSY_RETRY_DELAY = 0.05      # detik, dilipatgandakan tiap percobaan
+    BUSY_RETRY_MAX_DELAY = 1.0
+
+    # Menu awal untuk database baru (dan database lama saat migrasi katalog)
+    DEFAULT_MENU = (
+        ("Nasi Kuning", 10000),
+        ("Nasi Goreng", 12000),
+        ("Mie Tiaw Goreng", 15000),
+        ("Bubur Ayam", 8000),
+        ("Lontong Sayur", 10000),
+        ("Es Teh", 3000),
+        ("Teh Hangat", 5000),
+        ("Air Mineral", 4000),
+        ("Es Jeruk Kecil", 7000),
+    )
+
+    # Arsip order lama: satu file per tahun ('year') atau per bulan ('month')
+    ARCHIVE_GRANULARITIES = ("year", "month")
+    ARCHIVE_AFTER_DAYS = 365
+    ARCHIVE_BATCH_SIZE = 500
+    ARCHIVE_BATCH_PAUSE = 0.05  # detik jeda antar batch supaya kasir bisa menulis
+    # Hapus massal: ukuran transaksi, jeda antar transaksi, dan halaman yang
+    # dikembalikan ke OS per langkah incremental_vacuum
+    VOID_CHUNK_SIZE = 200
+    VOID_CHUNK_PAUSE = 0.02
+    VACUUM_STEP_PAGES = 256
+    # void_orders baru menjalankan reclaim_space kalau halaman kosong sebanyak
+    # ini (~4 MB di halaman 4 KB); hapus satu-dua order tidak perlu vacuum
+    RECLAIM_MIN_FREE_PAGES = 1024
+
+    # SQLite default maksimal 10 database ter-ATTACH per koneksi
+    ATTACH_LIMIT = 8
+
+    # Prepared statement yang disimpan per koneksi. Query aplikasi tetap
+    # (~70 teks SQL termasuk versi per skema arsip), tapi IN (?, ?, ...)
+    # dengan panjang berbeda masing-masing jadi statement sendiri; default
+    # sqlite3 (128) cepat terusir oleh variasi itu
+    STATEMENT_CACHE_SIZE = 512
+    FETCH_CHUNK = 1000
+
+    # Change feed order_events (lihat order_feed.OrderFeed): berapa lama event
+    # disimpan, dan kapan pendaftaran listener UDP yang tidak diperbarui dibuang
+    ORDER_EVENTS_KEEP_DAYS = 30
+    FEED_LISTENER_TTL_S = 1800
+
+    # Method yang diukur kalau instrumentasi aktif (stats=QueryStats(...))
+    INSTRUMENTED_METHODS = (
+        "init_schema", "generate_order_no", "create_order", "create_orders_bulk", "delete_order",
+        "reserve_order_nos", "release_order_nos",
+        "get_order_by_id", "get_order_with_items", "list_orders", "list_orders_page", "list_orders_after",
+        "list_order_items", "get_monthly_sales",
+        "get_menu", "add_menu_item", "update_menu_item", "archive_orders",
+        "void_orders", "reclaim_space", "search_orders", "list_voided_since",
+        "prefetch_order_items", "list_order_events",
+    )
+    # Yang direkam TraceRecorder: method di atas + yang tidak diukur QueryStats
+    TRACED_METHODS = INSTRUMENTED_METHODS + (
+        "peek_order_items", "iter_order_item_rows", "iter_orders_with_items", "iter_item_facts",
+        "voided_watermark", "prune_order_events", "iter_orders",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        order_no_width: int = ORDER_NO_WIDTH,
+        wal: bool = False,
+        busy_timeout_ms: int = BUSY_TIMEOUT_MS,
+        busy_retries: int = BUSY_RETRIES,
+        check_same_thread: bool = True,
+        stats: Optional[QueryStats] = None,
+        archive_dir: Optional[str] = None,
+        cache: Optional[ResultCache] = None,
+        recorder: Optional[TraceRecorder] = None,
+    ):
+        """
+        wal=True: journal WAL, satu koneksi writer (self.conn) dan satu koneksi
+        read-only (self.reader) untuk query riwayat/analitik, supaya bacaan
+        yang lama tidak menahan create_order dan kasir lain bisa ikut menulis.
+
+        stats: aktifkan instrumentasi SQL (histogram latensi per method dan
+        slow-query log). None = tanpa instrumentasi, tanpa overhead.
+
+        archive_dir: folder file arsip (lihat archive_orders); default
+        "<nama db>_archive" di sebelah file database.
+
+        cache: simpan hasil get_order_by_id / list_order_items /
+        get_monthly_sales (lihat ResultCache). None = selalu query.
+
+        recorder: rekam panggilan method publik ke file trace untuk
+        replay.py (lihat TraceRecorder). None = tidak merekam.
+        """
+        self.path = path
+        self.order_no_width = order_no_width
+        self.wal = wal
+        self.busy_timeout_ms = busy_timeout_ms
+        self.busy_retries = busy_retries
+        self.check_same_thread = check_same_thread
+        self.stats = stats
+        self._menu_cache = None  # (versi katalog, [MenuItem]) — lihat get_menu
+        self.cache = cache
+        self.recorder = recorder
+        self._data_version = None  # PRAGMA data_version reader saat cek cache terakhir
+        self._notify_sock = None  # socket UDP untuk membangunkan OrderFeed, dibuat saat perlu
+
+        in_memory = path == ":memory:" or path.startswith("file::memory:")
+        if archive_dir is None and not in_memory:
+            archive_dir = str(Path(path).with_name(Path(path).stem + "_archive"))
+        self.archive_dir = archive_dir
+        self._attached = {}  # koneksi -> OrderedDict(nama arsip -> alias), urut terakhir dipakai
+
+        if stats is not None:
+            # Shadow method di instance; kalau tidak aktif, method asli dipanggil langsung
+            for name in self.INSTRUMENTED_METHODS:
+                setattr(self, name, stats.wrap(name, getattr(self, name)))
+        if recorder is not None:
+            for name in self.TRACED_METHODS:
+                setattr(self, name, recorder.wrap(name, getattr(self, name)))
+
+        self.conn = self._connect(path)
+        # File baru: auto_vacuum harus diset sebelum halaman pertama ditulis,
+        # dan pindah ke WAL sudah menulis header; lihat juga init_schema
+        if self.conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        if wal:
+            self.conn.execute("PRAGMA journal_mode = WAL;")
+            self.conn.execute("PRAGMA synchronous = NORMAL;")
+
+        # Database in-memory tidak bisa dibuka dua kali; pakai koneksi writer saja
+        if wal and not in_memory:
+            uri = Path(path).resolve().as_uri() + "?mode=ro"
+            self.reader = self._connect(uri, uri=True)
+            self.reader.execute("PRAGMA query_only = ON;")
+        else:
+            self.reader = self.conn
+
+        if recorder is not None:
+            recorder.start(self)
+
+    def _connect(self, target: str, uri: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            target,
+            timeout=self.busy_timeout_ms / 1000,
+            uri=uri,
+            check_same_thread=self.check_same_thread,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            factory=sqlite3.Connection if self.stats is None else InstrumentedConnection,
+        )
+        if self.stats is not None:
+            conn.stats = self.stats
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};")
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+    @staticmethod
+    def _cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+        """Cursor yang menghasilkan tuple biasa (untuk iter_records), bukan sqlite3.Row."""
+        cur = conn.cursor()
+        cur.row_factory = None
+        return cur
+
+    def clone(self, **overrides) -> "Database":
+        """
+        Buka koneksi baru ke file yang sama dengan konfigurasi yang sama.
+        Koneksi sqlite3 tidak boleh dipakai lintas thread, jadi tiap thread
+        worker memakai clone sendiri.
+        """
+        kwargs = dict(
+            order_no_width=self.order_no_width,
+            wal=self.wal,
+            busy_timeout_ms=self.busy_timeout_ms,
+            busy_retries=self.busy_retries,
+            check_same_thread=self.check_same_thread,
+            stats=self.stats,
+            archive_dir=self.archive_dir,
+            cache=self.cache,
+            recorder=self.recorder,
+        )
+        kwargs.update(overrides)
+        return Database(self.path, **kwargs)
 
     def close(self):
+        if self._notify_sock is not None:
+            self._notify_sock.close()
+        if self.reader is not self.conn:
+            self.reader.close()
         self.conn.close()
 
+    @retry_on_busy
     def init_schema(self):
         cur = self.conn.cursor()
 
+        # Database baru: ruang bekas order yang dihapus bisa dikembalikan
+        # sedikit demi sedikit (reclaim_space) tanpa VACUUM penuh. Sudah
+        # diset di __init__ untuk file kosong (sebelum WAL); di sini untuk
+        # file yang header-nya sudah ada tapi belum punya tabel, yang butuh
+        # VACUUM supaya berlaku. Database lama lihat enable_incremental_vacuum.
+        if cur.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+            if cur.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                cur.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+                cur.execute("VACUUM;")
+
         cur.execute("""
         CREATE TABLE IF NOT EXISTS orders (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -27,53 +372,726 @@ class Database:
         );
         """)
 
+        self._init_menu_items(cur)
+
+        # Nama item tidak disimpan per baris; item_id menunjuk menu_items,
+        # price adalah harga saat order dibuat (tidak ikut berubah)
         cur.execute("""
         CREATE TABLE IF NOT EXISTS order_items (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             order_id INTEGER NOT NULL,
-            item_name TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
             price INTEGER NOT NULL,
             qty INTEGER NOT NULL,
             note TEXT,
             subtotal INTEGER NOT NULL,
-            FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+            FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE,
+            FOREIGN KEY(item_id) REFERENCES menu_items(id)
+        );
+        """)
+        self._migrate_order_item_names(cur)
+
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items(order_id);")
+
+        self._init_daily_sales(cur)
+        self._init_order_seq(cur)
+        self._init_archive_registry(cur)
+        self._init_item_search(cur)
+        self._init_write_seq(cur)
+        self._init_order_events(cur)
+
+        # Jejak audit order yang dihapus/di-void (order aslinya sudah tidak ada)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS voided_orders (
+            order_id INTEGER PRIMARY KEY,
+            order_no TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            item_count INTEGER NOT NULL,
+            voided_at TEXT NOT NULL,
+            reason TEXT
         );
         """)
 
         self.conn.commit()
 
-    def generate_order_no(self) -> str:
+    def _table_exists(self, name: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?",
+            (name,)
+        ).fetchone()
+        return row is not None
+
+    def _init_menu_items(self, cur: sqlite3.Cursor):
         """
-        Format: ORD-YYYYMMDD-001 (reset tiap hari)
+        Katalog menu. Setiap perubahan menu_items menaikkan app_meta.menu_version
+        (lewat trigger), jadi cache katalog di semua koneksi tahu kapan basi.
         """
-        today = datetime.now().strftime("%Y%m%d")
-        prefix = f"ORD-{today}-"
+        seed = not self._table_exists("menu_items")
 
-        cur = self.conn.cursor()
-        row = cur.execute(
-            "SELECT order_no FROM orders WHERE order_no LIKE ? ORDER BY id DESC LIMIT 1",
-            (prefix + "%",)
-        ).fetchone()
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS menu_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            price INTEGER NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1
+        );
+        """)
 
-        if row is None:
-            seq = 1
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """)
+        cur.execute("INSERT OR IGNORE INTO app_meta(key, value) VALUES('menu_version', 0)")
+
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_menu_items_version_{event.lower()}
+            AFTER {event} ON menu_items
+            BEGIN
+                UPDATE app_meta SET value = value + 1 WHERE key = 'menu_version';
+            END;
+            """)
+
+        if seed:
+            cur.executemany("INSERT INTO menu_items(name, price) VALUES(?, ?)", self.DEFAULT_MENU)
+
+    def _migrate_order_item_names(self, cur: sqlite3.Cursor):
+        """
+        Database lama: order_items menyimpan item_name per baris. Nama yang
+        belum ada di katalog dimasukkan sebagai item nonaktif (harga terakhir),
+        lalu tabel dibangun ulang dengan item_id.
+        """
+        columns = {r[1] for r in cur.execute("PRAGMA table_info(order_items)")}
+        if "item_name" not in columns:
+            return
+
+        if not self.conn.in_transaction:
+            cur.execute("BEGIN;")
+        cur.execute("""
+            INSERT INTO menu_items(name, price, active)
+            SELECT i.item_name, i.price, 0
+            FROM order_items i
+            JOIN (SELECT item_name, MAX(id) AS last_id FROM order_items GROUP BY item_name) last
+              ON last.last_id = i.id
+            WHERE NOT EXISTS (SELECT 1 FROM menu_items m WHERE m.name = i.item_name)
+        """)
+        cur.execute("""
+        CREATE TABLE order_items_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            price INTEGER NOT NULL,
+            qty INTEGER NOT NULL,
+            note TEXT,
+            subtotal INTEGER NOT NULL,
+            FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE,
+            FOREIGN KEY(item_id) REFERENCES menu_items(id)
+        );
+        """)
+        cur.execute("""
+            INSERT INTO order_items_new(id, order_id, item_id, price, qty, note, subtotal)
+            SELECT i.id, i.order_id, m.id, i.price, i.qty, i.note, i.subtotal
+            FROM order_items i
+            JOIN menu_items m ON m.name = i.item_name
+        """)
+        cur.execute("DROP TABLE order_items;")
+        cur.execute("ALTER TABLE order_items_new RENAME TO order_items;")
+
+    def _init_daily_sales(self, cur: sqlite3.Cursor):
+        """
+        Rollup penjualan harian (day = 'YYYY-MM-DD').
+        Dijaga oleh trigger di tabel orders, jadi selalu ikut transaksi yang sama
+        dengan insert/delete order.
+        """
+        backfill = not self._table_exists("daily_sales")
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS daily_sales (
+            day TEXT PRIMARY KEY,
+            order_count INTEGER NOT NULL,
+            revenue INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_orders_daily_sales_ins
+        AFTER INSERT ON orders
+        BEGIN
+            INSERT INTO daily_sales(day, order_count, revenue)
+            VALUES (substr(NEW.created_at, 1, 10), 1, NEW.total)
+            ON CONFLICT(day) DO UPDATE SET
+                order_count = order_count + 1,
+                revenue = revenue + excluded.revenue;
+        END;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_orders_daily_sales_del
+        AFTER DELETE ON orders
+        BEGIN
+            UPDATE daily_sales
+               SET order_count = order_count - 1,
+                   revenue = revenue - OLD.total
+             WHERE day = substr(OLD.created_at, 1, 10);
+            DELETE FROM daily_sales
+             WHERE day = substr(OLD.created_at, 1, 10) AND order_count <= 0;
+        END;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_orders_daily_sales_upd
+        AFTER UPDATE OF created_at, total ON orders
+        BEGIN
+            UPDATE daily_sales
+               SET order_count = order_count - 1,
+                   revenue = revenue - OLD.total
+             WHERE day = substr(OLD.created_at, 1, 10);
+            DELETE FROM daily_sales
+             WHERE day = substr(OLD.created_at, 1, 10) AND order_count <= 0;
+            INSERT INTO daily_sales(day, order_count, revenue)
+            VALUES (substr(NEW.created_at, 1, 10), 1, NEW.total)
+            ON CONFLICT(day) DO UPDATE SET
+                order_count = order_count + 1,
+                revenue = revenue + excluded.revenue;
+        END;
+        """)
+
+        if backfill:
+            # Database lama: isi rollup sekali dari data orders yang sudah ada
+            cur.execute("""
+            INSERT INTO daily_sales(day, order_count, revenue)
+            SELECT substr(created_at, 1, 10), COUNT(*), SUM(total)
+            FROM orders
+            GROUP BY substr(created_at, 1, 10)
+            """)
+
+    def _init_order_seq(self, cur: sqlite3.Cursor):
+        """
+        Counter nomor urut per hari (day = 'YYYYMMDD').
+        Dinaikkan di dalam transaksi insert order, jadi aman untuk beberapa kasir.
+        """
+        backfill = not self._table_exists("order_seq")
+
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS order_seq (
+            day TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """)
+
+        if backfill:
+            # Lanjutkan nomor dari order yang sudah ada (contoh: ORD-20260105-007)
+            cur.execute("""
+            INSERT INTO order_seq(day, last_seq)
+            SELECT substr(order_no, 5, 8), MAX(CAST(substr(order_no, 14) AS INTEGER))
+            FROM orders
+            WHERE order_no LIKE 'ORD-________-%'
+            GROUP BY substr(order_no, 5, 8)
+            """)
+
+    # ---------- katalog menu ----------
+
+    def menu_version(self) -> int:
+        """Naik setiap ada perubahan di menu_items (dari koneksi mana pun)."""
+        return self.reader.execute(
+            "SELECT value FROM app_meta WHERE key = 'menu_version'"
+        ).fetchone()[0]
+
+    def get_menu(self, include_inactive: bool = False) -> list[MenuItem]:
+        """
+        Daftar menu, urut id. Disimpan di memori dan hanya dibaca ulang kalau
+        menu_version berubah, jadi pemanggilan berulang cukup satu lookup kecil.
+        """
+        version = self.menu_version()
+        if self._menu_cache is None or self._menu_cache[0] != version:
+            rows = self.reader.execute(
+                "SELECT id, name, price, active FROM menu_items ORDER BY id"
+            ).fetchall()
+            self._menu_cache = (version, [MenuItem(r[0], r[1], r[2], bool(r[3])) for r in rows])
+        items = self._menu_cache[1]
+        return list(items) if include_inactive else [m for m in items if m.active]
+
+    @retry_on_busy
+    def add_menu_item(self, name: str, price: int) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO menu_items(name, price) VALUES(?, ?)", (name.strip(), int(price))
+            )
+        return cur.lastrowid
+
+    @retry_on_busy
+    def update_menu_item(self, item_id: int, name: Optional[str] = None,
+                         price: Optional[int] = None, active: Optional[bool] = None) -> None:
+        """Ubah nama/harga/status item. Order lama tetap memakai harga saat dibuat."""
+        sets, params = [], []
+        if name is not None:
+            sets.append("name = ?")
+            params.append(name.strip())
+        if price is not None:
+            sets.append("price = ?")
+            params.append(int(price))
+        if active is not None:
+            sets.append("active = ?")
+            params.append(int(active))
+        if not sets:
+            return
+        with self.conn:
+            self.conn.execute(f"UPDATE menu_items SET {', '.join(sets)} WHERE id = ?", (*params, item_id))
+        if name is not None and self.cache is not None:
+            self.cache.clear()  # item_name di list_order_items ikut berubah
+
+    def _resolve_item_ids(self, cur: sqlite3.Cursor, items: Iterable[dict],
+                          by_name: Optional[dict] = None) -> list[int]:
+        """
+        item_id untuk tiap item (dipanggil di dalam transaksi tulis). Item yang
+        membawa item_id dipakai apa adanya; selain itu dicari lewat nama, dan
+        nama yang belum dikenal (mis. import dari tablet) ditambahkan ke
+        katalog sebagai item nonaktif. by_name (nama -> id) boleh dipakai
+        ulang antar pemanggilan dalam satu batch.
+        """
+        if by_name is None:
+            by_name = {m.name: m.id for m in self.get_menu(include_inactive=True)}
+        ids = []
+        for it in items:
+            item_id = it.get("item_id")
+            if item_id is None:
+                name = it["name"].strip()
+                item_id = by_name.get(name)
+                if item_id is None:
+                    cur.execute(
+                        "INSERT OR IGNORE INTO menu_items(name, price, active) VALUES(?, ?, 0)",
+                        (name, int(it["price"]))
+                    )
+                    item_id = by_name[name] = cur.execute(
+                        "SELECT id FROM menu_items WHERE name = ?", (name,)
+                    ).fetchone()[0]
+            ids.append(int(item_id))
+        return ids
+
+    def _init_item_search(self, cur: sqlite3.Cursor):
+        """
+        Index FTS5 atas nama item + catatan. Isi teksnya tidak disimpan dua
+        kali: FTS membaca view order_items_search (external content), dan
+        trigger menjaga index tetap sinkron dengan order_items / nama menu.
+        Database lama di-backfill sekali lewat perintah 'rebuild'.
+
+        Index awalan 1-6 huruf: tanpa itu, kata umum yang diketik sebagian
+        ("nasi g") harus menggabungkan seluruh doclist dan jadi puluhan ms.
+        """
+        backfill = not self._table_exists("order_items_fts")
+
+        cur.execute("""
+        CREATE VIEW IF NOT EXISTS order_items_search(id, item_name, note) AS
+        SELECT i.id, m.name, i.note
+        FROM order_items i
+        JOIN menu_items m ON m.id = i.item_id
+        """)
+        try:
+            cur.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS order_items_fts USING fts5(
+                item_name, note,
+                content='order_items_search', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='1 2 3 4 5 6'
+            )
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite tanpa FTS5: search_orders jatuh ke LIKE
+            print(f"Warning: FTS5 tidak tersedia, pencarian memakai LIKE: {e}")
+            return
+
+        # Untuk 'delete', FTS5 butuh nilai lama persis seperti saat di-index
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_order_items_fts_ins
+        AFTER INSERT ON order_items
+        BEGIN
+            INSERT INTO order_items_fts(rowid, item_name, note)
+            VALUES (NEW.id, (SELECT name FROM menu_items WHERE id = NEW.item_id), NEW.note);
+        END;
+        """)
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_order_items_fts_del
+        AFTER DELETE ON order_items
+        BEGIN
+            INSERT INTO order_items_fts(order_items_fts, rowid, item_name, note)
+            VALUES ('delete', OLD.id, (SELECT name FROM menu_items WHERE id = OLD.item_id), OLD.note);
+        END;
+        """)
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_order_items_fts_upd
+        AFTER UPDATE OF item_id, note ON order_items
+        BEGIN
+            INSERT INTO order_items_fts(order_items_fts, rowid, item_name, note)
+            VALUES ('delete', OLD.id, (SELECT name FROM menu_items WHERE id = OLD.item_id), OLD.note);
+            INSERT INTO order_items_fts(rowid, item_name, note)
+            VALUES (NEW.id, (SELECT name FROM menu_items WHERE id = NEW.item_id), NEW.note);
+        END;
+        """)
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_menu_items_fts_rename
+        AFTER UPDATE OF name ON menu_items
+        BEGIN
+            INSERT INTO order_items_fts(order_items_fts, rowid, item_name, note)
+            SELECT 'delete', id, OLD.name, note FROM order_items WHERE item_id = NEW.id;
+            INSERT INTO order_items_fts(rowid, item_name, note)
+            SELECT id, NEW.name, note FROM order_items WHERE item_id = NEW.id;
+        END;
+        """)
+
+        if backfill:
+            cur.execute("INSERT INTO order_items_fts(order_items_fts) VALUES('rebuild')")
+
+    def _init_write_seq(self, cur: sqlite3.Cursor):
+        """
+        app_meta.write_seq naik setiap orders/order_items berubah (atau nama
+        menu diganti), dari koneksi/proses mana pun. Dipakai ResultCache untuk
+        membedakan tulisan sendiri (sudah diinvalidasi tepat) dari tulisan luar.
+        """
+        cur.execute("INSERT OR IGNORE INTO app_meta(key, value) VALUES('write_seq', 0)")
+        for table in ("orders", "order_items"):
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cur.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_write_seq_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE app_meta SET value = value + 1 WHERE key = 'write_seq';
+                END;
+                """)
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_menu_items_write_seq_rename
+        AFTER UPDATE OF name ON menu_items
+        BEGIN
+            UPDATE app_meta SET value = value + 1 WHERE key = 'write_seq';
+        END;
+        """)
+
+    def _init_order_events(self, cur: sqlite3.Cursor):
+        """
+        Outbox perubahan order untuk proses lain (layar dapur, kasir kedua):
+        satu baris per order dibuat/dihapus, ditulis di transaksi yang sama
+        dengan perubahannya. seq AUTOINCREMENT tidak pernah dipakai ulang
+        walau event lama dibuang, dan karena penulis SQLite berurutan, event
+        dengan seq N terlihat hanya setelah semua seq < N ter-commit.
+        Order yang dipindah ke arsip tidak dicatat (order-nya tetap ada).
+        """
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS order_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,          -- 'created' / 'voided'
+            order_id INTEGER NOT NULL,
+            order_no TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            items TEXT NOT NULL,         -- JSON [{item_id, name, price, qty, note, subtotal}]
+            logged_at TEXT NOT NULL
+        );
+        """)
+        # Port UDP subscriber yang mau dibangunkan langsung setelah commit
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS feed_listeners (
+            port INTEGER PRIMARY KEY,
+            registered_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        """)
+
+    def _init_archive_registry(self, cur: sqlite3.Cursor):
+        """
+        Daftar file arsip beserta rentang id dan tanggal order di dalamnya,
+        supaya query yang jatuh di luar database utama tahu arsip mana yang
+        perlu di-ATTACH.
+        """
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS archive_partitions (
+            name TEXT PRIMARY KEY,
+            min_id INTEGER NOT NULL,
+            max_id INTEGER NOT NULL,
+            first_day TEXT NOT NULL,
+            last_day TEXT NOT NULL,
+            order_count INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """)
+
+    # ---------- arsip ----------
+
+    def archive_path(self, name: str) -> str:
+        return os.path.join(self.archive_dir, f"orders_{name}.db")
+
+    def _attach(self, conn: sqlite3.Connection, name: str, create: bool = False) -> str:
+        """
+        ATTACH file arsip `name` ke koneksi (sekali, lalu dipakai ulang) dan
+        kembalikan alias skemanya. Koneksi reader membukanya read-only.
+        Jangan dipanggil di dalam transaksi.
+        """
+        attached = self._attached.setdefault(conn, OrderedDict())
+        alias = attached.get(name)
+        if alias is not None:
+            attached.move_to_end(name)
+            return alias
+
+        if len(attached) >= self.ATTACH_LIMIT:
+            _, old_alias = attached.popitem(last=False)
+            conn.execute(f"DETACH DATABASE {old_alias}")
+
+        path = self.archive_path(name)
+        alias = "arc_" + name.replace("-", "_")
+        if conn is self.conn:
+            if create:
+                os.makedirs(self.archive_dir, exist_ok=True)
+            elif not os.path.exists(path):
+                raise FileNotFoundError(f"file arsip tidak ditemukan: {path}")
+            conn.execute("ATTACH DATABASE ? AS " + alias, (path,))
         else:
-            last_no = row["order_no"]          # contoh: ORD-20260105-007
-            last_seq = int(last_no.split("-")[-1])
-            seq = last_seq + 1
+            conn.execute("ATTACH DATABASE ? AS " + alias, (Path(path).resolve().as_uri() + "?mode=ro",))
+        attached[name] = alias
+
+        if create:
+            self._init_archive_schema(conn, alias)
+        return alias
+
+    def _init_archive_schema(self, conn: sqlite3.Connection, alias: str):
+        """Skema file arsip: orders, order_items dan rollup daily_sales miliknya sendiri."""
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {alias}.orders (
+            id INTEGER PRIMARY KEY,
+            order_no TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL,
+            total INTEGER NOT NULL
+        )""")
+        # item_id menunjuk menu_items di database utama (FK lintas file tidak bisa)
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {alias}.order_items (
+            id INTEGER PRIMARY KEY,
+            order_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            price INTEGER NOT NULL,
+            qty INTEGER NOT NULL,
+            note TEXT,
+            subtotal INTEGER NOT NULL
+        )""")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {alias}.idx_orders_created_at ON orders(created_at)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {alias}.idx_order_items_order_id ON order_items(order_id)")
+        conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {alias}.daily_sales (
+            day TEXT PRIMARY KEY,
+            order_count INTEGER NOT NULL,
+            revenue INTEGER NOT NULL
+        ) WITHOUT ROWID""")
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {alias}.trg_orders_daily_sales_ins
+        AFTER INSERT ON orders
+        BEGIN
+            INSERT INTO daily_sales(day, order_count, revenue)
+            VALUES (substr(NEW.created_at, 1, 10), 1, NEW.total)
+            ON CONFLICT(day) DO UPDATE SET
+                order_count = order_count + 1,
+                revenue = revenue + excluded.revenue;
+        END""")
+
+    def _archive_partitions(self, first_day: Optional[str] = None, last_day: Optional[str] = None,
+                            order_id: Optional[int] = None, after_id: Optional[int] = None) -> list[str]:
+        """Nama arsip yang mungkin berisi order pada rentang hari / id tertentu, urut waktu."""
+        return [r[0] for r in self.reader.execute("""
+            SELECT name FROM archive_partitions
+            WHERE last_day >= ? AND first_day <= ?
+              AND (? IS NULL OR ? BETWEEN min_id AND max_id)
+              AND max_id > ?
+            ORDER BY first_day
+        """, (first_day or "", last_day or "9999", order_id, order_id, after_id or 0))]
+
+    @retry_on_busy
+    def _archive_batch(self, groups: dict) -> None:
+        """
+        Pindahkan satu batch order (groups: nama arsip -> [order id]) dari
+        database utama ke arsipnya, dalam dua transaksi pendek:
+        1. salin ke arsip (INSERT OR IGNORE, jadi aman diulang),
+        2. hapus dari database utama + perbarui archive_partitions.
+        Kalau proses mati di antaranya, order ada di dua tempat sampai
+        archive_orders dijalankan lagi; tidak pernah hilang.
+        """
+        aliases = {name: self._attach(self.conn, name, create=True) for name in groups}
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN;")
+            for name, ids in groups.items():
+                alias = aliases[name]
+                marks = ",".join("?" * len(ids))
+                cur.execute(f"""
+                    INSERT OR IGNORE INTO {alias}.orders(id, order_no, created_at, total)
+                    SELECT id, order_no, created_at, total FROM main.orders WHERE id IN ({marks})
+                """, ids)
+                cur.execute(f"""
+                    INSERT OR IGNORE INTO {alias}.order_items(id, order_id, item_id, price, qty, note, subtotal)
+                    SELECT id, order_id, item_id, price, qty, note, subtotal
+                    FROM main.order_items WHERE order_id IN ({marks})
+                """, ids)
+            cur.execute("COMMIT;")
+
+            cur.execute("BEGIN IMMEDIATE;")
+            for name, ids in groups.items():
+                marks = ",".join("?" * len(ids))
+                cur.execute(f"""
+                    INSERT INTO archive_partitions(name, min_id, max_id, first_day, last_day, order_count)
+                    SELECT ?, MIN(id), MAX(id), MIN(substr(created_at, 1, 10)),
+                           MAX(substr(created_at, 1, 10)), COUNT(*)
+                    FROM main.orders WHERE id IN ({marks})
+                    ON CONFLICT(name) DO UPDATE SET
+                        min_id = MIN(min_id, excluded.min_id),
+                        max_id = MAX(max_id, excluded.max_id),
+                        first_day = MIN(first_day, excluded.first_day),
+                        last_day = MAX(last_day, excluded.last_day),
+                        order_count = order_count + excluded.order_count
+                """, (name, *ids))
+                # order_items ikut terhapus lewat ON DELETE CASCADE
+                cur.execute(f"DELETE FROM main.orders WHERE id IN ({marks})", ids)
+            cur.execute("COMMIT;")
+        except Exception:
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK;")
+            raise
+
+    def archive_orders(
+        self,
+        older_than_days: int = ARCHIVE_AFTER_DAYS,
+        by: str = "year",
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        pause_s: float = ARCHIVE_BATCH_PAUSE,
+        now: Optional[datetime] = None,
+    ) -> ArchiveResult:
+        """
+        Pindahkan order (beserta item-nya) yang lebih tua dari older_than_days
+        ke file arsip per tahun/bulan. Dikerjakan per batch kecil dengan jeda,
+        jadi kasir lain tetap bisa menyimpan order selama proses berjalan.
+        Method baca (get_order_by_id, list_order_items, get_monthly_sales,
+        iter_order_item_rows) otomatis ikut membaca arsip.
+        """
+        if by not in self.ARCHIVE_GRANULARITIES:
+            raise ValueError(f"by harus salah satu dari {self.ARCHIVE_GRANULARITIES}")
+        if self.archive_dir is None:
+            raise ValueError("database in-memory tidak bisa diarsipkan")
+
+        key_len = 4 if by == "year" else 7  # '2024' atau '2024-03'
+        cutoff = ((now or datetime.now()) - timedelta(days=older_than_days)).strftime("%Y-%m-%d 00:00:00")
+
+        result = ArchiveResult()
+        t0 = time.perf_counter()
+        while True:
+            rows = self.conn.execute("""
+                SELECT id, created_at FROM orders
+                WHERE created_at < ?
+                ORDER BY created_at, id
+                LIMIT ?
+            """, (cutoff, batch_size)).fetchall()
+            if not rows:
+                break
 
-        return f"{prefix}{seq:03d}"
+            groups = {}
+            for order_id, created_at in rows:
+                groups.setdefault(created_at[:key_len], []).append(order_id)
+            self._archive_batch(groups)
+
+            result.moved += len(rows)
+            result.batches += 1
+            for name in groups:
+                if name not in result.partitions:
+                    result.partitions.append(name)
+            if pause_s:
+                time.sleep(pause_s)
+
+        result.elapsed_s = time.perf_counter() - t0
+        return result
+
+    def _format_order_no(self, day: str, seq: int) -> str:
+        return f"ORD-{day}-{seq:0{self.order_no_width}d}"
+
+    def _next_order_no(self, cur: sqlite3.Cursor, when: datetime) -> str:
+        """
+        Alokasikan nomor order berikutnya untuk hari `when`.
+        Harus dipanggil di dalam transaksi yang sama dengan INSERT order.
+        """
+        day = when.strftime("%Y%m%d")
+        cur.execute("""
+            INSERT INTO order_seq(day, last_seq) VALUES(?, 1)
+            ON CONFLICT(day) DO UPDATE SET last_seq = last_seq + 1
+        """, (day,))
+        seq = cur.execute(
+            "SELECT last_seq FROM order_seq WHERE day = ?", (day,)
+        ).fetchone()[0]
+        return self._format_order_no(day, seq)
+
+    @retry_on_busy
+    def reserve_order_nos(self, count: int, when: Optional[datetime] = None) -> list[str]:
+        """
+        Pesan `count` nomor order berurutan untuk hari `when` dalam satu
+        transaksi kecil. Dipakai jalur journal supaya nomor bisa diberikan ke
+        kasir sebelum order di-commit, tetap unik antar kasir.
+        """
+        day = (when or datetime.now()).strftime("%Y%m%d")
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE;")
+            cur.execute("""
+                INSERT INTO order_seq(day, last_seq) VALUES(?, ?)
+                ON CONFLICT(day) DO UPDATE SET last_seq = last_seq + excluded.last_seq
+            """, (day, count))
+            last = cur.execute("SELECT last_seq FROM order_seq WHERE day = ?", (day,)).fetchone()[0]
+            cur.execute("COMMIT;")
+        except Exception:
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK;")
+            raise
+        return [self._format_order_no(day, n) for n in range(last - count + 1, last + 1)]
+
+    @retry_on_busy
+    def release_order_nos(self, unused: list[str]) -> None:
+        """
+        Kembalikan sisa nomor hasil reserve_order_nos yang tidak terpakai,
+        hanya kalau belum ada kasir lain yang mengambil nomor sesudahnya
+        (kalau sudah, nomor dibiarkan bolong supaya tidak pernah dobel).
+        """
+        if not unused:
+            return
+        day = unused[0].split("-")[1]
+        seqs = sorted(int(no.split("-")[-1]) for no in unused)
+        # Hanya ekor yang bersambung yang bisa dikembalikan: sebelum celah
+        # ada nomor yang sudah dipakai kasir lain
+        first = last = seqs[-1]
+        for n in reversed(seqs[:-1]):
+            if n != first - 1:
+                break
+            first = n
+        with self.conn:
+            self.conn.execute(
+                "UPDATE order_seq SET last_seq = ? WHERE day = ? AND last_seq = ?",
+                (first - 1, day, last)
+            )
+
+    def generate_order_no(self) -> str:
+        """
+        Format: ORD-YYYYMMDD-001 (reset tiap hari)
+        Hanya pratinjau nomor berikutnya; nomor sebenarnya dialokasikan
+        di dalam transaksi create_order.
+        """
+        day = datetime.now().strftime("%Y%m%d")
+        row = self.conn.execute(
+            "SELECT last_seq FROM order_seq WHERE day = ?", (day,)
+        ).fetchone()
+        seq = 1 if row is None else row[0] + 1
+        return self._format_order_no(day, seq)
 
+    @retry_on_busy
     def create_order(self, items: list[dict]) -> tuple[int, str]:
         """
-        items: [{name, price, qty, note}]
+        items: [{name, price, qty, note}] atau [{item_id, price, qty, note}]
         return: (order_id, order_no)
         """
         if not items:
             raise ValueError("items kosong")
 
-        order_no = self.generate_order_no()
-        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = datetime.now()
+        created_at = now.strftime("%Y-%m-%d %H:%M:%S")
 
         total = 0
         for it in items:
@@ -81,8 +1099,12 @@ class Database:
 
         cur = self.conn.cursor()
         try:
-            cur.execute("BEGIN;")
+            # IMMEDIATE: ambil write lock di awal supaya kasir lain menunggu,
+            # bukan gagal di tengah transaksi
+            cur.execute("BEGIN IMMEDIATE;")
+            seq = self._cache_seq(cur)
 
+            order_no = self._next_order_no(cur, now)
             cur.execute(
                 "INSERT INTO orders(order_no, created_at, total) VALUES(?, ?, ?)",
                 (order_no, created_at, total)
@@ -90,80 +1112,828 @@ class Database:
             order_id = cur.lastrowid
 
             rows = []
-            for it in items:
+            for it, item_id in zip(items, self._resolve_item_ids(cur, items)):
                 price = int(it["price"])
                 qty = int(it["qty"])
                 subtotal = price * qty
                 note = (it.get("note") or "").strip()
-                rows.append((order_id, it["name"], price, qty, note, subtotal))
+                rows.append((order_id, item_id, price, qty, note, subtotal))
 
             cur.executemany(
-                "INSERT INTO order_items(order_id, item_name, price, qty, note, subtotal) VALUES(?, ?, ?, ?, ?, ?)",
+                "INSERT INTO order_items(order_id, item_id, price, qty, note, subtotal) VALUES(?, ?, ?, ?, ?, ?)",
                 rows
             )
 
+            self._record_order_events(cur, "created", "id = ?", (order_id,))
+            ports = self._feed_ports(cur)
+            keys = self._order_cache_keys(cur, "id = ?", (order_id,))
+            seq_after = self._cache_seq(cur)
             cur.execute("COMMIT;")
+            self._cache_applied(seq, seq_after, keys)
+            self._notify_feed(ports)
             return order_id, order_no
         except Exception:
-            cur.execute("ROLLBACK;")
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK;")
             raise
 
-    def get_order_by_id(self, order_id: int):
+    def create_orders_bulk(self, orders: Iterable[dict], batch_size: int = 1000) -> BulkResult:
         """
-        Mengambil data order berdasarkan ID.
-        Return: sqlite3.Row atau None jika tidak ditemukan.
+        Import banyak order sekaligus (mis. dari tablet offline atau backfill).
+        orders: [{created_at, items: [{name atau item_id, price, qty, note}], order_no?}]
+                created_at: datetime atau 'YYYY-MM-DD HH:MM:SS' (default: sekarang)
+                order_no: opsional, nomor yang sudah dialokasikan sebelumnya
+                (lihat reserve_order_nos); order dengan nomor yang sudah ada
+                di database dilewati, jadi import ulang aman (idempotent).
+
+        Semua batch ditulis dalam satu transaksi (satu fsync). Tiap batch punya
+        SAVEPOINT sendiri: order yang tidak valid hanya membatalkan batch-nya,
+        batch lain tetap tersimpan. Nomor order dialokasikan per hari dari
+        order_seq dalam satu langkah per batch.
         """
+        # Jadikan list sebelum retry: kalau SQLITE_BUSY muncul saat COMMIT
+        # setelah generator habis dibaca, percobaan ulang akan mendapat
+        # iterator kosong dan order hilang tanpa error
+        return self._create_orders_bulk(list(orders), batch_size)
+
+    @retry_on_busy
+    def _create_orders_bulk(self, orders: list[dict], batch_size: int) -> BulkResult:
+        result = BulkResult()
         cur = self.conn.cursor()
-        return cur.execute("""
+        try:
+            cur.execute("BEGIN IMMEDIATE;")
+            seq = self._cache_seq(cur)
+            next_id = first_id = cur.execute("""
+                SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'orders'), 0),
+                           COALESCE((SELECT MAX(id) FROM orders), 0)) + 1
+            """).fetchone()[0]
+
+            batch = []
+            start = 0
+            for index, order in enumerate(orders):
+                batch.append(order)
+                if len(batch) >= batch_size:
+                    next_id = self._insert_bulk_batch(cur, batch, start, next_id, result)
+                    start = index + 1
+                    batch = []
+            if batch:
+                self._insert_bulk_batch(cur, batch, start, next_id, result)
+
+            # Semua order baru di transaksi ini punya id >= first_id
+            ports = []
+            if result.created:
+                self._record_order_events(cur, "created", "id >= ?", (first_id,))
+                ports = self._feed_ports(cur)
+            keys = self._order_cache_keys(cur, "id >= ?", (first_id,))
+            seq_after = self._cache_seq(cur)
+            cur.execute("COMMIT;")
+            self._cache_applied(seq, seq_after, keys)
+            self._notify_feed(ports)
+            return result
+        except Exception:
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK;")
+            raise
+
+    def _insert_bulk_batch(self, cur: sqlite3.Cursor, batch: list, start: int, next_id: int,
+                           result: BulkResult) -> int:
+        """Tulis satu batch di dalam SAVEPOINT. Return id order berikutnya."""
+        first_id = next_id
+        cur.execute("SAVEPOINT bulk_batch;")
+        try:
+            prepared = []  # (created_at, day, total, item_rows, order_no)
+            by_name = {m.name: m.id for m in self.get_menu(include_inactive=True)}
+            for order in batch:
+                items = order["items"]
+                if not items:
+                    raise ValueError("items kosong")
+                when = order.get("created_at") or datetime.now()
+                if not isinstance(when, datetime):
+                    when = datetime.strptime(when, "%Y-%m-%d %H:%M:%S")
+                rows = []
+                total = 0
+                for it, item_id in zip(items, self._resolve_item_ids(cur, items, by_name)):
+                    price = int(it["price"])
+                    qty = int(it["qty"])
+                    note = it.get("note") or ""
+                    if not isinstance(note, str):
+                        raise TypeError("note harus teks")
+                    total += price * qty
+                    rows.append((item_id, price, qty, note.strip(), price * qty))
+                prepared.append((when.strftime("%Y-%m-%d %H:%M:%S"), when.strftime("%Y%m%d"),
+                                 total, rows, order.get("order_no")))
+
+            # Nomor yang sudah ada (import ulang) dilewati
+            given = [p[4] for p in prepared if p[4]]
+            existing = set()
+            if given:
+                existing = {r[0] for r in cur.execute(
+                    f"SELECT order_no FROM orders WHERE order_no IN ({','.join('?' * len(given))})",
+                    given
+                )}
+
+            # Nomor urut: baca counter semua hari di batch sekali, lanjutkan di Python
+            days = sorted({p[1] for p in prepared})
+            seq = dict(cur.execute(
+                f"SELECT day, last_seq FROM order_seq WHERE day IN ({','.join('?' * len(days))})",
+                days
+            ).fetchall())
+
+            order_rows = []
+            item_rows = []
+            created = []
+            for created_at, day, total, rows, order_no in prepared:
+                if order_no:
+                    if order_no in existing:
+                        continue
+                    day = order_no.split("-")[1]
+                    seq[day] = max(seq.get(day, 0), int(order_no.split("-")[-1]))
+                else:
+                    seq[day] = seq.get(day, 0) + 1
+                    order_no = self._format_order_no(day, seq[day])
+                order_rows.append((next_id, order_no, created_at, total))
+                item_rows.extend((next_id, *r) for r in rows)
+                created.append((next_id, order_no))
+                next_id += 1
+
+            cur.executemany(
+                "INSERT INTO orders(id, order_no, created_at, total) VALUES(?, ?, ?, ?)",
+                order_rows
+            )
+            cur.executemany(
+                "INSERT INTO order_items(order_id, item_id, price, qty, note, subtotal) VALUES(?, ?, ?, ?, ?, ?)",
+                item_rows
+            )
+            cur.executemany("""
+                INSERT INTO order_seq(day, last_seq) VALUES(?, ?)
+                ON CONFLICT(day) DO UPDATE SET last_seq = MAX(last_seq, excluded.last_seq)
+            """, list(seq.items()))
+
+            cur.execute("RELEASE bulk_batch;")
+        except (sqlite3.IntegrityError, sqlite3.DataError, sqlite3.InterfaceError,
+                sqlite3.ProgrammingError, KeyError, TypeError, ValueError, OverflowError) as e:
+            # Data order yang salah (termasuk angka di luar INTEGER SQLite atau
+            # tipe yang tidak bisa di-bind): hanya batch ini yang dibatalkan
+            cur.execute("ROLLBACK TO bulk_batch;")
+            cur.execute("RELEASE bulk_batch;")
+            result.rejected.append((start, f"{type(e).__name__}: {e}"))
+            return first_id
+
+        result.created.extend(created)
+        return next_id
+
+    # ---------- cache hasil query ----------
+
+    def _write_seq(self, conn) -> Optional[int]:
+        row = conn.execute("SELECT value FROM app_meta WHERE key = 'write_seq'").fetchone()
+        return None if row is None else row[0]
+
+    def _cache_seq(self, cur: sqlite3.Cursor) -> Optional[int]:
+        """write_seq di dalam transaksi tulis (hanya kalau cache aktif)."""
+        return None if self.cache is None else self._write_seq(cur)
+
+    def _order_cache_keys(self, cur: sqlite3.Cursor, where: str, params) -> Optional[list]:
+        """Key cache yang terdampak kalau order-order ini dibuat/dihapus."""
+        if self.cache is None:
+            return None
+        keys = []
+        for order_id, created_at in cur.execute(f"SELECT id, created_at FROM orders WHERE {where}", params):
+            keys += [("order", order_id), ("items", order_id),
+                     ("monthly", int(created_at[:4]), int(created_at[5:7]))]
+        return keys
+
+    def _cache_applied(self, seq_before: Optional[int], seq_after: Optional[int], keys: Optional[list]):
+        if self.cache is not None:
+            self.cache.applied(seq_before, seq_after, keys)
+
+    def _cache_check(self) -> int:
+        """
+        Kalau ada commit dari koneksi lain sejak cek terakhir (data_version
+        berubah), cocokkan write_seq; return generation cache saat ini.
+        """
+        version = self.reader.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self.cache.sync(self._write_seq(self.reader))
+        return self.cache.generation
+
+    def _cached(self, key: tuple, load):
+        if self.cache is None:
+            return load()
+        generation = self._cache_check()
+        value = self.cache.get(key)
+        if value is ResultCache.MISSING:
+            value = load()
+            if value:  # None / kosong tidak disimpan (order belum ada atau sudah dihapus)
+                self.cache.put(key, value, generation)
+        return list(value) if isinstance(value, list) else value
+
+    def peek_order_items(self, order_id: int) -> Optional[list]:
+        """Item order dari cache saja (tanpa query); None kalau belum ada di cache."""
+        if self.cache is None:
+            return None
+        self._cache_check()
+        value = self.cache.get(("items", order_id))
+        return None if value is ResultCache.MISSING else list(value)
+
+    def prefetch_order_items(self, order_ids: Iterable[int]) -> int:
+        """
+        Muat item beberapa order sekaligus (satu query IN) ke cache, mis.
+        baris di sekitar order yang sedang dipilih. Return jumlah order dimuat.
+        Order yang sudah diarsipkan dilewati (dimuat biasa saat diminta).
+        """
+        if self.cache is None:
+            return 0
+        generation = self._cache_check()
+        missing = [i for i in dict.fromkeys(order_ids)
+                   if self.cache.peek(("items", i)) is ResultCache.MISSING]
+        if not missing:
+            return 0
+
+        grouped = {}
+        cur = self._cursor(self.reader)
+        cur.execute(f"""
+            SELECT m.name, i.price, i.qty, i.note, i.subtotal, i.order_id
+            FROM order_items i
+            JOIN menu_items m ON m.id = i.item_id
+            WHERE i.order_id IN ({','.join('?' * len(missing))})
+            ORDER BY i.order_id, i.id
+        """, missing)
+        for r in iter_records(cur, OrderItemRow, self.FETCH_CHUNK):
+            grouped.setdefault(r.order_id, []).append(r)
+        for order_id, rows in grouped.items():
+            self.cache.put(("items", order_id), rows, generation, prefetch=True)
+        return len(grouped)
+
+    def get_order_by_id(self, order_id: int) -> Optional[OrderRow]:
+        """
+        Mengambil data order berdasarkan ID.
+        Return: OrderRow atau None jika tidak ditemukan.
+        """
+        return self._cached(("order", order_id), lambda: self._load_order_by_id(order_id))
+
+    def _load_order_by_id(self, order_id: int) -> Optional[OrderRow]:
+        sql = """
             SELECT id, order_no, created_at, total
-            FROM orders
+            FROM {schema}.orders
             WHERE id = ?
-        """, (order_id,)).fetchone()
+        """
+        cur = self._cursor(self.reader)
+        row = cur.execute(sql.format(schema="main"), (order_id,)).fetchone()
+        if row is None:
+            for name in self._archive_partitions(order_id=order_id):
+                alias = self._attach(self.reader, name)
+                row = cur.execute(sql.format(schema=alias), (order_id,)).fetchone()
+                if row is not None:
+                    break
+        return None if row is None else OrderRow._make(row)
 
-    def list_orders(self):
-        cur = self.conn.cursor()
-        return cur.execute("""
+    def get_order_with_items(self, order_id: int):
+        """
+        Header order + item-itemnya sekaligus (untuk cetak struk).
+        Return: (order, items) atau None jika order tidak ditemukan.
+        """
+        order = self.get_order_by_id(order_id)
+        if order is None:
+            return None
+        return order, self.list_order_items(order_id)
+
+    def list_orders(self) -> list[OrderRow]:
+        """Semua order di database utama, terbaru dulu. Untuk data besar pakai iter_orders."""
+        return list(self.iter_orders())
+
+    def iter_orders(self, chunk_size: int = FETCH_CHUNK) -> Iterator[OrderRow]:
+        """Stream semua order di database utama (terbaru dulu), per `chunk_size` baris."""
+        cur = self._cursor(self.reader)
+        cur.execute("""
             SELECT id, order_no, created_at, total
             FROM orders
             ORDER BY id DESC
-        """).fetchall()
+        """)
+        return iter_records(cur, OrderRow, chunk_size)
 
-    def list_order_items(self, order_id: int):
-        cur = self.conn.cursor()
-        return cur.execute("""
-            SELECT item_name, price, qty, note, subtotal
-            FROM order_items
-            WHERE order_id = ?
-            ORDER BY id ASC
-        """, (order_id,)).fetchall()
+    def list_orders_page(self, before_id: Optional[int] = None, limit: int = 200) -> list[OrderRow]:
+        """
+        Keyset pagination: ambil `limit` order dengan id < before_id (terbaru dulu).
+        before_id None berarti mulai dari order terbaru.
+        """
+        cur = self._cursor(self.reader)
+        if before_id is None:
+            cur.execute("""
+                SELECT id, order_no, created_at, total
+                FROM orders
+                ORDER BY id DESC
+                LIMIT ?
+            """, (limit,))
+        else:
+            cur.execute("""
+                SELECT id, order_no, created_at, total
+                FROM orders
+                WHERE id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (before_id, limit))
+        return list(iter_records(cur, OrderRow, self.FETCH_CHUNK))
 
-    def get_monthly_sales(self, month: int, year: int) -> list[tuple[int, int]]:
-        cur = self.conn.cursor()
-        rows = cur.execute("""
-            SELECT CAST(strftime('%d', created_at) AS INTEGER) AS day,
-                   SUM(total) AS daily_total
+    def list_orders_after(self, after_id: int, limit: int = 200) -> list[OrderRow]:
+        """Order dengan id > after_id (terbaru dulu), untuk menyisipkan order baru di atas daftar."""
+        cur = self._cursor(self.reader)
+        cur.execute("""
+            SELECT id, order_no, created_at, total
+            FROM (
+                SELECT id, order_no, created_at, total
+                FROM orders
+                WHERE id > ?
+                ORDER BY id ASC
+                LIMIT ?
+            )
+            ORDER BY id DESC
+        """, (after_id, limit))
+        return list(iter_records(cur, OrderRow, self.FETCH_CHUNK))
+
+    def list_order_items(self, order_id: int) -> list[OrderItemRow]:
+        return self._cached(("items", order_id), lambda: self._load_order_items(order_id))
+
+    def _load_order_items(self, order_id: int) -> list[OrderItemRow]:
+        sql = """
+            SELECT m.name, i.price, i.qty, i.note, i.subtotal, i.order_id
+            FROM {schema}.order_items i
+            JOIN main.menu_items m ON m.id = i.item_id
+            WHERE i.order_id = ?
+            ORDER BY i.id ASC
+        """
+        cur = self._cursor(self.reader)
+        rows = cur.execute(sql.format(schema="main"), (order_id,)).fetchall()
+        if not rows:
+            # Order tanpa item di database utama: mungkin sudah diarsipkan
+            for name in self._archive_partitions(order_id=order_id):
+                alias = self._attach(self.reader, name)
+                rows = cur.execute(sql.format(schema=alias), (order_id,)).fetchall()
+                if rows:
+                    break
+        return list(map(OrderItemRow._make, rows))
+
+    @staticmethod
+    def _fts_query(text: str) -> Optional[str]:
+        """'nasi gor samb' -> '"nasi"* AND "gor"* AND "samb"*' (semua kata, awalan)."""
+        words = re.findall(r"\w+", text.lower())
+        if not words:
+            return None
+        return " AND ".join(f'"{w}"*' for w in words)
+
+    def search_orders(
+        self,
+        query: str,
+        date_from: Optional[DateLike] = None,
+        date_to: Optional[DateLike] = None,
+        limit: int = 200,
+    ):
+        """
+        Cari order lewat nama item dan catatan (awalan kata, semua kata harus
+        ada di item yang sama), terbaru dulu. Rentang tanggal inklusif.
+        Hanya database utama; order yang sudah diarsipkan tidak ikut.
+        Return: list OrderRow seperti list_orders_page.
+        """
+        match = self._fts_query(query)
+        if match is None:
+            return []
+        start, end = day_bounds(date_from, date_to)
+
+        if self._table_exists("order_items_fts"):
+            # Dibaca dari item terbaru (rowid turun) dan berhenti begitu `limit`
+            # order terkumpul, jadi kata yang sangat umum pun tetap cepat
+            cur = self.reader.execute("""
+                SELECT i.order_id
+                FROM order_items_fts f
+                JOIN order_items i ON i.id = f.rowid
+                JOIN orders o ON o.id = i.order_id
+                WHERE order_items_fts MATCH ?
+                  AND o.created_at >= ? AND o.created_at < ?
+                ORDER BY f.rowid DESC
+            """, (match, start, end))
+        else:
+            words = re.findall(r"\w+", query.lower())
+            cond = " AND ".join("(m.name || ' ' || COALESCE(i.note, '')) LIKE ?" for _ in words)
+            cur = self.reader.execute(f"""
+                SELECT i.order_id
+                FROM order_items i
+                JOIN menu_items m ON m.id = i.item_id
+                JOIN orders o ON o.id = i.order_id
+                WHERE {cond} AND o.created_at >= ? AND o.created_at < ?
+                ORDER BY i.id DESC
+            """, (*(f"%{w}%" for w in words), start, end))
+
+        order_ids = []
+        seen = set()
+        try:
+            while len(order_ids) < limit:
+                rows = cur.fetchmany(limit)
+                if not rows:
+                    break
+                for (order_id,) in rows:
+                    if order_id not in seen:
+                        seen.add(order_id)
+                        order_ids.append(order_id)
+                        if len(order_ids) >= limit:
+                            break
+        finally:
+            cur.close()
+        if not order_ids:
+            return []
+
+        cur = self._cursor(self.reader)
+        cur.execute(f"""
+            SELECT id, order_no, created_at, total
             FROM orders
-            WHERE strftime('%Y', created_at) = ?
-              AND strftime('%m', created_at) = ?
-            GROUP BY day
+            WHERE id IN ({','.join('?' * len(order_ids))})
+            ORDER BY id DESC
+        """, order_ids)
+        return list(iter_records(cur, OrderRow, self.FETCH_CHUNK))
+
+    # Kolom hasil iter_order_item_rows (satu baris per item)
+    ORDER_ITEM_COLUMNS = OrderExportRow._fields
+
+    def iter_order_item_rows(
+        self,
+        date_from: Optional[DateLike] = None,
+        date_to: Optional[DateLike] = None,
+        after_id: Optional[int] = None,
+        chunk_size: int = FETCH_CHUNK,
+    ) -> Iterator[OrderExportRow]:
+        """
+        Stream orders JOIN order_items untuk rentang tanggal (inklusif), satu
+        query dan diambil per `chunk_size` baris, jadi memori tetap kecil
+        berapapun jumlah datanya. Urut: created_at, order id, item id.
+        after_id: hanya order dengan id > after_id (untuk lanjut ekspor);
+        urutannya lalu per order id supaya bisa langsung seek lewat primary key.
+        """
+        start, end = day_bounds(date_from, date_to)
+        if after_id is None:
+            created, order_by = "o.created_at", "o.created_at, o.id, i.id"
+        else:
+            # '+' mematikan index created_at supaya SQLite seek lewat id
+            created, order_by = "+o.created_at", "o.id, i.id"
+
+        # Arsip (lebih tua) dulu, lalu database utama. ATTACH satu per satu
+        # karena jumlah arsip bisa melebihi ATTACH_LIMIT
+        sources = self._archive_partitions(start[:10], end[:10], after_id=after_id)
+        sources.append(None)
+
+        for name in sources:
+            schema = "main" if name is None else self._attach(self.reader, name)
+            cur = self._cursor(self.reader)
+            cur.execute(f"""
+                SELECT o.id, o.order_no, o.created_at, o.total,
+                       i.id, i.item_id, m.name, i.price, i.qty, i.note, i.subtotal
+                FROM {schema}.orders o
+                LEFT JOIN {schema}.order_items i ON i.order_id = o.id
+                LEFT JOIN main.menu_items m ON m.id = i.item_id
+                WHERE {created} >= ? AND {created} < ?
+                  AND o.id > ?
+                ORDER BY {order_by}
+            """, (start, end, after_id or 0))
+            yield from iter_records(cur, OrderExportRow, chunk_size)
+
+    def iter_orders_with_items(
+        self,
+        date_from: Optional[DateLike] = None,
+        date_to: Optional[DateLike] = None,
+        after_id: Optional[int] = None,
+        chunk_size: int = FETCH_CHUNK,
+    ) -> Iterator[tuple[OrderRow, list[OrderItemRow]]]:
+        """
+        Seperti iter_order_item_rows, tapi dikelompokkan per order:
+        yield (OrderRow, [OrderItemRow]) seperti get_order_with_items.
+        """
+        order = None
+        items = []
+        for r in self.iter_order_item_rows(date_from, date_to, after_id, chunk_size):
+            if order is None or order.id != r.order_id:
+                if order is not None:
+                    yield order, items
+                order = OrderRow(r.order_id, r.order_no, r.created_at, r.total)
+                items = []
+            if r.order_item_id is not None:
+                items.append(OrderItemRow(r.item_name, r.price, r.qty, r.note, r.subtotal, r.order_id))
+        if order is not None:
+            yield order, items
+
+    def iter_item_facts(self, after_row_id: Optional[int] = None,
+                        chunk_size: int = 20000) -> Iterator[list[tuple]]:
+        """
+        Baris item ringkas untuk analitik, per potongan `chunk_size`:
+        (order_items.id, order_id, item_id, created_at epoch detik, qty, subtotal).
+        Epoch dihitung dari teks created_at apa adanya (jam lokal warung).
+        after_row_id None: arsip + database utama; kalau diisi, hanya item
+        baru di database utama (id > after_row_id), urut id.
+        """
+        sources = self._archive_partitions() if after_row_id is None else []
+        sources.append(None)
+
+        for name in sources:
+            schema = "main" if name is None else self._attach(self.reader, name)
+            cur = self.reader.cursor()
+            cur.row_factory = None  # tuple biasa, langsung jadi array NumPy
+            cur.execute(f"""
+                SELECT i.id, i.order_id, i.item_id,
+                       CAST(strftime('%s', o.created_at) AS INTEGER), i.qty, i.subtotal
+                FROM {schema}.order_items i
+                JOIN {schema}.orders o ON o.id = i.order_id
+                WHERE i.id > ?
+                ORDER BY i.id
+            """, (after_row_id or 0,))
+            try:
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cur.close()
+
+    def voided_watermark(self) -> Optional[str]:
+        """voided_at terbaru di voided_orders (None kalau belum ada order dihapus)."""
+        return self.reader.execute("SELECT MAX(voided_at) FROM voided_orders").fetchone()[0]
+
+    def list_voided_since(self, voided_at: Optional[str]) -> list[int]:
+        """Id order yang dihapus pada/sesudah `voided_at` (None = semua)."""
+        return [r[0] for r in self.reader.execute(
+            "SELECT order_id FROM voided_orders WHERE voided_at >= ?", (voided_at or "",)
+        )]
+
+    def get_monthly_sales(self, month: int, year: int) -> list[tuple[int, int]]:
+        """
+        Total penjualan per hari dalam satu bulan, dibaca dari rollup daily_sales
+        (maksimal 31 baris, lewat primary key).
+        """
+        return self._cached(("monthly", year, month), lambda: self._load_monthly_sales(month, year))
+
+    def _load_monthly_sales(self, month: int, year: int) -> list[tuple[int, int]]:
+        prefix = f"{year:04d}-{month:02d}-"
+        first, last = prefix + "01", prefix + "31"
+        sql = """
+            SELECT CAST(substr(day, 9, 2) AS INTEGER) AS day,
+                   revenue AS daily_total
+            FROM {schema}.daily_sales
+            WHERE day >= ? AND day <= ?
             ORDER BY day
-        """, (str(year), f"{month:02d}")).fetchall()
-        return [(row[0], row[1]) for row in rows]
+        """
+        rows = self.reader.execute(sql.format(schema="main"), (first, last)).fetchall()
+
+        archives = self._archive_partitions(first, last)
+        if not archives:
+            return [(row[0], row[1]) for row in rows]
+
+        # Bulan yang sebagian/seluruhnya sudah diarsipkan: jumlahkan per hari
+        totals = {}
+        for name in archives:
+            alias = self._attach(self.reader, name)
+            for day, revenue in self.reader.execute(sql.format(schema=alias), (first, last)):
+                totals[day] = totals.get(day, 0) + revenue
+        for day, revenue in rows:
+            totals[day] = totals.get(day, 0) + revenue
+        return sorted(totals.items())
 
-    def delete_order(self, order_id: int) -> bool:
+    @retry_on_busy
+    def delete_order(self, order_id: int, reason: str = "") -> bool:
+        """Hapus satu order (item ikut terhapus lewat ON DELETE CASCADE) dan catat tombstone."""
         cur = self.conn.cursor()
         try:
-            cur.execute("BEGIN;")
-            
-            # First, delete all items associated with this order
-            cur.execute("DELETE FROM order_items WHERE order_id = ?", (order_id,))
-            
-            # Then, delete the order header
-            cur.execute("DELETE FROM orders WHERE id = ?", (order_id,))
-            
+            cur.execute("BEGIN IMMEDIATE;")
+            seq = self._cache_seq(cur)
+            keys = self._order_cache_keys(cur, "id = ?", (order_id,))
+            deleted = self._void_chunk(cur, [order_id], reason)
+            ports = self._feed_ports(cur) if deleted else []
+            seq_after = self._cache_seq(cur)
             cur.execute("COMMIT;")
-            return True
+            self._cache_applied(seq, seq_after, keys)
+            self._notify_feed(ports)
+            return deleted == 1
         except Exception:
-            cur.execute("ROLLBACK;")
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK;")
             raise
 
+    def _void_chunk(self, cur: sqlite3.Cursor, ids: list[int], reason: str) -> int:
+        """Tombstone + event 'voided' + hapus order `ids` di dalam transaksi yang sedang berjalan."""
+        marks = ",".join("?" * len(ids))
+        self._record_order_events(cur, "voided", f"id IN ({marks})", ids)
+        cur.execute(f"""
+            INSERT OR REPLACE INTO voided_orders(order_id, order_no, created_at, total, item_count, voided_at, reason)
+            SELECT o.id, o.order_no, o.created_at, o.total,
+                   (SELECT COUNT(*) FROM order_items i WHERE i.order_id = o.id),
+                   ?, ?
+            FROM orders o
+            WHERE o.id IN ({marks})
+        """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), reason, *ids))
+        cur.execute(f"DELETE FROM orders WHERE id IN ({marks})", ids)
+        return cur.rowcount
+
+    @retry_on_busy
+    def _void_ids(self, ids: list[int], reason: str) -> int:
+        cur = self.conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE;")
+            seq = self._cache_seq(cur)
+            keys = self._order_cache_keys(cur, f"id IN ({','.join('?' * len(ids))})", ids)
+            deleted = self._void_chunk(cur, ids, reason)
+            ports = self._feed_ports(cur) if deleted else []
+            seq_after = self._cache_seq(cur)
+            cur.execute("COMMIT;")
+            self._cache_applied(seq, seq_after, keys)
+            self._notify_feed(ports)
+            return deleted
+        except Exception:
+            if self.conn.in_transaction:
+                cur.execute("ROLLBACK;")
+            raise
+
+    def void_orders(
+        self,
+        order_ids: Optional[Iterable[int]] = None,
+        date_from: Optional[DateLike] = None,
+        date_to: Optional[DateLike] = None,
+        reason: str = "",
+        chunk_size: int = VOID_CHUNK_SIZE,
+        pause_s: float = VOID_CHUNK_PAUSE,
+        reclaim: bool = True,
+        reclaim_min_pages: int = RECLAIM_MIN_FREE_PAGES,
+    ) -> VoidResult:
+        """
+        Hapus banyak order sekaligus: daftar id, rentang tanggal (inklusif),
+        atau keduanya (id di dalam rentang). Setiap order yang dihapus dicatat
+        di voided_orders. Dikerjakan per `chunk_size` order dalam transaksi
+        pendek dengan jeda, jadi kasir tetap bisa menyimpan order; sesudahnya
+        ruang kosong dikembalikan bertahap (reclaim_space) kalau reclaim=True
+        dan halaman kosong sudah minimal `reclaim_min_pages`.
+        """
+        if order_ids is None and date_from is None and date_to is None:
+            raise ValueError("isi order_ids dan/atau rentang tanggal")
+
+        result = VoidResult()
+        t0 = time.perf_counter()
+        for n, chunk in enumerate(self._void_chunks(order_ids, date_from, date_to, chunk_size)):
+            if n and pause_s:
+                time.sleep(pause_s)
+            if chunk:
+                result.deleted += self._void_ids(chunk, reason)
+                result.chunks += 1
+
+        if (reclaim and result.deleted and
+                self.conn.execute("PRAGMA freelist_count").fetchone()[0] >= reclaim_min_pages):
+            result.pages_freed = self.reclaim_space(pause_s=pause_s)
+        result.elapsed_s = time.perf_counter() - t0
+        return result
+
+    def _void_chunks(self, order_ids, date_from, date_to, chunk_size: int) -> Iterator[list[int]]:
+        """Potongan id order yang akan dihapus; tiap potongan dicari sesudah potongan sebelumnya di-commit."""
+        start, end = day_bounds(date_from, date_to)
+        ranged = date_from is not None or date_to is not None
+
+        if order_ids is not None:
+            ids = sorted({int(i) for i in order_ids})
+            for k in range(0, len(ids), chunk_size):
+                chunk = ids[k:k + chunk_size]
+                if ranged:
+                    marks = ",".join("?" * len(chunk))
+                    chunk = [r[0] for r in self.conn.execute(
+                        f"SELECT id FROM orders WHERE id IN ({marks}) AND created_at >= ? AND created_at < ?",
+                        (*chunk, start, end)
+                    )]
+                yield chunk
+            return
+
+        after_id = 0
+        while True:
+            chunk = [r[0] for r in self.conn.execute("""
+                SELECT id FROM orders
+                WHERE created_at >= ? AND created_at < ? AND id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (start, end, after_id, chunk_size))]
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1]
+
+    # ---------- change feed ----------
+
+    def _record_order_events(self, cur: sqlite3.Cursor, kind: str, where: str, params) -> None:
+        """Catat event `kind` untuk order yang cocok dengan `where`, beserta itemnya, di transaksi berjalan."""
+        cur.execute(f"""
+            INSERT INTO order_events(kind, order_id, order_no, created_at, total, items, logged_at)
+            SELECT ?, o.id, o.order_no, o.created_at, o.total,
+                   (SELECT json_group_array(json_object(
+                        'item_id', i.item_id, 'name', m.name, 'price', i.price, 'qty', i.qty,
+                        'note', i.note, 'subtotal', i.subtotal))
+                    FROM order_items i JOIN menu_items m ON m.id = i.item_id
+                    WHERE i.order_id = o.id),
+                   ?
+            FROM orders o
+            WHERE o.{where}
+            ORDER BY o.id
+        """, (kind, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), *params))
+
+    def _feed_ports(self, cur: sqlite3.Cursor) -> list[int]:
+        """Port listener OrderFeed, dibaca di dalam transaksi tulis (selalu terbaru, tanpa cache)."""
+        return [r[0] for r in cur.execute("SELECT port FROM feed_listeners")]
+
+    def _notify_feed(self, ports: list[int]):
+        """
+        Bangunkan subscriber setelah commit. Hanya percepatan: datagram yang
+        hilang atau port yang sudah mati tidak apa-apa, subscriber tetap
+        melihat commit lewat PRAGMA data_version.
+        """
+        if not ports:
+            return
+        if self._notify_sock is None:
+            self._notify_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._notify_sock.setblocking(False)
+        for port in ports:
+            try:
+                self._notify_sock.sendto(b"!", ("127.0.0.1", port))
+            except OSError:
+                pass
+
+    @retry_on_busy
+    def register_feed_listener(self, port: int):
+        """Daftarkan (atau perbarui) port UDP subscriber; pendaftaran basi ikut dibuang."""
+        now = time.time()
+        with self.conn:
+            self.conn.execute("DELETE FROM feed_listeners WHERE registered_at < ?",
+                              (now - self.FEED_LISTENER_TTL_S,))
+            self.conn.execute("INSERT OR REPLACE INTO feed_listeners(port, registered_at) VALUES(?, ?)",
+                              (port, now))
+
+    @retry_on_busy
+    def unregister_feed_listener(self, port: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM feed_listeners WHERE port = ?", (port,))
+
+    def last_event_seq(self) -> int:
+        """
+        seq tertinggi yang pernah dipakai (high-water mark AUTOINCREMENT), juga
+        kalau event-nya sudah dibuang prune_order_events; 0 kalau belum ada.
+        """
+        row = self.reader.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'order_events'), 0),
+                       COALESCE((SELECT MAX(seq) FROM order_events), 0))
+        """).fetchone()
+        return row[0]
+
+    def first_event_seq(self) -> Optional[int]:
+        """seq event tertua yang masih disimpan (None kalau kosong)."""
+        return self.reader.execute("SELECT MIN(seq) FROM order_events").fetchone()[0]
+
+    def list_order_events(self, after_seq: int, limit: int = 500):
+        """Event dengan seq > after_seq, urut seq. Hanya membaca order_events lewat primary key."""
+        return self.reader.execute("""
+            SELECT seq, kind, order_id, order_no, created_at, total, items, logged_at
+            FROM order_events
+            WHERE seq > ?
+            ORDER BY seq
+            LIMIT ?
+        """, (after_seq, limit)).fetchall()
+
+    @retry_on_busy
+    def prune_order_events(self, keep_days: int = ORDER_EVENTS_KEEP_DAYS) -> int:
+        """Buang event yang lebih tua dari `keep_days` hari. Return jumlah yang dibuang."""
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM order_events WHERE logged_at < ?", (cutoff,))
+        return cur.rowcount
+
+    def reclaim_space(self, max_pages: Optional[int] = None, step_pages: int = VACUUM_STEP_PAGES,
+                      pause_s: float = VOID_CHUNK_PAUSE) -> int:
+        """
+        Kembalikan halaman kosong ke OS lewat PRAGMA incremental_vacuum,
+        `step_pages` per langkah dengan jeda, supaya tidak ada lock panjang
+        seperti VACUUM penuh. Tidak berbuat apa-apa kalau auto_vacuum bukan
+        INCREMENTAL. Return jumlah halaman yang dikembalikan.
+        """
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+
+        freed = 0
+        while max_pages is None or freed < max_pages:
+            free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if free == 0:
+                break
+            n = min(step_pages, free) if max_pages is None else min(step_pages, free, max_pages - freed)
+            # executescript menjalankan pragma sampai selesai; lewat execute()
+            # modul sqlite3 hanya melangkah sekali (= satu halaman)
+            self.conn.executescript(f"PRAGMA incremental_vacuum({int(n)});")
+            freed += free - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if pause_s:
+                time.sleep(pause_s)
+        return freed
+
+    def enable_incremental_vacuum(self):
+        """
+        Aktifkan auto_vacuum=INCREMENTAL di database lama. Butuh satu kali
+        VACUUM penuh (mengunci database), jadi jalankan saat warung tutup.
+        """
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        self.conn.execute("VACUUM;")
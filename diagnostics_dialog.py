@@ -0,0 +1,101 @@
+from typing import Optional
+
+from query_stats import QueryStats
+from result_cache import ResultCache
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QTableWidget, QTableWidgetItem, QHeaderView,
+    QPlainTextEdit, QPushButton, QFileDialog
+)
+
+
+class DiagnosticsDialog(QDialog):
+    """Tampilkan statistik latensi SQL per method, slow-query log dan hit/miss cache."""
+
+    COLUMNS = ["Method", "Count", "Rows", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)"]
+    KEYS = ["count", "rows", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+    def __init__(self, stats: QueryStats, parent=None, cache: Optional[ResultCache] = None):
+        super().__init__(parent)
+        self.stats = stats
+        self.cache = cache
+        self.setWindowTitle("Diagnostik Database")
+        self.resize(760, 520)
+
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Latensi per method"))
+        self.tbl = QTableWidget()
+        self.tbl.setColumnCount(len(self.COLUMNS))
+        self.tbl.setHorizontalHeaderLabels(self.COLUMNS)
+        self.tbl.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tbl.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tbl.verticalHeader().setVisible(False)
+        layout.addWidget(self.tbl)
+
+        self.lbl_cache = QLabel()
+        self.lbl_cache.setVisible(cache is not None)
+        layout.addWidget(self.lbl_cache)
+
+        self.lbl_slow = QLabel()
+        layout.addWidget(self.lbl_slow)
+        self.txt_slow = QPlainTextEdit()
+        self.txt_slow.setReadOnly(True)
+        layout.addWidget(self.txt_slow)
+
+        btns = QHBoxLayout()
+        btn_refresh = QPushButton("Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_reset = QPushButton("Reset")
+        btn_reset.clicked.connect(self.on_reset)
+        btn_save = QPushButton("Simpan JSON")
+        btn_save.clicked.connect(self.on_save)
+        btns.addWidget(btn_refresh)
+        btns.addWidget(btn_reset)
+        btns.addStretch(1)
+        btns.addWidget(btn_save)
+        layout.addLayout(btns)
+
+        self.refresh()
+
+    def refresh(self):
+        snap = self.stats.snapshot()
+
+        methods = snap["methods"]
+        self.tbl.setRowCount(len(methods))
+        for r, (name, summary) in enumerate(methods.items()):
+            self.tbl.setItem(r, 0, QTableWidgetItem(name))
+            for c, key in enumerate(self.KEYS, start=1):
+                it = QTableWidgetItem(str(summary[key]))
+                it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tbl.setItem(r, c, it)
+
+        if self.cache is not None:
+            c = self.cache.stats()
+            self.lbl_cache.setText(
+                f"Cache: {c['hits']} hit / {c['misses']} miss ({c['hit_rate']:.0%}), "
+                f"{c['entries']}/{c['max_entries']} entry, {c['prefetched']} prefetch, "
+                f"{c['invalidations']} invalidasi, {c['clears']} reset"
+            )
+
+        slow = snap["slow_queries"]
+        self.lbl_slow.setText(f"Slow query (> {snap['slow_query_ms']} ms): {len(slow)}")
+        lines = []
+        for q in reversed(slow):
+            lines.append(f"[{q['time']}] {q['method']} {q['ms']} ms\n  {q['sql']}\n  params: {q['params']}")
+            for step in q["plan"] or []:
+                lines.append(f"    plan: {step}")
+        self.txt_slow.setPlainText("\n".join(lines))
+
+    def on_reset(self):
+        self.stats.reset()
+        if self.cache is not None:
+            self.cache.reset_stats()
+        self.refresh()
+
+    def on_save(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Simpan Statistik", "sql_stats.json", "JSON (*.json)")
+        if path:
+            self.stats.dump_json(path)
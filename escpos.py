@@ -0,0 +1,208 @@
+import socket
+import textwrap
+
+from typing import Optional
+
+from database_handler import Database, OrderRow, rupiah
+
+
+# -------------------- Perintah ESC/POS --------------------
+ESC = b"\x1b"
+GS = b"\x1d"
+
+INIT = ESC + b"@"
+ALIGN_LEFT = ESC + b"a\x00"
+ALIGN_CENTER = ESC + b"a\x01"
+ALIGN_RIGHT = ESC + b"a\x02"
+BOLD_ON = ESC + b"E\x01"
+BOLD_OFF = ESC + b"E\x00"
+SIZE_NORMAL = GS + b"!\x00"
+SIZE_DOUBLE_HEIGHT = GS + b"!\x01"
+SIZE_DOUBLE = GS + b"!\x11"          # lebar + tinggi ganda
+CUT = GS + b"V\x42\x00"              # feed lalu partial cut
+LF = b"\n"
+
+
+class EscPosRenderer:
+    """
+    Render struk langsung ke byte ESC/POS untuk printer thermal, tanpa
+    QTextDocument. Data input sama dengan ReceiptPrinter (order + items).
+
+    width: jumlah karakter per baris (32 = 58mm, 42/48 = 80mm font A/B).
+    """
+
+    WIDTHS = (32, 42, 48)
+    DEFAULT_WIDTH = 48
+    ENCODING = "cp437"
+
+    def __init__(
+        self,
+        nama_toko: str = "WARUNG SARAPAN MAK UDE",
+        alamat: str = "Jl. Adi Sucipto Gg. Hj. Aminah",
+        no_telp: str = "Tel: (021) 1234-5678",
+        width: int = DEFAULT_WIDTH,
+    ):
+        if width not in self.WIDTHS:
+            raise ValueError(f"width harus salah satu dari {self.WIDTHS}")
+        self.nama_toko = nama_toko
+        self.alamat = alamat
+        self.no_telp = no_telp
+        self.width = width
+        self._header_cache = None
+
+    def render(self, order: OrderRow, items: list) -> bytes:
+        w = self.width
+        out = [self._header()]
+
+        out.append(ALIGN_LEFT)
+        out.append(self._line(self._columns("No. Transaksi:", order.order_no)))
+        out.append(self._line(self._columns("Tanggal:", order.created_at)))
+        out.append(self._line("-" * w))
+
+        for item in items:
+            name = item.item_name
+            # textwrap relatif mahal; hanya dipakai kalau memang perlu dipotong
+            for part in (textwrap.wrap(name, w) if len(name) > w else [name]):
+                out.append(self._line(part))
+            qty_price = f"  {item.qty} x {rupiah(item.price)}"
+            out.append(self._line(self._columns(qty_price, rupiah(item.subtotal))))
+            note = item.note or ""
+            if note:
+                note = f"Note: {note}"
+                for part in (textwrap.wrap(note, w - 4) if len(note) > w - 4 else [note]):
+                    out.append(self._line("    " + part))
+
+        out.append(self._line("-" * w))
+        out.append(BOLD_ON + SIZE_DOUBLE_HEIGHT)
+        out.append(self._line(self._columns("TOTAL", rupiah(order.total))))
+        out.append(SIZE_NORMAL + BOLD_OFF)
+        out.append(self._line("-" * w))
+
+        out.append(ALIGN_CENTER + BOLD_ON)
+        out.append(self._line("*** TERIMA KASIH ***"))
+        out.append(BOLD_OFF + LF * 3 + CUT)
+        return b"".join(out)
+
+    def _header(self) -> bytes:
+        # Header toko sama untuk semua struk: encode sekali
+        key = (self.nama_toko, self.alamat, self.no_telp, self.width)
+        if self._header_cache is None or self._header_cache[0] != key:
+            # Teks lebar ganda hanya muat setengah kolom
+            toko = textwrap.wrap(self.nama_toko, self.width // 2) or [""]
+            data = b"".join([
+                INIT,
+                ALIGN_CENTER,
+                BOLD_ON + SIZE_DOUBLE,
+                b"".join(self._line(t) for t in toko),
+                SIZE_NORMAL,
+                self._line(self.alamat[:self.width]),
+                BOLD_OFF,
+                self._line(self.no_telp[:self.width]),
+                self._line("=" * self.width),
+            ])
+            self._header_cache = (key, data)
+        return self._header_cache[1]
+
+    def _columns(self, left: str, right: str) -> str:
+        # Kiri dipotong kalau tidak muat; kanan (angka) selalu utuh
+        space = self.width - len(right) - 1
+        return f"{left[:space]:<{space}} {right}"
+
+    def _line(self, text: str) -> bytes:
+        return text.encode(self.ENCODING, errors="replace") + LF
+
+
+def send_raw(data: bytes, target: str, timeout: float = 5.0) -> None:
+    """
+    Kirim byte ESC/POS ke printer.
+    target: "tcp://host:port" (printer jaringan, biasanya port 9100),
+    atau path file / device (mis. /dev/usb/lp0).
+    """
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://"):].rpartition(":")
+        with socket.create_connection((host, int(port or 9100)), timeout=timeout) as sock:
+            sock.sendall(data)
+    else:
+        with open(target, "wb") as f:
+            f.write(data)
+
+
+def serve_fake_printer(host: str = "127.0.0.1", port: int = 9100, out_path: Optional[str] = None) -> None:
+    """
+    Printer palsu untuk pengujian: terima koneksi TCP seperti printer
+    jaringan dan tampilkan teks struk (perintah ESC/POS dibuang).
+    Byte mentah ditambahkan ke out_path kalau diisi.
+    """
+    with socket.create_server((host, port)) as srv:
+        print(f"Fake ESC/POS printer di tcp://{host}:{port} (Ctrl+C untuk berhenti)")
+        while True:
+            conn, _ = srv.accept()
+            with conn:
+                chunks = []
+                while True:
+                    chunk = conn.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            data = b"".join(chunks)
+            if out_path:
+                with open(out_path, "ab") as f:
+                    f.write(data)
+            print(strip_commands(data).decode(EscPosRenderer.ENCODING, errors="replace"))
+
+
+def strip_commands(data: bytes) -> bytes:
+    """Buang perintah ESC/POS yang dipakai EscPosRenderer, sisakan teksnya."""
+    for cmd in (INIT, CUT, ALIGN_LEFT, ALIGN_CENTER, ALIGN_RIGHT, BOLD_ON, BOLD_OFF,
+                SIZE_NORMAL, SIZE_DOUBLE_HEIGHT, SIZE_DOUBLE):
+        data = data.replace(cmd, b"")
+    return data
+
+
+def main(argv=None) -> int:
+    """
+        python escpos.py serve --port 9100
+        python escpos.py print --order-id 12 --target tcp://127.0.0.1:9100
+    """
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Cetak struk ESC/POS / printer palsu")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_serve = sub.add_parser("serve", help="jalankan printer palsu (TCP)")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=9100)
+    p_serve.add_argument("--out", help="simpan byte mentah ke file ini")
+
+    p_print = sub.add_parser("print", help="cetak satu order")
+    p_print.add_argument("--db", default="pesanan_warung.db")
+    p_print.add_argument("--order-id", type=int, required=True)
+    p_print.add_argument("--target", required=True, help="tcp://host:port atau path file/device")
+    p_print.add_argument("--width", type=int, default=EscPosRenderer.DEFAULT_WIDTH,
+                         choices=EscPosRenderer.WIDTHS)
+
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        try:
+            serve_fake_printer(args.host, args.port, args.out)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    db = Database(args.db)
+    try:
+        detail = db.get_order_with_items(args.order_id)
+    finally:
+        db.close()
+    if detail is None:
+        print(f"Order dengan ID {args.order_id} tidak ditemukan.")
+        return 1
+
+    order, items = detail
+    send_raw(EscPosRenderer(width=args.width).render(order, items), args.target)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""
+Ekspor orders + order_items ke CSV atau JSONL secara streaming.
+
+Satu query JOIN dibaca per potongan (fetchmany) lewat generator dan ditulis
+langsung ke file, jadi pemakaian memori tetap datar berapapun jumlah baris.
+Untuk dump malam hari yang incremental, --state menyimpan id order terakhir
+yang sudah diekspor dan ekspor berikutnya lanjut dari sana.
+
+    python export.py --from 2026-01-01 --to 2026-01-31 --out jan.csv
+    python export.py --format jsonl --state export.state --out nightly.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from dataclasses import dataclass
+from typing import Optional
+
+from database_handler import Database, DateLike
+
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ExportResult:
+    rows: int
+    orders: int
+    last_order_id: Optional[int]
+    path: str
+
+
+def export_orders(
+    db: Database,
+    out_path: str,
+    fmt: str = "csv",
+    date_from: Optional[DateLike] = None,
+    date_to: Optional[DateLike] = None,
+    after_id: Optional[int] = None,
+    chunk_size: int = 5000,
+) -> ExportResult:
+    """
+    Tulis satu baris per item (kolom Database.ORDER_ITEM_COLUMNS).
+    File ditulis ke <out_path>.part lalu di-rename, jadi file tujuan tidak
+    pernah setengah jadi.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format harus salah satu dari {FORMATS}")
+
+    columns = Database.ORDER_ITEM_COLUMNS
+    rows = db.iter_order_item_rows(date_from, date_to, after_id, chunk_size)
+
+    n_rows = 0
+    n_orders = 0
+    last_order_id = None
+    prev_order_id = None
+
+    tmp_path = out_path + ".part"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            write = writer.writerow
+        else:
+            dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+            def write(r):
+                f.write(dumps(dict(zip(columns, r))))
+                f.write("\n")
+
+        for r in rows:
+            write(tuple(r))
+            n_rows += 1
+            order_id = r[0]
+            if order_id != prev_order_id:
+                n_orders += 1
+                prev_order_id = order_id
+            if last_order_id is None or order_id > last_order_id:
+                last_order_id = order_id
+
+    os.replace(tmp_path, out_path)
+    return ExportResult(n_rows, n_orders, last_order_id, out_path)
+
+
+def read_state(path: str) -> Optional[int]:
+    """Id order terakhir yang sudah diekspor (None kalau belum pernah)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return int(json.load(f)["last_order_id"])
+    except FileNotFoundError:
+        return None
+
+
+def write_state(path: str, last_order_id: int):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"last_order_id": last_order_id}, f)
+    os.replace(tmp, path)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Ekspor pesanan ke CSV/JSONL")
+    ap.add_argument("--db", default="pesanan_warung.db")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--format", choices=FORMATS, help="default: dari ekstensi --out")
+    ap.add_argument("--from", dest="date_from", help="YYYY-MM-DD (inklusif)")
+    ap.add_argument("--to", dest="date_to", help="YYYY-MM-DD (inklusif)")
+    ap.add_argument("--after-id", type=int, help="hanya order dengan id lebih besar")
+    ap.add_argument("--state", help="file penanda untuk ekspor incremental")
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.out.endswith((".jsonl", ".ndjson")) else "csv")
+    after_id = args.after_id
+    if after_id is None and args.state:
+        after_id = read_state(args.state)
+
+    db = Database(args.db)
+    try:
+        result = export_orders(db, args.out, fmt, args.date_from, args.date_to, after_id)
+    finally:
+        db.close()
+
+    if args.state and result.last_order_id is not None:
+        write_state(args.state, result.last_order_id)
+
+    print(f"{result.orders} order, {result.rows} baris -> {result.path} "
+          f"(order id terakhir: {result.last_order_id})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
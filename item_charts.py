@@ -0,0 +1,72 @@
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+
+from analytics import AnalyticsReport, DAY_NAMES
+from sales_chart import format_rupiah_axis
+
+
+class ItemCharts:
+    """
+    Tiga grafik analitik item dalam satu figure: menu terlaris (omzet),
+    heatmap omzet hari x jam, dan pasangan item yang sering dibeli bersama.
+    Axes dibuat sekali; update() hanya mengganti isi masing-masing axes.
+    """
+
+    BAR_COLOR = '#4A90D9'
+    PAIR_COLOR = '#E8A33D'
+    HEATMAP_CMAP = 'Blues'
+
+    def __init__(self, figure: Figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.ax_top, self.ax_heat, self.ax_pairs = figure.subplots(
+            1, 3, gridspec_kw={"width_ratios": [1, 1.4, 1]}
+        )
+
+    def update(self, report: AnalyticsReport, period: str):
+        self._draw_top(report)
+        self._draw_heatmap(report)
+        self._draw_pairs(report)
+        self.figure.suptitle(
+            f'ANALISIS ITEM: {period} ({report.orders} pesanan)', fontsize=11, fontweight='bold'
+        )
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def _draw_top(self, report: AnalyticsReport):
+        ax = self.ax_top
+        ax.clear()
+        top = list(reversed(report.top_items))  # barh: yang terbesar di atas
+        ax.barh([t.name for t in top], [t.revenue for t in top], color=self.BAR_COLOR)
+        ax.set_title('Menu Terlaris', fontsize=9)
+        ax.xaxis.set_major_formatter(format_rupiah_axis)
+        ax.xaxis.set_major_locator(MaxNLocator(3))  # label rupiah panjang
+        ax.tick_params(labelsize=7)
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.set_axisbelow(True)
+
+    def _draw_heatmap(self, report: AnalyticsReport):
+        ax = self.ax_heat
+        ax.clear()
+        heat = report.heatmap
+        # Hanya jam yang pernah ada penjualan (warung sarapan: pagi-siang)
+        hours = heat.sum(axis=0).nonzero()[0]
+        first, last = (hours[0], hours[-1]) if len(hours) else (0, 23)
+        ax.imshow(heat[:, first:last + 1], aspect='auto', cmap=self.HEATMAP_CMAP,
+                  extent=(first - 0.5, last + 0.5, 6.5, -0.5))
+        ax.set_title('Omzet per Hari & Jam', fontsize=9)
+        ax.set_yticks(range(7))
+        ax.set_yticklabels(DAY_NAMES, fontsize=7)
+        ax.set_xticks(range(first, last + 1))
+        ax.set_xticklabels([f'{h:02d}' for h in range(first, last + 1)], fontsize=7)
+
+    def _draw_pairs(self, report: AnalyticsReport):
+        ax = self.ax_pairs
+        ax.clear()
+        pairs = list(reversed(report.pairs))
+        ax.barh([f'{p.a} + {p.b}' for p in pairs], [p.orders for p in pairs], color=self.PAIR_COLOR)
+        ax.set_title('Sering Dibeli Bersama', fontsize=9)
+        ax.set_xlabel('Jumlah pesanan', fontsize=8)
+        ax.tick_params(labelsize=7)
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.set_axisbelow(True)
@@ -1,14 +1,44 @@
 import sys
 import os
 
+from typing import Optional
+
+from async_db import AsyncDatabase
 from database_handler import Database
 from new_order import NewOrderWidget
-from view_order import ViewOrdersWidget
+from order_journal import OrderJournal
+from query_stats import QueryStats
+from result_cache import ResultCache
+from trace_recorder import TraceRecorder
 
-from PySide6.QtWidgets import QMainWindow,QApplication, QTabWidget
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtWidgets import QMainWindow,QApplication, QTabWidget, QWidget, QVBoxLayout
 
 DB_PATH = "pesanan_warung.db"
 
+# Printer thermal ESC/POS untuk cetak langsung, contoh: "tcp://192.168.1.50:9100"
+# atau "/dev/usb/lp0". None = tampilkan preview struk (HTML).
+RAW_PRINTER = None
+
+# Instrumentasi SQL: isi nama file (mis. "sql_stats.json") untuk mencatat
+# latensi per query; hasilnya ditulis saat aplikasi ditutup dan bisa dilihat
+# langsung lewat Ctrl+Shift+D. None = nonaktif.
+SQL_STATS_FILE = None
+SLOW_QUERY_MS = 50
+
+# Rekam semua panggilan Database (mis. "sabtu.trace.gz") beserta snapshot
+# database saat mulai, untuk diputar ulang dengan replay.py. None = nonaktif.
+TRACE_FILE = None
+
+# Cache hasil query detail order / grafik bulanan (jumlah entry). 0 = nonaktif.
+RESULT_CACHE_ENTRIES = 2048
+
+# Journal group commit: isi nama file (mis. "pesanan_warung.journal") supaya
+# simpan pesanan cukup menunggu fsync journal; order di-commit ke database
+# per kelompok di background. None = simpan langsung ke database.
+ORDER_JOURNAL_FILE = None
+
 def resource_path(relative_path):
     """ Dapatkan path absolut ke resource, bisa untuk dev maupun untuk PyInstaller """
     try:
@@ -20,10 +50,17 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+class JournalSignals(QObject):
+    """Teruskan callback flusher OrderJournal (thread lain) ke thread GUI."""
+    flushed = Signal(object)
+
+
 class MainWindow(QMainWindow):
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncDatabase, journal: Optional[OrderJournal] = None,
+                 journal_signals: Optional[JournalSignals] = None):
         super().__init__()
         self.db = db
+        self.journal = journal
 
         self.setWindowTitle("Pemesanan Digital")
         self.setFixedSize(900, 650)
@@ -33,11 +70,21 @@ class MainWindow(QMainWindow):
         tabs.setDocumentMode(True)
         tabs.setMovable(False)
 
-        self.new_order_tab = NewOrderWidget(self.db)
-        self.view_orders_tab = ViewOrdersWidget(self.db)
+        self.new_order_tab = NewOrderWidget(self.db, journal=journal)
+
+        # View Orders (tabel + grafik matplotlib) baru dibangun saat tab pertama
+        # kali dibuka; kasir mulai di New Order, jadi startup tidak menunggunya
+        self.view_orders_tab = None
+        self._view_orders_page = QWidget()
+        page_layout = QVBoxLayout(self._view_orders_page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
 
         tabs.addTab(self.new_order_tab, "New Order")
-        tabs.addTab(self.view_orders_tab, "View Orders")
+        tabs.addTab(self._view_orders_page, "View Orders")
+        tabs.currentChanged.connect(self.on_tab_changed)
+
+        if journal_signals is not None:
+            journal_signals.flushed.connect(self.on_journal_flushed)
 
         # Setelah simpan order, refresh View Orders dan pindah tab
         self.new_order_tab.order_saved.connect(self.on_order_saved)
@@ -45,28 +92,79 @@ class MainWindow(QMainWindow):
         self.tabs = tabs
         self.setCentralWidget(tabs)
 
+        if self.db.db.stats is not None:
+            shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+            shortcut.activated.connect(self.show_diagnostics)
+
+    def ensure_view_orders_tab(self):
+        """Bangun ViewOrdersWidget kalau belum ada (memuat daftar + grafik)."""
+        if self.view_orders_tab is None:
+            from view_order import ViewOrdersWidget
+            self.view_orders_tab = ViewOrdersWidget(self.db, raw_printer=RAW_PRINTER, journal=self.journal)
+            self._view_orders_page.layout().addWidget(self.view_orders_tab)
+        return self.view_orders_tab
+
+    def on_tab_changed(self, index: int):
+        if self.tabs.widget(index) is self._view_orders_page:
+            self.ensure_view_orders_tab()
+
+    def on_journal_flushed(self, _created):
+        if self.view_orders_tab is not None:
+            self.view_orders_tab.on_journal_flushed()
+
+    def show_diagnostics(self):
+        from diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self.db.db.stats, self, cache=self.db.db.cache).exec()
+
     def on_order_saved(self):
-        self.view_orders_tab.reload_orders()
-        self.tabs.setCurrentWidget(self.view_orders_tab)
+        if self.view_orders_tab is not None:
+            self.view_orders_tab.reload_orders()
+            self.view_orders_tab.refresh_item_charts()
+        # Kalau belum dibangun, pindah tab membangunnya (sekaligus memuat order baru)
+        self.tabs.setCurrentWidget(self._view_orders_page)
 
 
-def main():
-    app = QApplication(sys.argv)
+def load_stylesheet(app: QApplication):
+    """Pasang theme.qss sekali di level aplikasi; widget cukup memakai objectName."""
+    qss_file = resource_path("theme.qss")
     try:
-        qss_file = resource_path("theme.qss") 
         with open(qss_file, "r", encoding="utf-8") as f:
             app.setStyleSheet(f.read())
     except FileNotFoundError:
-        print(f"Warning: theme.qss not found at {resource_path('theme.qss')}, using default style")
+        print(f"Warning: theme.qss not found at {qss_file}, using default style")
+
 
-    db = Database(DB_PATH)
+def main():
+    app = QApplication(sys.argv)
+    load_stylesheet(app)
+
+    stats = QueryStats(SLOW_QUERY_MS) if SQL_STATS_FILE else None
+    cache = ResultCache(RESULT_CACHE_ENTRIES) if RESULT_CACHE_ENTRIES else None
+    recorder = TraceRecorder(TRACE_FILE, snapshot=True) if TRACE_FILE else None
+    db = Database(DB_PATH, wal=True, stats=stats, cache=cache, recorder=recorder)
     db.init_schema()
 
-    w = MainWindow(db)
+    # Order yang belum ter-commit saat aplikasi terakhir ditutup diputar ulang di sini
+    journal = journal_signals = None
+    if ORDER_JOURNAL_FILE:
+        journal_signals = JournalSignals()
+        journal = OrderJournal(db, ORDER_JOURNAL_FILE, on_flushed=journal_signals.flushed.emit)
+
+    # Semua query dari GUI lewat thread worker
+    adb = AsyncDatabase(db)
+
+    w = MainWindow(adb, journal, journal_signals)
     w.show()
 
     code = app.exec()
+    if journal is not None:
+        journal.close()
+    adb.close()
     db.close()
+    if stats is not None:
+        stats.dump_json(SQL_STATS_FILE)
+    if recorder is not None:
+        recorder.close()
     sys.exit(code)
 
 
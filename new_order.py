@@ -1,4 +1,8 @@
-from database_handler import Database, rupiah
+from typing import Optional
+
+from async_db import AsyncDatabase
+from database_handler import rupiah
+from order_journal import OrderJournal
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
@@ -8,32 +12,27 @@ from PySide6.QtWidgets import (
     QSpinBox,QMessageBox
 )
 
+def _load_menu(db) -> tuple:
+    """Di thread worker: (menu_version, [MenuItem] aktif)."""
+    return db.menu_version(), db.get_menu()
+
+
 class NewOrderWidget(QWidget):
     order_saved = Signal()  # emit saat order tersimpan
 
-    def __init__(self, db: Database):
+    def __init__(self, db: AsyncDatabase, journal: Optional[OrderJournal] = None):
         super().__init__()
         self.db = db
+        self.journal = journal  # kalau diisi, simpan lewat journal (tanpa menunggu commit)
 
-        self.menu_data = [
-            ("Nasi Kuning", 10000),
-            ("Nasi Goreng", 12000),
-            ("Mie Tiaw Goreng", 15000),
-            ("Bubur Ayam", 8000),
-            ("Lontong Sayur", 10000),
-            ("Es Teh", 3000),
-            ("Teh Hangat", 5000),
-            ("Air Mineral", 4000),
-            ("Es Jeruk Kecil", 7000),
-        ]
-
-        self.rows = []  # {cb, qty, note, price, name}
+        self.rows = []  # {cb, qty, note, price, name, item_id}
+        self._menu_version = None
 
         vlayout = QVBoxLayout(self)
 
         title = QLabel("PEMESANAN MENU WARUNG SARAPAN MAK UDE")
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("font-weight: bold; font-size: 25px;")
+        title.setObjectName("pageTitle")
         vlayout.addWidget(title)
 
         line = QFrame()
@@ -49,36 +48,13 @@ class NewOrderWidget(QWidget):
         hdr_qty = QLabel("Jumlah")
         hdr_note = QLabel("Catatan")
         for hdr in (hdr_item, hdr_qty, hdr_note):
-            hdr.setStyleSheet("font-weight: bold;")
+            hdr.setObjectName("boldLabel")
         grid.addWidget(hdr_item, 0, 0)
         grid.addWidget(hdr_qty, 0, 1)
         grid.addWidget(hdr_note, 0, 2)
 
-        for i, (name, price) in enumerate(self.menu_data, start=1):
-            cb = QCheckBox(f"{name} - {rupiah(price)}")
-
-            qty = QSpinBox()
-            qty.setMinimum(1)
-            qty.setMaximum(10)     
-            qty.setValue(1)
-            qty.setFixedWidth(80)
-            qty.setFixedHeight(40)
-
-            note = QLineEdit()
-            note.setPlaceholderText("contoh: tanpa sambal, pedas, dll")
-            note.setFixedHeight(40)
-
-            # default terkunci jika belum dicentang
-            self.set_row_enabled(qty, note, enabled=False)
-
-            grid.addWidget(cb, i, 0)
-            grid.addWidget(qty, i, 1)
-            grid.addWidget(note, i, 2)
-
-            row = {"cb": cb, "qty": qty, "note": note, "price": price, "name": name}
-            self.rows.append(row)
-
-            cb.toggled.connect(lambda checked, r=row: self.on_item_toggled(checked, r))
+        self.grid = grid
+        self.load_menu()
 
         vlayout.addLayout(grid)
 
@@ -92,7 +68,7 @@ class NewOrderWidget(QWidget):
         self.btn_reset.clicked.connect(self.reset_form)
 
         self.total = QLabel("Total: Rp0")
-        self.total.setStyleSheet("font-weight: bold; font-size: 14px;")
+        self.total.setObjectName("sectionTitle")
 
         bottom.addWidget(self.btn_total)
         bottom.addWidget(self.btn_save)
@@ -103,6 +79,63 @@ class NewOrderWidget(QWidget):
 
         vlayout.addStretch(1)
 
+    def load_menu(self):
+        """Baca katalog menu di thread worker; grid dibangun ulang kalau versinya berubah."""
+        self.db.submit(
+            _load_menu,
+            on_result=self._on_menu_loaded,
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Gagal memuat menu:\n{e}"),
+            key="menu",
+        )
+
+    def _on_menu_loaded(self, result: tuple):
+        version, menu = result
+        # Jangan bangun ulang kalau kasir sedang mengisi pesanan
+        if version != self._menu_version and not any(row["cb"].isChecked() for row in self.rows):
+            self.build_menu_rows(version, menu)
+
+    def build_menu_rows(self, version: int, menu: list):
+        """Isi grid dari katalog menu (hasil get_menu)."""
+        self._menu_version = version
+
+        for row in self.rows:
+            for w in (row["cb"], row["qty"], row["note"]):
+                self.grid.removeWidget(w)
+                w.deleteLater()
+        self.rows = []
+
+        for i, item in enumerate(menu, start=1):
+            cb = QCheckBox(f"{item.name} - {rupiah(item.price)}")
+
+            qty = QSpinBox()
+            qty.setMinimum(1)
+            qty.setMaximum(10)     
+            qty.setValue(1)
+            qty.setFixedWidth(80)
+            qty.setFixedHeight(40)
+
+            note = QLineEdit()
+            note.setPlaceholderText("contoh: tanpa sambal, pedas, dll")
+            note.setFixedHeight(40)
+
+            # default terkunci jika belum dicentang
+            self.set_row_enabled(qty, note, enabled=False)
+
+            self.grid.addWidget(cb, i, 0)
+            self.grid.addWidget(qty, i, 1)
+            self.grid.addWidget(note, i, 2)
+
+            row = {"cb": cb, "qty": qty, "note": note, "price": item.price,
+                   "name": item.name, "item_id": item.id}
+            self.rows.append(row)
+
+            cb.toggled.connect(lambda checked, r=row: self.on_item_toggled(checked, r))
+
+    def showEvent(self, event):
+        # Harga/menu mungkin berubah sejak grid dibangun
+        super().showEvent(event)
+        self.load_menu()
+
     def set_row_enabled(self, qty: QSpinBox, note: QLineEdit, enabled: bool):
         # Jika belum checked, tidak dapat melakukan edit pada kolom
         qty.setEnabled(enabled)
@@ -135,6 +168,7 @@ class NewOrderWidget(QWidget):
         for row in self.rows:
             if row["cb"].isChecked():
                 items.append({
+                    "item_id": row["item_id"],
                     "name": row["name"],
                     "price": row["price"],
                     "qty": row["qty"].value(),
@@ -145,11 +179,32 @@ class NewOrderWidget(QWidget):
             QMessageBox.information(self, "Info", "Belum ada item yang dipilih.")
             return
 
-        try:
-            order_id, order_no = self.db.create_order(items)
-            QMessageBox.information(self, "Sukses", f"Pesanan tersimpan!\nNomor: {order_no}")
-            self.reset_form()
-            self.order_saved.emit()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Gagal menyimpan pesanan:\n{e}")
+        if self.journal is not None:
+            # Cukup append + fsync ke journal; commit ke database menyusul
+            try:
+                order_no = self.journal.submit(items)
+            except Exception as e:
+                self._on_save_failed(e)
+                return
+            self._on_order_created((None, order_no))
+            return
+
+        # Simpan di thread worker; tombol dikunci supaya tidak tersimpan dua kali
+        self.btn_save.setEnabled(False)
+        self.db.submit(
+            "create_order", items,
+            on_result=self._on_order_created,
+            on_error=self._on_save_failed,
+        )
+
+    def _on_order_created(self, result: tuple[Optional[int], str]):
+        order_id, order_no = result
+        self.btn_save.setEnabled(True)
+        QMessageBox.information(self, "Sukses", f"Pesanan tersimpan!\nNomor: {order_no}")
+        self.reset_form()
+        self.order_saved.emit()
+
+    def _on_save_failed(self, e: Exception):
+        self.btn_save.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Gagal menyimpan pesanan:\n{e}")
 
@@ -0,0 +1,217 @@
+"""
+Change feed order untuk proses lain (layar dapur, kasir kedua): membaca
+outbox order_events yang ditulis Database di transaksi yang sama dengan
+create_order / create_orders_bulk / delete_order / void_orders.
+
+Subscriber bangun kalau ada commit — lewat datagram UDP dari penulis
+(langsung) atau PRAGMA data_version yang dicek setiap `poll_ms` (cadangan,
+juga untuk penulis yang tidak tahu port kita) — lalu hanya membaca event
+dengan seq > cursor lewat primary key; tabel orders tidak pernah discan.
+
+Pengiriman at-least-once: cursor baru maju (dan disimpan ke `cursor_path`)
+setelah konsumen selesai memproses event. Kalau proses mati di tengah
+jalan, event sesudah cursor terakhir yang tersimpan dikirim ulang, jadi
+konsumen sebaiknya idempotent (mis. berdasarkan seq atau order_id).
+
+    python order_feed.py --db pesanan_warung.db --cursor-file dapur.cursor
+"""
+import argparse
+import json
+import os
+import select
+import socket
+import sys
+import time
+
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from database_handler import Database
+
+
+@dataclass
+class OrderEvent:
+    """Satu baris order_events."""
+    seq: int
+    kind: str          # 'created' / 'voided'
+    order_id: int
+    order_no: str
+    created_at: str
+    total: int
+    items: list        # [{item_id, name, price, qty, note, subtotal}]
+    logged_at: str
+
+
+class OrderFeed:
+    """Langganan event order baru/dihapus setelah sebuah cursor (seq)."""
+
+    POLL_MS = 20
+    BATCH = 500
+
+    def __init__(
+        self,
+        path: str,
+        cursor: Optional[int] = None,
+        cursor_path: Optional[str] = None,
+        poll_ms: int = POLL_MS,
+        notify: bool = True,
+        batch: int = BATCH,
+    ):
+        """
+        cursor: mulai sesudah seq ini. None = dari cursor_path kalau ada,
+        selain itu dari event terbaru (hanya order berikutnya).
+
+        notify=True: daftarkan port UDP lokal supaya penulis membangunkan
+        subscriber segera setelah commit; False = polling data_version saja.
+        """
+        self.db = Database(path, wal=True)
+        self.db.init_schema()
+        self.cursor_path = cursor_path
+        self.poll = poll_ms / 1000
+        self.batch = batch
+        self._data_version = None
+        self._closed = False
+
+        if cursor is None and cursor_path and os.path.exists(cursor_path):
+            with open(cursor_path, encoding="utf-8") as f:
+                cursor = int(f.read().strip() or 0)
+        if cursor is None:
+            cursor = self.db.last_event_seq()
+        self.cursor = cursor
+        self._saved = cursor
+
+        first = self.db.first_event_seq()
+        if first is None and self.db.last_event_seq() > cursor:
+            first = self.db.last_event_seq() + 1  # semua event sesudah cursor sudah dibuang
+        if first is not None and first > cursor + 1:
+            print(f"Peringatan: event {cursor + 1}..{first - 1} sudah dibuang "
+                  f"(lebih tua dari {Database.ORDER_EVENTS_KEEP_DAYS} hari)", file=sys.stderr)
+
+        self._sock = None
+        self._registered_at = 0.0
+        if notify:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._sock.bind(("127.0.0.1", 0))
+            self._sock.setblocking(False)
+            self.port = self._sock.getsockname()[1]
+            self._register()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.save_cursor()
+        if self._sock is not None:
+            self.db.unregister_feed_listener(self.port)
+            self._sock.close()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- cursor ----------
+
+    def ack(self, seq: int):
+        """Tandai event sampai `seq` sudah diproses."""
+        if seq > self.cursor:
+            self.cursor = seq
+
+    def save_cursor(self):
+        if not self.cursor_path or self.cursor == self._saved:
+            return
+        tmp = self.cursor_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(self.cursor))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.cursor_path)
+        self._saved = self.cursor
+
+    # ---------- baca ----------
+
+    def fetch(self) -> list[OrderEvent]:
+        """Event sesudah cursor (maks. `batch`), tanpa memajukan cursor."""
+        # Catat data_version sebelum query: commit sesudahnya pasti membangunkan wait()
+        self._data_version = self.db.reader.execute("PRAGMA data_version").fetchone()[0]
+        return [
+            OrderEvent(r["seq"], r["kind"], r["order_id"], r["order_no"], r["created_at"],
+                       r["total"], json.loads(r["items"]), r["logged_at"])
+            for r in self.db.list_order_events(self.cursor, self.batch)
+        ]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Tunggu sampai ada commit baru sejak fetch() terakhir. False kalau timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._closed:
+            if self.db.reader.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+                return True
+            step = self.poll
+            if deadline is not None:
+                step = min(step, deadline - time.monotonic())
+                if step <= 0:
+                    return False
+            if self._sock is None:
+                time.sleep(step)
+                continue
+            if time.time() - self._registered_at > Database.FEED_LISTENER_TTL_S / 3:
+                self._register()
+            if select.select([self._sock], [], [], step)[0]:
+                self._drain()
+                return True
+        return False
+
+    def events(self, idle_timeout: Optional[float] = None) -> Iterator[OrderEvent]:
+        """
+        Yield event satu per satu, selamanya (atau sampai `idle_timeout` detik
+        tanpa event). Event dianggap selesai saat konsumen meminta event
+        berikutnya; cursor disimpan setiap habis satu batch.
+        """
+        while not self._closed:
+            events = self.fetch()
+            if not events:
+                self.save_cursor()
+                if not self.wait(idle_timeout):
+                    return
+                continue
+            for event in events:
+                yield event
+                self.ack(event.seq)
+            self.save_cursor()
+
+    def _register(self):
+        self.db.register_feed_listener(self.port)
+        self._registered_at = time.time()
+
+    def _drain(self):
+        try:
+            while self._sock.recv(64):
+                pass
+        except OSError:
+            pass  # kosong (BlockingIOError) atau sisa error ICMP port mati
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Cetak event order (JSON per baris) untuk layar dapur")
+    ap.add_argument("--db", default="pesanan_warung.db")
+    ap.add_argument("--cursor", type=int, help="mulai sesudah seq ini (0 = dari awal)")
+    ap.add_argument("--cursor-file", help="simpan/lanjutkan cursor dari file ini")
+    ap.add_argument("--poll-ms", type=int, default=OrderFeed.POLL_MS)
+    ap.add_argument("--no-notify", action="store_true", help="polling data_version saja, tanpa UDP")
+    args = ap.parse_args(argv)
+
+    feed = OrderFeed(args.db, args.cursor, args.cursor_file, args.poll_ms, notify=not args.no_notify)
+    try:
+        for event in feed.events():
+            print(json.dumps(event.__dict__, ensure_ascii=False), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        feed.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Journal order append-only dengan group commit ke SQLite.
+
+Jalur simpan biasa (Database.create_order) menunggu commit SQLite selesai
+sebelum kasir bisa lanjut. OrderJournal menulis order ke file JSONL lokal
+(satu baris per order, di-fsync), langsung mengembalikan nomor order, lalu
+thread flusher memasukkan order-order yang tertunda ke database sekaligus
+lewat create_orders_bulk setiap `flush_every` order atau `flush_interval_ms`.
+
+Nomor order dipesan per blok dari order_seq (Database.reserve_order_nos),
+jadi tetap unik walau ada kasir lain yang menulis langsung ke database.
+Blok berikutnya dipesan lebih dulu oleh thread flusher, jadi submit biasanya
+tidak menyentuh database sama sekali.
+Saat start, isi journal yang belum masuk database diputar ulang; karena
+create_orders_bulk melewati nomor order yang sudah ada, replay aman walau
+aplikasi mati di tengah flush.
+"""
+import json
+import os
+import threading
+import time
+
+from datetime import datetime
+from typing import Callable, Optional
+
+from database_handler import Database
+
+
+def _sync(fd: int):
+    # fdatasync cukup untuk file append-only (metadata seperti mtime tidak perlu)
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+
+class OrderJournal:
+    """Antrian order yang tahan crash di depan Database."""
+
+    FLUSH_EVERY = 50
+    FLUSH_INTERVAL_MS = 200
+    RESERVE_BLOCK = 20
+
+    def __init__(
+        self,
+        db: Database,
+        path: str,
+        flush_every: int = FLUSH_EVERY,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+        reserve_block: int = RESERVE_BLOCK,
+        on_flushed: Optional[Callable[[list], None]] = None,
+    ):
+        """
+        on_flushed(created) dipanggil dari thread flusher setelah setiap group
+        commit, dengan list (order_id, order_no) yang baru masuk database.
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval_ms / 1000
+        self.reserve_block = reserve_block
+        self.on_flushed = on_flushed
+
+        # Satu koneksi sendiri untuk journal (reserve nomor + flush), dijaga _db_lock
+        self._db = db.clone(check_same_thread=False)
+        self._db_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = []  # entry journal yang belum masuk database, urut waktu
+        # Nomor order yang sudah dipesan tapi belum dipakai, urut. Lock sendiri
+        # supaya submit tidak menunggu flush; kalau perlu keduanya: _db_lock dulu.
+        self._numbers_lock = threading.Lock()
+        self._numbers = []
+        self._closed = False
+
+        self._replay()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._run, name="order-journal", daemon=True)
+        self._thread.start()
+
+    # ---------- API ----------
+
+    def submit(self, items: list[dict]) -> str:
+        """
+        Catat order ke journal dan kembalikan nomor ordernya.
+        items: [{name, price, qty, note, item_id?}]
+        """
+        if not items:
+            raise ValueError("Pesanan kosong")
+
+        now = datetime.now()
+        entry = {
+            "order_no": self._take_number(now),
+            "created_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "items": [
+                {"item_id": it.get("item_id"), "name": it["name"], "price": int(it["price"]),
+                 "qty": int(it["qty"]), "note": it.get("note", "")}
+                for it in items
+            ],
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OrderJournal sudah ditutup")
+            self._file.write(line)
+            self._file.flush()
+            _sync(self._file.fileno())
+            self._pending.append(entry)
+            if len(self._pending) >= self.flush_every:
+                self._wakeup.notify()
+        return entry["order_no"]
+
+    def pending_orders(self) -> list[dict]:
+        """Order yang sudah dicatat tapi belum masuk database: {order_no, created_at, total, items}."""
+        with self._lock:
+            pending = list(self._pending)
+        return [
+            {**e, "total": sum(it["price"] * it["qty"] for it in e["items"])}
+            for e in pending
+        ]
+
+    def flush(self) -> list:
+        """Masukkan semua order tertunda ke database sekarang; kembalikan (order_id, order_no) yang baru."""
+        with self._db_lock:
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return []
+
+            result = self._db.create_orders_bulk(batch, batch_size=len(batch))
+            if result.rejected:
+                # Satu batch = satu savepoint: ulangi satu per satu supaya hanya
+                # order yang memang salah yang disisihkan
+                result.created, result.rejected = [], []
+                for i, e in enumerate(batch):
+                    single = self._db.create_orders_bulk([e])
+                    result.created.extend(single.created)
+                    if single.rejected:
+                        result.rejected.append((i, single.rejected[0][1]))
+                # Simpan terpisah supaya tidak diulang terus dan bisa diperiksa
+                with open(self.path + ".rejected", "a", encoding="utf-8") as f:
+                    for i, msg in result.rejected:
+                        print(f"Warning: journal order {batch[i]['order_no']} ditolak database: {msg}")
+                        f.write(json.dumps(batch[i], ensure_ascii=False) + "\n")
+
+            with self._lock:
+                del self._pending[:len(batch)]
+                self._rewrite()
+
+        if result.created and self.on_flushed is not None:
+            self.on_flushed(result.created)
+        return result.created
+
+    def close(self):
+        """Hentikan flusher, flush terakhir, kembalikan nomor yang tidak terpakai."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+
+        self.flush()
+        with self._db_lock, self._numbers_lock:
+            for day_numbers in self._by_day(self._numbers):
+                self._db.release_order_nos(day_numbers)
+            self._numbers = []
+            self._db.close()
+        self._file.close()
+
+    # ---------- internal ----------
+
+    def _take_number(self, now: datetime) -> str:
+        day = now.strftime("%Y%m%d")
+        with self._numbers_lock:
+            if self._numbers and all(no.split("-")[1] == day for no in self._numbers):
+                return self._numbers.pop(0)
+
+        # Stok habis atau ganti hari: baru di sini perlu database (jarang,
+        # biasanya _refill di thread flusher sudah memesan lebih dulu)
+        with self._db_lock, self._numbers_lock:
+            stale = [no for no in self._numbers if no.split("-")[1] != day]
+            if stale:
+                # Sisa blok kemarin dikembalikan
+                for day_numbers in self._by_day(stale):
+                    self._db.release_order_nos(day_numbers)
+                self._numbers = [no for no in self._numbers if no not in stale]
+            if not self._numbers:
+                self._numbers = self._db.reserve_order_nos(self.reserve_block, now)
+            return self._numbers.pop(0)
+
+    def _refill(self):
+        """Di thread flusher: pesan blok berikutnya sebelum stok nomor habis."""
+        with self._numbers_lock:
+            if len(self._numbers) > self.reserve_block // 2:
+                return
+        with self._db_lock:
+            block = self._db.reserve_order_nos(self.reserve_block, datetime.now())
+            with self._numbers_lock:
+                self._numbers.extend(block)
+                self._numbers.sort(key=lambda no: (no.split("-")[1], int(no.split("-")[-1])))
+
+    @staticmethod
+    def _by_day(numbers: list[str]) -> list[list[str]]:
+        days = {}
+        for no in numbers:
+            days.setdefault(no.split("-")[1], []).append(no)
+        return list(days.values())
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self._pending.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Baris terakhir bisa terpotong kalau listrik mati saat menulis;
+                    # baris itu belum pernah dikonfirmasi ke kasir
+                    break
+        if self._pending:
+            self.flush()
+        else:
+            self._rewrite()
+
+    def _rewrite(self):
+        """Tulis ulang file journal hanya berisi entry yang masih tertunda (dipanggil dengan _lock)."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for e in self._pending:
+                f.write(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            _sync(f.fileno())
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+        os.replace(tmp, self.path)
+        if getattr(self, "_file", None) is not None:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _run(self):
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + self.flush_interval
+                while not self._closed and len(self._pending) < self.flush_every:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+                if self._closed:
+                    return
+                has_pending = bool(self._pending)
+
+            if has_pending:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # Entry tetap di journal dan dicoba lagi di putaran berikutnya
+                    print(f"Warning: flush journal gagal: {e!r}")
+            try:
+                self._refill()
+            except Exception as e:
+                # submit masih bisa memesan sendiri kalau stok habis
+                print(f"Warning: pesan nomor order gagal: {e!r}")
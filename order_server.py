@@ -0,0 +1,387 @@
+"""
+Server HTTP/JSON tanpa GUI supaya tablet pelayan bisa mengirim order ke
+database kasir yang sama (pesanan_warung.db), berjalan bersamaan dengan
+aplikasi kasir.
+
+    python order_server.py --db pesanan_warung.db --port 8765
+
+Endpoint:
+    GET  /menu                              menu aktif
+    POST /orders      {"items": [{"item_id": 1, "qty": 2, "note": "pedas"}]}
+                      (atau "name" sebagai ganti item_id; harga selalu dari
+                      menu, "price" dari klien diabaikan) -> 201 {"id", "order_no", "total"}
+    GET  /orders?before_id=&limit=          daftar order, terbaru dulu
+    GET  /orders/<id>                       header + item
+    GET  /sales/monthly?year=&month=        total per hari
+
+asyncio dengan HTTP/1.1 keep-alive (hanya stdlib). Semua tulis lewat satu
+task writer: order yang masuk bersamaan dikumpulkan dan di-commit dalam satu
+transaksi (create_orders_bulk) di thread writer; baca berjalan di thread
+pool terpisah, masing-masing dengan koneksi (clone Database) sendiri.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from database_handler import Database
+from result_cache import ResultCache
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class OrderServer:
+    """Database di balik API HTTP/JSON lokal."""
+
+    READ_THREADS = 4
+    MAX_BATCH = 200  # order per transaksi tulis
+    MAX_BODY = 64 * 1024
+    PAGE_LIMIT = 200
+    MAX_QTY = 999  # per item; menjaga subtotal/total jauh dari batas INTEGER SQLite
+
+    REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+    def __init__(self, db: Database, read_threads: int = READ_THREADS, max_batch: int = MAX_BATCH):
+        self.db = db
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._clones = []
+        self._clones_lock = threading.Lock()
+        self._read_pool = ThreadPoolExecutor(read_threads, thread_name_prefix="order-server-read")
+        self._write_pool = ThreadPoolExecutor(1, thread_name_prefix="order-server-write")
+        self._queue = None  # asyncio.Queue[(order, Future)], dibuat di event loop
+        self._writer_task = None
+        self._server = None
+        self.batches = 0  # statistik group commit
+        self.batched_orders = 0
+
+    # ---------- lifecycle ----------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle_conn, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            await self._queue.put(None)  # writer selesaikan antrian dulu
+            await self._writer_task
+        self._read_pool.shutdown()
+        self._write_pool.shutdown()
+        with self._clones_lock:
+            clones, self._clones = self._clones, []
+        for db in clones:
+            db.close()
+
+    def _thread_db(self) -> Database:
+        # Satu koneksi per thread (aturan sqlite3), sama seperti AsyncDatabase
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self.db.clone(check_same_thread=False)
+            self._local.db = db
+            with self._clones_lock:
+                self._clones.append(db)
+        return db
+
+    async def _read(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_pool, lambda: fn(self._thread_db(), *args))
+
+    # ---------- writer ----------
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            # Selama batch sebelumnya di-commit, order baru menumpuk di antrian;
+            # semuanya ikut transaksi berikutnya
+            batch = [first]
+            stop = False
+            while len(batch) < self.max_batch and not self._queue.empty():
+                entry = self._queue.get_nowait()
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            try:
+                results = await loop.run_in_executor(
+                    self._write_pool, self._write_batch, [order for order, _ in batch]
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+            self.batches += 1
+            self.batched_orders += len(batch)
+            for (_, fut), result in zip(batch, results):
+                if fut.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    fut.set_exception(result)
+                else:
+                    fut.set_result(result)
+            if stop:
+                return
+
+    def _write_batch(self, orders: list[dict]) -> list:
+        """Di thread writer: validasi lalu satu transaksi. Return per order: dict hasil atau Exception."""
+        db = self._thread_db()
+        menu = {m.id: m for m in db.get_menu()}
+        by_name = {m.name: m for m in menu.values()}
+
+        results = [None] * len(orders)
+        valid, valid_index = [], []
+        for i, order in enumerate(orders):
+            try:
+                valid.append(self._prepare(order, menu, by_name))
+                valid_index.append(i)
+            except Exception as e:  # hanya order ini yang gagal, bukan satu batch
+                results[i] = e
+        if not valid:
+            return results
+
+        try:
+            result = db.create_orders_bulk(valid, batch_size=len(valid))
+            created = None if result.rejected else result.created
+        except Exception:
+            # Error di luar savepoint batch membatalkan seluruh transaksi
+            created = None
+        if created is None:
+            # Ulangi satu per satu supaya hanya order yang salah yang gagal
+            created = []
+            for order in valid:
+                try:
+                    single = db.create_orders_bulk([order])
+                except Exception as e:
+                    created.append(e)
+                    continue
+                created.append(single.created[0] if single.created else
+                               HttpError(400, single.rejected[0][1]))
+
+        for i, order, c in zip(valid_index, valid, created):
+            if isinstance(c, Exception):
+                results[i] = c
+            else:
+                total = sum(it["price"] * it["qty"] for it in order["items"])
+                results[i] = {"id": c[0], "order_no": c[1], "total": total}
+        return results
+
+    @classmethod
+    def _prepare(cls, order: dict, menu: dict, by_name: dict) -> dict:
+        items = order.get("items") if isinstance(order, dict) else None
+        if not isinstance(items, list) or not items:
+            raise HttpError(400, "items kosong")
+
+        prepared = []
+        for it in items:
+            if not isinstance(it, dict):
+                raise HttpError(400, "item harus object")
+            if "item_id" in it:
+                key = it["item_id"]
+                if not isinstance(key, int) or isinstance(key, bool):
+                    raise HttpError(400, "item_id harus angka bulat")
+                m = menu.get(key)
+            else:
+                key = it.get("name")
+                if not isinstance(key, str):
+                    raise HttpError(400, "item butuh item_id atau name (teks)")
+                m = by_name.get(key)
+            if m is None:
+                raise HttpError(400, f"item tidak ada di menu: {key!r}")
+            try:
+                qty = int(it.get("qty", 1))
+            except (TypeError, ValueError, OverflowError):
+                raise HttpError(400, "qty harus angka")
+            if not 0 < qty <= cls.MAX_QTY:
+                raise HttpError(400, f"qty harus 1..{cls.MAX_QTY}")
+            # Harga ditentukan server dari menu_items, bukan dari tablet
+            prepared.append({"item_id": m.id, "name": m.name, "price": m.price, "qty": qty,
+                             "note": str(it.get("note") or "")})
+        return {"items": prepared}
+
+    # ---------- HTTP ----------
+
+    async def _handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(self._response(400, {"error": "request line tidak valid"}, False))
+                    break
+
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = h.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                conn_header = headers.get("connection", "").lower()
+                keep_alive = conn_header != "close" if version == "HTTP/1.1" else conn_header == "keep-alive"
+
+                raw_length = headers.get("content-length") or "0"
+                if not raw_length.isdigit():  # juga menolak angka negatif
+                    writer.write(self._response(400, {"error": "Content-Length tidak valid"}, False))
+                    break
+                length = int(raw_length)
+                if length > self.MAX_BODY:
+                    writer.write(self._response(413, {"error": "body terlalu besar"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._dispatch(method, target, body)
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _response(self, status: int, payload, keep_alive: bool) -> bytes:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {self.REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            if parts == ["orders"]:
+                if method == "POST":
+                    return 201, await self.create_order(self._json(body))
+                if method == "GET":
+                    return 200, await self.list_orders(query)
+            elif len(parts) == 2 and parts[0] == "orders":
+                if method == "GET":
+                    return 200, await self.order_detail(self._int(parts[1], "id"))
+            elif parts == ["sales", "monthly"]:
+                if method == "GET":
+                    return 200, await self.monthly_sales(query)
+            elif parts == ["menu"]:
+                if method == "GET":
+                    return 200, await self.menu()
+            else:
+                raise HttpError(404, "endpoint tidak ada")
+            raise HttpError(405, f"method {method} tidak didukung")
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            print(f"Warning: {method} {target} gagal: {e!r}")
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    def _json(body: bytes):
+        try:
+            return json.loads(body or b"null")
+        except ValueError:
+            raise HttpError(400, "body bukan JSON")
+
+    @staticmethod
+    def _int(value, name: str, default: Optional[int] = None) -> Optional[int]:
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise HttpError(400, f"{name} harus angka")
+
+    # ---------- handler ----------
+
+    async def create_order(self, order: dict) -> dict:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((order, fut))
+        return await fut
+
+    async def list_orders(self, query: dict) -> dict:
+        before_id = self._int(query.get("before_id"), "before_id")
+        limit = self._int(query.get("limit"), "limit", 50)
+        if limit < 1:
+            raise HttpError(400, "limit harus >= 1")
+        limit = min(limit, self.PAGE_LIMIT)
+        rows = await self._read(lambda db: db.list_orders_page(before_id, limit))
+        return {"orders": [r._asdict() for r in rows]}
+
+    async def order_detail(self, order_id: int) -> dict:
+        detail = await self._read(lambda db: db.get_order_with_items(order_id))
+        if detail is None:
+            raise HttpError(404, f"order {order_id} tidak ditemukan")
+        order, items = detail
+        return {"order": order._asdict(), "items": [
+            {"item_name": r.item_name, "price": r.price, "qty": r.qty, "note": r.note, "subtotal": r.subtotal}
+            for r in items
+        ]}
+
+    async def monthly_sales(self, query: dict) -> dict:
+        year = self._int(query.get("year"), "year")
+        month = self._int(query.get("month"), "month")
+        if year is None or month is None or not 1 <= month <= 12:
+            raise HttpError(400, "year dan month (1-12) wajib")
+        rows = await self._read(lambda db: db.get_monthly_sales(month, year))
+        return {"year": year, "month": month, "days": [{"day": d, "total": t} for d, t in rows]}
+
+    async def menu(self) -> dict:
+        items = await self._read(lambda db: db.get_menu())
+        return {"items": [{"id": m.id, "name": m.name, "price": m.price} for m in items]}
+
+
+async def serve(args):
+    cache = ResultCache(args.cache_entries) if args.cache_entries else None
+    db = Database(args.db, wal=True, cache=cache)
+    db.init_schema()
+    server = OrderServer(db, read_threads=args.read_threads, max_batch=args.max_batch)
+    srv = await server.start(args.host, args.port)
+    port = srv.sockets[0].getsockname()[1]
+    print(f"order server di http://{args.host}:{port} (db: {args.db})", flush=True)
+    try:
+        await asyncio.Event().wait()  # sampai Ctrl+C
+    finally:
+        await server.close()
+        db.close()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Server HTTP/JSON order untuk tablet pelayan")
+    ap.add_argument("--db", default="pesanan_warung.db")
+    ap.add_argument("--host", default="127.0.0.1", help="0.0.0.0 supaya tablet di WiFi warung bisa akses")
+    ap.add_argument("--port", type=int, default=8765, help="0 = port bebas")
+    ap.add_argument("--read-threads", type=int, default=OrderServer.READ_THREADS)
+    ap.add_argument("--max-batch", type=int, default=OrderServer.MAX_BATCH)
+    ap.add_argument("--cache-entries", type=int, default=ResultCache.MAX_ENTRIES, help="0 = tanpa cache")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+from typing import Optional
+
+from async_db import AsyncDatabase
+from database_handler import rupiah
+from order_journal import OrderJournal
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class OrdersTableModel(QAbstractTableModel):
+    """
+    Model daftar pesanan yang dimuat bertahap (lazy) per halaman.
+    View hanya meminta halaman berikutnya lewat canFetchMore/fetchMore saat
+    di-scroll, jadi biaya reload tidak bergantung pada jumlah order di database.
+    Halaman diambil di thread worker; baris baru disisipkan saat hasilnya tiba.
+
+    Kalau memakai OrderJournal, order yang belum masuk database ditampilkan
+    paling atas (id None) sampai flusher meng-commit-nya.
+
+    Mode cari (set_search): daftar diganti hasil Database.search_orders,
+    maksimal SEARCH_LIMIT order, tanpa lazy loading dan tanpa order tertunda.
+    """
+
+    HEADERS = ["Nomor Pesanan", "Waktu Pesanan", "Total Harga"]
+    PAGE_SIZE = 200
+    SEARCH_LIMIT = 200
+
+    # Index kolom pada tuple baris
+    COL_ID, COL_NO, COL_TIME, COL_TOTAL = range(4)
+
+    def __init__(self, db: AsyncDatabase, page_size: int = PAGE_SIZE,
+                 journal: Optional[OrderJournal] = None, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.page_size = page_size
+        self.journal = journal
+        self._pending = []  # (None, order_no, created_at, total) dari journal
+        self._pending_items = {}  # order_no -> items
+        self._rows = []  # OrderRow (id, order_no, created_at, total), urutan sama dengan COL_*
+        self._exhausted = False
+        self._loading = False
+        self._search = None  # (query, date_from) saat mode cari aktif
+
+    # ---------- API untuk widget ----------
+
+    def set_search(self, query: str, date_from=None):
+        """
+        Filter daftar dengan teks (nama item/catatan); query kosong kembali ke
+        daftar biasa. Berlaku mulai reload() berikutnya.
+        """
+        query = query.strip()
+        self._search = (query, date_from) if query else None
+
+    def reload(self):
+        """Buang semua baris yang sudah dimuat; view akan memanggil fetchMore lagi."""
+        self.db.cancel("orders_page")  # halaman dari daftar lama tidak dipakai lagi
+        self.db.cancel("orders_head")
+        self.db.cancel("orders_search")
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self._loading = False
+        if self._search is None:
+            self._load_pending()
+        else:
+            self._pending, self._pending_items = [], {}
+        self.endResetModel()
+
+        if self._search is not None:
+            # Hasil cari dimuat sekaligus; fetchMore tidak dipakai
+            self._exhausted = True
+            self._loading = True
+            query, date_from = self._search
+            self.db.submit(
+                "search_orders", query, date_from, None, self.SEARCH_LIMIT,
+                on_result=self._on_search_loaded,
+                on_error=self._on_page_failed,
+                key="orders_search",
+            )
+
+    def order_at(self, row: int):
+        """Return (order_id, order_no) untuk baris tertentu; order_id None untuk order tertunda."""
+        r = self._row(row)
+        return r[self.COL_ID], r[self.COL_NO]
+
+    def neighbour_ids(self, row: int, radius: int) -> list[int]:
+        """Id order di sekitar `row` (terdekat dulu) yang sudah ada di database, untuk prefetch."""
+        ids = []
+        for step in range(1, radius + 1):
+            for r in (row + step, row - step):
+                if 0 <= r < self.rowCount():
+                    order_id = self._row(r)[self.COL_ID]
+                    if order_id is not None:
+                        ids.append(order_id)
+        return ids
+
+    def pending_items(self, order_no: str) -> list[dict]:
+        """Item order tertunda (belum ada di database): [{name, price, qty, note}]."""
+        return self._pending_items.get(order_no, [])
+
+    def on_journal_flushed(self):
+        """
+        Order tertunda sudah masuk database: ganti baris tertunda dengan
+        baris database terbaru tanpa me-reset model (pilihan user tetap).
+        """
+        if self._search is not None:
+            self.reload()  # order baru bisa masuk hasil cari
+        elif self._rows:
+            self.db.submit(
+                "list_orders_after", self._rows[0][self.COL_ID], self.page_size,
+                on_result=self._on_head_loaded,
+                on_error=self._on_page_failed,
+                key="orders_head",
+            )
+        else:
+            self.reload()
+
+    def _on_head_loaded(self, head):
+        if len(head) >= self.page_size:
+            # Terlalu banyak order baru untuk disisipkan; muat ulang saja
+            self.reload()
+            return
+
+        self._replace_pending()
+        if head:
+            self.beginInsertRows(QModelIndex(), len(self._pending), len(self._pending) + len(head) - 1)
+            self._rows[:0] = head
+            self.endInsertRows()
+
+    def _load_pending(self):
+        self._pending, self._pending_items = self._read_pending()
+
+    def _read_pending(self):
+        pending = self.journal.pending_orders() if self.journal is not None else []
+        pending.reverse()  # terbaru dulu, sama dengan urutan daftar
+        rows = [(None, e["order_no"], e["created_at"], e["total"]) for e in pending]
+        return rows, {e["order_no"]: e["items"] for e in pending}
+
+    def _replace_pending(self):
+        if self._pending:
+            self.beginRemoveRows(QModelIndex(), 0, len(self._pending) - 1)
+            self._pending = []
+            self.endRemoveRows()
+        rows, self._pending_items = self._read_pending()
+        if rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self._pending = rows
+            self.endInsertRows()
+
+    def _row(self, row: int):
+        n = len(self._pending)
+        return self._pending[row] if row < n else self._rows[row - n]
+
+    # ---------- Lazy loading ----------
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._loading:
+            return
+
+        self._loading = True
+        before_id = self._rows[-1][self.COL_ID] if self._rows else None
+        self.db.submit(
+            "list_orders_page", before_id, self.page_size,
+            on_result=self._on_page_loaded,
+            on_error=self._on_page_failed,
+            key="orders_page",
+        )
+
+    def _on_page_failed(self, error: Exception):
+        self._loading = False
+        print(f"Warning: gagal memuat daftar pesanan: {error!r}")
+
+    def _on_search_loaded(self, rows):
+        self._loading = False
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self._rows = rows
+        self.endInsertRows()
+
+    def _on_page_loaded(self, page):
+        self._loading = False
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if not page:
+            return
+
+        first = len(self._pending) + len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    # ---------- QAbstractTableModel ----------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._pending) + len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        r = self._row(index.row())
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return r[self.COL_NO] if r[self.COL_ID] is not None else f"{r[self.COL_NO]} (tertunda)"
+            if col == 1:
+                return r[self.COL_TIME]
+            return rupiah(r[self.COL_TOTAL])
+
+        if role == Qt.TextAlignmentRole and col == 2:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        if role == Qt.UserRole:
+            return r[self.COL_ID]
+
+        return None
@@ -0,0 +1,58 @@
+"""
+Hapus (void) banyak pesanan sekaligus, mis. data uji coba atau pesanan batal,
+lalu kembalikan ruang kosong ke disk sedikit demi sedikit.
+
+Setiap pesanan yang dihapus dicatat di tabel voided_orders (nomor, waktu,
+total, jumlah item, alasan). Aman dijalankan saat aplikasi kasir hidup.
+
+    python purge.py --from 2026-01-01 --to 2026-01-07 --reason "data uji coba"
+    python purge.py --ids 12 13 14 --reason "pesanan batal"
+    python purge.py --enable-incremental-vacuum   # sekali, saat warung tutup
+    python purge.py --prune-events 30             # buang change feed > 30 hari
+"""
+import argparse
+import sys
+
+from database_handler import Database
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Hapus massal pesanan + reclaim ruang disk")
+    ap.add_argument("--db", default="pesanan_warung.db")
+    ap.add_argument("--ids", type=int, nargs="+", help="id order yang dihapus")
+    ap.add_argument("--from", dest="date_from", help="YYYY-MM-DD (inklusif)")
+    ap.add_argument("--to", dest="date_to", help="YYYY-MM-DD (inklusif)")
+    ap.add_argument("--reason", default="", help="dicatat di voided_orders")
+    ap.add_argument("--chunk-size", type=int, default=Database.VOID_CHUNK_SIZE)
+    ap.add_argument("--enable-incremental-vacuum", action="store_true",
+                    help="ubah database lama ke auto_vacuum=INCREMENTAL (VACUUM penuh sekali)")
+    ap.add_argument("--prune-events", type=int, metavar="HARI",
+                    help=f"buang order_events yang lebih tua dari HARI hari "
+                         f"(biasanya {Database.ORDER_EVENTS_KEEP_DAYS})")
+    args = ap.parse_args(argv)
+
+    if not (args.ids or args.date_from or args.date_to or args.enable_incremental_vacuum
+            or args.prune_events is not None):
+        ap.error("isi --ids dan/atau --from/--to")
+
+    db = Database(args.db, wal=True)
+    try:
+        db.init_schema()
+        if args.enable_incremental_vacuum:
+            db.enable_incremental_vacuum()
+            print("auto_vacuum=INCREMENTAL aktif")
+        if args.prune_events is not None:
+            print(f"{db.prune_order_events(args.prune_events)} event change feed dibuang")
+        if args.ids or args.date_from or args.date_to:
+            # Perawatan eksplisit: ruang kosong selalu dikembalikan
+            result = db.void_orders(args.ids, args.date_from, args.date_to, args.reason, args.chunk_size,
+                                    reclaim_min_pages=0)
+            print(f"{result.deleted} pesanan dihapus dalam {result.chunks} transaksi, "
+                  f"{result.pages_freed} halaman dikembalikan ({result.elapsed_s:.1f} s)")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import bisect
+import functools
+import json
+import math
+import sqlite3
+import threading
+import time
+
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+
+# Batas bucket histogram latensi (mikrodetik), naik 25% per bucket: 1us .. ~100s
+_BUCKET_BOUNDS_US = [1.25 ** i for i in range(int(math.log(100e6, 1.25)) + 2)]
+
+
+class LatencyHistogram:
+    """Histogram latensi dengan bucket logaritmik; persentil diestimasi dari bucket."""
+
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us", "rows")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.min_us = math.inf
+        self.max_us = 0.0
+        self.rows = 0
+
+    def add(self, us: float, rows: int = 0):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS_US, us)] += 1
+        self.count += 1
+        self.total_us += us
+        self.rows += rows
+        if us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                bound = _BUCKET_BOUNDS_US[i] if i < len(_BUCKET_BOUNDS_US) else self.max_us
+                return min(bound, self.max_us)
+        return self.max_us
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "mean_ms": round(self.total_us / self.count / 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) / 1000, 3),
+            "p95_ms": round(self.percentile(95) / 1000, 3),
+            "p99_ms": round(self.percentile(99) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
+
+
+class QueryStats:
+    """
+    Statistik latensi SQL untuk Database (opsional).
+
+    - Per method publik Database (create_order, list_orders, ...): histogram
+      latensi + jumlah baris yang dikembalikan.
+    - Slow-query log: method (atau statement di luar method) yang lebih lambat
+      dari slow_query_ms dicatat bersama statement terlambatnya dan
+      EXPLAIN QUERY PLAN-nya.
+
+    Satu objek boleh dipakai bersama beberapa koneksi/thread (lihat Database.clone).
+    """
+
+    SLOW_LOG_SIZE = 200
+
+    def __init__(self, slow_query_ms: float = 50.0, slow_log_path: Optional[str] = None):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.methods = {}  # nama method -> LatencyHistogram
+        self.slow_queries = deque(maxlen=self.SLOW_LOG_SIZE)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---------- perekaman ----------
+
+    def wrap(self, name: str, fn):
+        """Bungkus method Database supaya waktunya tercatat di histogram `name`."""
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            stack = self._method_stack()
+            # [nama, us statement terlambat, conn, sql, params, explain]
+            frame = [name, -1.0, None, None, None, False]
+            stack.append(frame)
+            t0 = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                stack.pop()
+            us = (time.perf_counter() - t0) * 1e6
+            self.record_method(name, us, _row_count(result))
+            if us >= self.slow_query_ms * 1000 and frame[3] is not None:
+                # Waktu method termasuk fetch; statement terlambat di dalamnya
+                # yang dicatat beserta plan-nya
+                self._log_slow(name, us, frame[1], *frame[2:])
+            return result
+        return timed
+
+    def record_method(self, name: str, us: float, rows: int = 0):
+        with self._lock:
+            hist = self.methods.get(name)
+            if hist is None:
+                hist = self.methods[name] = LatencyHistogram()
+            hist.add(us, rows)
+
+    def record_statement(self, conn: sqlite3.Connection, sql: str, params, us: float, explain: bool = True):
+        stack = self._method_stack()
+        if stack:
+            frame = stack[-1]
+            if us > frame[1]:
+                frame[1:] = [us, conn, sql, params, explain]
+        elif us >= self.slow_query_ms * 1000:
+            self._log_slow(None, us, us, conn, sql, params, explain)
+
+    def _log_slow(self, method, total_us, stmt_us, conn, sql, params, explain):
+        entry = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "method": method,
+            "ms": round(total_us / 1000, 3),
+            "statement_ms": round(stmt_us / 1000, 3),
+            "sql": " ".join(sql.split()),
+            "params": repr(params)[:200],
+            "plan": _explain(conn, sql, params) if explain else None,
+        }
+        with self._lock:
+            self.slow_queries.append(entry)
+            if self.slow_log_path:
+                with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _method_stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    # ---------- pembacaan ----------
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "methods": {name: h.summary() for name, h in sorted(self.methods.items())},
+                "slow_query_ms": self.slow_query_ms,
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+
+    def reset(self):
+        with self._lock:
+            self.methods.clear()
+            self.slow_queries.clear()
+
+
+def _row_count(result) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+_SKIP_EXPLAIN = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "CREATE", "EXPLAIN", "ANALYZE", "VACUUM")
+
+
+def _explain(conn: sqlite3.Connection, sql: str, params) -> Optional[list]:
+    if sql.lstrip().upper().startswith(_SKIP_EXPLAIN):
+        return None
+    try:
+        # Cursor biasa (bukan InstrumentedCursor) supaya EXPLAIN tidak ikut tercatat
+        rows = sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()
+    except sqlite3.Error:
+        return None
+    return [r[-1] for r in rows]
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        t0 = time.perf_counter()
+        result = super().execute(sql, parameters)
+        self.connection.stats.record_statement(
+            self.connection, sql, parameters, (time.perf_counter() - t0) * 1e6
+        )
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        t0 = time.perf_counter()
+        result = super().executemany(sql, seq_of_parameters)
+        # Tidak ada satu set parameter untuk EXPLAIN; catat tanpa plan
+        self.connection.stats.record_statement(
+            self.connection, sql, None, (time.perf_counter() - t0) * 1e6, explain=False
+        )
+        return result
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Koneksi yang semua cursor-nya mencatat waktu statement ke `stats`."""
+
+    stats: Optional[QueryStats] = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
@@ -1,108 +1,31 @@
-from database_handler import rupiah
+from database_handler import Database, OrderRow, rupiah
+from escpos import EscPosRenderer, send_raw
 
-from PySide6.QtCore import QSizeF, QMarginsF
-from PySide6.QtGui import QPageLayout, QPageSize, QTextDocument, QAction
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from PySide6.QtCore import QRectF, QSizeF, QMarginsF
+from PySide6.QtGui import QPageLayout, QPageSize, QPainter, QPdfWriter, QTextDocument, QAction
 from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog
 from PySide6.QtWidgets import QWidget
 
 
-class ReceiptPrinter:
-    
-    # Default paper configuration for thermal printers
-    DEFAULT_PAPER_WIDTH_MM = 80
-    DEFAULT_PAPER_HEIGHT_MM = 2500  # Long for continuous roll
-
-    def __init__(
-        self,
-        nama_toko: str = "WARUNG SARAPAN MAK UDE",
-        alamat: str = "Jl. Adi Sucipto Gg. Hj. Aminah",
-        no_telp: str = "Tel: (021) 1234-5678"
-    ):
-
-        self.nama_toko = nama_toko
-        self.alamat = alamat
-        self.no_telp = no_telp
-
-    def print_receipt(self, parent_widget: QWidget, order: dict, items: list) -> None:
-        #Show print preview dialog for the receipt.
-        html_content = self.generate_receipt_html(order, items)
-        printer = QPrinter(QPrinter.ScreenResolution)
-
-        # Configure paper size for thermal printer
-        paper_height = 300  
-        custom_size = QPageSize(
-            QSizeF(self.DEFAULT_PAPER_WIDTH_MM, paper_height),
-            QPageSize.Millimeter
-        )
-        # Add small margins to prevent content from being clipped at edges
-        page_layout = QPageLayout(
-            custom_size,
-            QPageLayout.Portrait,
-            QMarginsF(5, 5, 5, 5),
-            QPageLayout.Millimeter
-        )
-        printer.setPageLayout(page_layout)
-
-        # preview dialog
-        preview_dialog = QPrintPreviewDialog(printer, parent_widget)
-        preview_dialog.setWindowTitle(f"Preview Struk - {order['order_no']}")
-        preview_dialog.resize(450, 700)
-
-        for action in preview_dialog.findChildren(QAction):
-            if action.text() and 'width' in action.text().lower():
-                action.trigger()
-                break
+# -------------------- Template struk (di-compile sekali saat import) --------------------
 
-        # Connect paintRequested signal to render document
-        preview_dialog.paintRequested.connect(
-            lambda p: self._render_to_printer(p, html_content)
-        )
-
-        preview_dialog.exec()
-
-    def generate_receipt_html(self, order: dict, items: list) -> str:
-        """
-        Generate HTML string for receipt.
-        Uses HTML4 format compatible with Qt's QTextDocument.
-        (No flexbox, CSS grid - uses tables with align attributes)
-        """
-        order_no = order["order_no"]
-        created_at = order["created_at"]
-        total = int(order["total"])
-
-        items_rows = ""
-        for item in items:
-            item_name = item["item_name"]
-            qty = int(item["qty"])
-            price = int(item["price"])
-            subtotal = int(item["subtotal"])
-            note = item["note"] or ""
-
-            items_rows += f"""
-            <tr>
-                <td align="left" valign="top">{item_name}</td>
-                <td align="center" valign="top">{qty}</td>
-                <td align="right" valign="top">{rupiah(price)}</td>
-                <td align="right" valign="top">{rupiah(subtotal)}</td>
-            </tr>
-            """
-            if note:
-                items_rows += f"""
-                <tr>
-                    <td colspan="4" align="left">
-                        <font size="2" color="#666666">&nbsp;&nbsp;Note: {note}</font>
-                    </td>
-                </tr>
-                """
-
-        html = f"""
+_HTML_DOCUMENT = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
 </head>
 <body style="font-family: 'Courier New', Courier, monospace; font-size: 12pt; margin: 0; padding: 0;">
+{body}
+</body>
+</html>
+        """
 
+_HEADER = """
 <!-- HEADER - Enhanced prominent styling -->
 <table width="100%" cellpadding="4" cellspacing="0">
     <tr>
@@ -112,17 +35,17 @@ class ReceiptPrinter:
     </tr>
     <tr>
         <td align="center">
-            <font size="6"><b>{self.nama_toko}</b></font>
+            <font size="6"><b>{nama_toko}</b></font>
         </td>
     </tr>
     <tr>
         <td align="center">
-            <font size="3"><b>{self.alamat}</b></font>
+            <font size="3"><b>{alamat}</b></font>
         </td>
     </tr>
     <tr>
         <td align="center">
-            <font size="3">{self.no_telp}</font>
+            <font size="3">{no_telp}</font>
         </td>
     </tr>
     <tr>
@@ -131,7 +54,26 @@ class ReceiptPrinter:
         </td>
     </tr>
 </table>
+"""
 
+_ITEM_ROW = """
+            <tr>
+                <td align="left" valign="top">{item_name}</td>
+                <td align="center" valign="top">{qty}</td>
+                <td align="right" valign="top">{price}</td>
+                <td align="right" valign="top">{subtotal}</td>
+            </tr>
+            """
+
+_NOTE_ROW = """
+                <tr>
+                    <td colspan="4" align="left">
+                        <font size="2" color="#666666">&nbsp;&nbsp;Note: {note}</font>
+                    </td>
+                </tr>
+                """
+
+_RECEIPT_BODY = """{header}
 <!-- Separator -->
 <table width="100%" cellpadding="0" cellspacing="0">
     <tr><td><hr></td></tr>
@@ -174,7 +116,7 @@ class ReceiptPrinter:
 <table width="100%" cellpadding="3" cellspacing="0">
     <tr>
         <td align="right">
-            <font size="4"><b>TOTAL: {rupiah(total)}</b></font>
+            <font size="4"><b>TOTAL: {total}</b></font>
         </td>
     </tr>
 </table>
@@ -194,11 +136,183 @@ class ReceiptPrinter:
     <tr>
     </tr>
 </table>
+"""
 
-</body>
-</html>
+
+@dataclass
+class BatchResult:
+    receipts: int
+    pages: int
+    path: Optional[str]  # None kalau tidak ada struk (file PDF tidak dibuat)
+    elapsed_s: float
+
+    @property
+    def receipts_per_sec(self) -> float:
+        return self.receipts / self.elapsed_s if self.elapsed_s else 0.0
+
+
+class ReceiptPrinter:
+    
+    # Default paper configuration for thermal printers
+    DEFAULT_PAPER_WIDTH_MM = 80
+    DEFAULT_PAPER_HEIGHT_MM = 2500  # Long for continuous roll
+    DEFAULT_PAGE_HEIGHT_MM = 300    # Tinggi halaman untuk preview & PDF
+
+    BATCH_PDF_DPI = 96  # setara QPrinter.ScreenResolution yang dipakai preview
+
+    def __init__(
+        self,
+        nama_toko: str = "WARUNG SARAPAN MAK UDE",
+        alamat: str = "Jl. Adi Sucipto Gg. Hj. Aminah",
+        no_telp: str = "Tel: (021) 1234-5678"
+    ):
+
+        self.nama_toko = nama_toko
+        self.alamat = alamat
+        self.no_telp = no_telp
+        self._header_cache = None
+        self._escpos = None
+
+    def print_receipt(self, parent_widget: QWidget, order: OrderRow, items: list) -> None:
+        #Show print preview dialog for the receipt.
+        html_content = self.generate_receipt_html(order, items)
+        printer = QPrinter(QPrinter.ScreenResolution)
+        printer.setPageLayout(self._page_layout())
+
+        # preview dialog
+        preview_dialog = QPrintPreviewDialog(printer, parent_widget)
+        preview_dialog.setWindowTitle(f"Preview Struk - {order.order_no}")
+        preview_dialog.resize(450, 700)
+
+        for action in preview_dialog.findChildren(QAction):
+            if action.text() and 'width' in action.text().lower():
+                action.trigger()
+                break
+
+        # Connect paintRequested signal to render document
+        preview_dialog.paintRequested.connect(
+            lambda p: self._render_to_printer(p, html_content)
+        )
+
+        preview_dialog.exec()
+
+    def print_raw(self, order: OrderRow, items: list, target: str, width: int = EscPosRenderer.DEFAULT_WIDTH) -> None:
+        """
+        Cetak langsung ke printer thermal sebagai ESC/POS, tanpa dialog.
+        target: "tcp://host:port" atau path file/device (lihat escpos.send_raw).
         """
-        return html
+        send_raw(self.render_escpos(order, items, width), target)
+
+    def render_escpos(self, order: OrderRow, items: list, width: int = EscPosRenderer.DEFAULT_WIDTH) -> bytes:
+        r = self._escpos
+        if r is None or r.width != width:
+            r = self._escpos = EscPosRenderer(width=width)
+        # Ikuti data toko terbaru (header ESC/POS di-cache per data toko)
+        r.nama_toko, r.alamat, r.no_telp = self.nama_toko, self.alamat, self.no_telp
+        return r.render(order, items)
+
+    def _page_layout(self) -> QPageLayout:
+        # Configure paper size for thermal printer
+        custom_size = QPageSize(
+            QSizeF(self.DEFAULT_PAPER_WIDTH_MM, self.DEFAULT_PAGE_HEIGHT_MM),
+            QPageSize.Millimeter
+        )
+        # Add small margins to prevent content from being clipped at edges
+        return QPageLayout(
+            custom_size,
+            QPageLayout.Portrait,
+            QMarginsF(5, 5, 5, 5),
+            QPageLayout.Millimeter
+        )
+
+    def generate_receipt_html(self, order: OrderRow, items: list) -> str:
+        """
+        Generate HTML string for receipt.
+        Uses HTML4 format compatible with Qt's QTextDocument.
+        (No flexbox, CSS grid - uses tables with align attributes)
+        """
+        return _HTML_DOCUMENT.format(body=self.generate_receipt_body(order, items))
+
+    def generate_receipt_body(self, order: OrderRow, items: list) -> str:
+        """Isi <body> satu struk; header toko diambil dari cache."""
+        rows = []
+        for item in items:
+            rows.append(_ITEM_ROW.format(
+                item_name=item.item_name,
+                qty=item.qty,
+                price=rupiah(item.price),
+                subtotal=rupiah(item.subtotal),
+            ))
+            note = item.note or ""
+            if note:
+                rows.append(_NOTE_ROW.format(note=note))
+
+        return _RECEIPT_BODY.format(
+            header=self._header_html(),
+            order_no=order.order_no,
+            created_at=order.created_at,
+            items_rows="".join(rows),
+            total=rupiah(order.total),
+        )
+
+    def _header_html(self) -> str:
+        # Header toko sama untuk semua struk: render sekali, render ulang
+        # hanya kalau data toko diganti
+        key = (self.nama_toko, self.alamat, self.no_telp)
+        if self._header_cache is None or self._header_cache[0] != key:
+            html = _HEADER.format(nama_toko=self.nama_toko, alamat=self.alamat, no_telp=self.no_telp)
+            self._header_cache = (key, html)
+        return self._header_cache[1]
+
+    def render_batch_pdf(self, receipts: Iterable[tuple[OrderRow, list]], out_path: str) -> BatchResult:
+        """
+        Tulis banyak struk ke satu file PDF multi-halaman tanpa dialog.
+        `receipts` boleh generator (mis. Database.iter_orders_with_items), jadi
+        struk diproses satu per satu dan tidak pernah dimuat semua ke memori.
+        Setiap struk mulai di halaman baru. Kalau `receipts` kosong, tidak ada
+        file yang ditulis dan hasilnya path=None.
+        """
+        t0 = time.perf_counter()
+
+        writer = QPdfWriter(out_path)
+        writer.setResolution(self.BATCH_PDF_DPI)
+        writer.setPageLayout(self._page_layout())
+        writer.setTitle("Struk")
+
+        painter = QPainter()
+        receipts_count = 0
+        pages = 0
+        try:
+            for order, items in receipts:
+                if receipts_count == 0:
+                    if not painter.begin(writer):
+                        raise IOError(f"Tidak bisa menulis PDF ke {out_path}")
+                    page_rect = QRectF(0, 0, painter.viewport().width(), painter.viewport().height())
+                    document = QTextDocument()
+                    document.documentLayout().setPaintDevice(writer)
+                    document.setPageSize(page_rect.size())
+                    document.setTextWidth(page_rect.width())
+
+                document.setHtml(self.generate_receipt_html(order, items))
+                for page in range(document.pageCount()):
+                    if pages > 0:
+                        writer.newPage()
+                    painter.save()
+                    painter.translate(0, -page * page_rect.height())
+                    document.drawContents(painter, page_rect.translated(0, page * page_rect.height()))
+                    painter.restore()
+                    pages += 1
+                receipts_count += 1
+        finally:
+            if painter.isActive():
+                painter.end()
+
+        return BatchResult(receipts_count, pages, out_path if receipts_count else None,
+                           time.perf_counter() - t0)
+
+    def print_range_to_pdf(self, db: Database, date_from, date_to, out_path: str) -> BatchResult:
+        """Cetak ulang / arsip semua struk pada rentang tanggal (inklusif) ke satu PDF."""
+        return self.render_batch_pdf(db.iter_orders_with_items(date_from, date_to), out_path)
 
     def _render_to_printer(self, printer: QPrinter, html_content: str) -> None:
         
@@ -213,3 +327,44 @@ class ReceiptPrinter:
 
         document.setHtml(html_content)
         document.print_(printer)
+
+
+def main(argv=None) -> int:
+    """
+    Cetak ulang / arsip struk satu rentang tanggal ke satu PDF, tanpa dialog:
+
+        python receipt_printer.py --from 2026-01-01 --to 2026-01-31 --out struk.pdf
+    """
+    import argparse
+    import sys
+
+    from PySide6.QtGui import QGuiApplication
+
+    ap = argparse.ArgumentParser(description="Batch cetak struk ke PDF")
+    ap.add_argument("--db", default="pesanan_warung.db")
+    ap.add_argument("--from", dest="date_from", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--to", dest="date_to", help="YYYY-MM-DD (default: sama dengan --from)")
+    ap.add_argument("--out", required=True, help="file PDF tujuan")
+    args = ap.parse_args(argv)
+
+    # QPdfWriter/QTextDocument butuh QGuiApplication (bisa -platform offscreen)
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+    db = Database(args.db)
+    try:
+        result = ReceiptPrinter().print_range_to_pdf(
+            db, args.date_from, args.date_to or args.date_from, args.out
+        )
+    finally:
+        db.close()
+
+    if result.path is None:
+        print(f"Tidak ada struk pada rentang tanggal itu; {args.out} tidak dibuat", file=sys.stderr)
+        return 1
+    print(f"{result.receipts} struk, {result.pages} halaman -> {result.path} "
+          f"({result.elapsed_s:.2f} s, {result.receipts_per_sec:.1f} struk/detik)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+"""
+Putar ulang trace rekaman TraceRecorder terhadap salinan database dan
+laporkan distribusi latensi per method, dibandingkan dengan rekaman aslinya
+(dan opsional dengan hasil replay versi aplikasi lain).
+
+Database sumber default: snapshot <trace>.db yang dibuat saat rekaman mulai.
+Sumber tidak pernah diubah; replay berjalan di salinan di folder sementara.
+Setiap thread rekaman diputar di thread sendiri dengan koneksi sendiri.
+
+    # rekam: isi TRACE_FILE di main.py, jalankan kasir seperti biasa
+    python replay.py sabtu.trace.gz                    # secepat mungkin
+    python replay.py sabtu.trace.gz --speed 1          # tempo asli
+    python replay.py sabtu.trace.gz --json versi_baru.json --baseline versi_lama.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterator, Optional
+
+from database_handler import Database
+from query_stats import QueryStats
+from result_cache import ResultCache
+from trace_recorder import decode_arg, read_trace
+
+
+def copy_database(src: str, dst: str):
+    """Salin database (konsisten walau sedang dipakai) beserta folder arsipnya."""
+    src_conn = sqlite3.connect(f"{Path(src).resolve().as_uri()}?mode=ro", uri=True)
+    dst_conn = sqlite3.connect(dst)
+    try:
+        src_conn.backup(dst_conn)
+    finally:
+        dst_conn.close()
+        src_conn.close()
+    archive = Path(src).with_name(Path(src).stem + "_archive")
+    if archive.is_dir():
+        shutil.copytree(archive, Path(dst).with_name(Path(dst).stem + "_archive"))
+
+
+def _play(db: Database, records: list, speed: float, t_start: float,
+          replayed: QueryStats, errors: dict):
+    for t, _, name, args, kwargs, *_ in records:
+        if speed:
+            delay = t_start + t / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        method = getattr(db, name)
+        t0 = time.perf_counter()
+        try:
+            result = method(*decode_arg(args), **decode_arg(kwargs))
+            if isinstance(result, Iterator):
+                rows = sum(1 for _ in result)
+            else:
+                rows = len(result) if isinstance(result, list) else int(result is not None)
+        except Exception as e:  # error di rekaman (mis. order sudah dihapus) ikut terulang
+            errors[name][type(e).__name__] += 1
+            rows = 0
+        replayed.record_method(name, (time.perf_counter() - t0) * 1e6, rows)
+
+
+def replay(trace_path: str, db_path: Optional[str] = None, speed: float = 0.0,
+           cache_entries: Optional[int] = None) -> dict:
+    """
+    speed: 0 = secepat mungkin, 1 = tempo asli, 2 = dua kali lebih cepat, ...
+    cache_entries: None = sama seperti saat rekaman.
+    """
+    header, records = read_trace(trace_path)
+    db_path = db_path or header.get("snapshot")
+    if not db_path or not os.path.exists(db_path):
+        raise FileNotFoundError("database sumber tidak ada; isi --db atau rekam dengan snapshot=True")
+    if cache_entries is None:
+        cache_entries = header.get("cache_entries", 0)
+
+    recorded = QueryStats()
+    by_thread = defaultdict(list)
+    for r in records:
+        recorded.record_method(r[2], r[5] * 1000)
+        by_thread[r[1]].append(r)
+
+    replayed = QueryStats()
+    errors = defaultdict(lambda: defaultdict(int))
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "replay.db")
+        copy_database(db_path, copy)
+        cache = ResultCache(cache_entries) if cache_entries else None
+        main_db = Database(copy, wal=header.get("wal", True), cache=cache)
+        dbs = [main_db.clone(check_same_thread=False) for _ in by_thread]
+
+        t_start = time.perf_counter()
+        threads = [
+            threading.Thread(target=_play, args=(db, recs, speed, t_start, replayed, errors))
+            for db, recs in zip(dbs, by_thread.values())
+        ]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        wall_s = time.perf_counter() - t_start
+
+        for db in dbs:
+            db.close()
+        main_db.close()
+
+    return {
+        "trace": trace_path,
+        "calls": len(records),
+        "threads": len(by_thread),
+        "speed": speed,
+        "recorded_s": records[-1][0] if records else 0.0,
+        "wall_s": round(wall_s, 3),
+        "recorded": recorded.snapshot()["methods"],
+        "methods": replayed.snapshot()["methods"],
+        "errors": {name: dict(e) for name, e in errors.items()},
+    }
+
+
+def print_report(result: dict, baseline: Optional[dict] = None):
+    print(f"{result['calls']} panggilan, {result['threads']} thread: rekaman {result['recorded_s']:.1f} s, "
+          f"replay {result['wall_s']:.1f} s (speed {result['speed'] or 'maks'})")
+    head = f"{'method':>22} {'jumlah':>7} {'rekam p50':>10} {'p99':>8} {'replay p50':>11} {'p99':>8}"
+    if baseline:
+        head += f" {'dasar p50':>10} {'p99':>8}"
+    print(head)
+    for name, m in result["methods"].items():
+        rec = result["recorded"].get(name, {})
+        line = (f"{name:>22} {m['count']:7d} {rec.get('p50_ms', 0):10.3f} {rec.get('p99_ms', 0):8.3f} "
+                f"{m['p50_ms']:11.3f} {m['p99_ms']:8.3f}")
+        if baseline:
+            base = baseline["methods"].get(name)
+            line += f" {base['p50_ms']:10.3f} {base['p99_ms']:8.3f}" if base else f" {'-':>10} {'-':>8}"
+        print(line)
+    for name, errs in result["errors"].items():
+        print(f"error {name}: {errs}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Replay trace Database dan laporkan latensi per method")
+    ap.add_argument("trace")
+    ap.add_argument("--db", help="database sumber (default: snapshot <trace>.db)")
+    ap.add_argument("--speed", type=float, default=0.0, help="0 = secepat mungkin, 1 = tempo asli")
+    ap.add_argument("--cache-entries", type=int, help="default: sama seperti saat rekaman, 0 = tanpa cache")
+    ap.add_argument("--json", help="simpan hasil ke file ini")
+    ap.add_argument("--baseline", help="hasil --json versi lain untuk dibandingkan")
+    args = ap.parse_args(argv)
+
+    result = replay(args.trace, args.db, args.speed, args.cache_entries)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import threading
+
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+
+class ResultCache:
+    """
+    LRU hasil query Database (opsional, lihat Database(cache=...)).
+
+    Satu objek dipakai bersama Database dan semua clone-nya (thread worker
+    AsyncDatabase), jadi hasil yang dimuat/di-prefetch satu thread langsung
+    terpakai di thread lain. Key berupa tuple, mis. ("items", order_id).
+
+    Validitas:
+    - Tulis lewat Database (create_order, delete_order, ...) membuang key
+      yang terdampak saja (applied).
+    - Tulis dari luar (proses lain, sqlite3 CLI) terdeteksi lewat PRAGMA
+      data_version + app_meta.write_seq yang dinaikkan trigger; kalau
+      write_seq tidak sesuai yang sudah diketahui cache, semua dibuang (sync).
+    - put() menolak hasil yang dibaca sebelum invalidasi terakhir
+      (generation berubah), supaya hasil basi tidak masuk lagi.
+    """
+
+    MAX_ENTRIES = 2048
+    MISSING = object()
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0  # naik setiap ada invalidasi
+        self.write_seq = None  # app_meta.write_seq yang sudah tercermin di cache
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.clears = 0
+        self.prefetched = 0
+
+    # ---------- baca/tulis entry ----------
+
+    def get(self, key: Hashable):
+        """Nilai untuk key, atau ResultCache.MISSING."""
+        with self._lock:
+            value = self._data.get(key, self.MISSING)
+            if value is self.MISSING:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def peek(self, key: Hashable):
+        """Seperti get() tapi tanpa mengubah urutan LRU dan counter."""
+        with self._lock:
+            return self._data.get(key, self.MISSING)
+
+    def put(self, key: Hashable, value, generation: int, prefetch: bool = False) -> bool:
+        """Simpan hasil yang dibaca saat `generation`; ditolak kalau sudah ada invalidasi sesudahnya."""
+        with self._lock:
+            if generation != self.generation:
+                return False
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if prefetch:
+                self.prefetched += 1
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    # ---------- invalidasi ----------
+
+    def invalidate(self, keys: Iterable[Hashable]):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_kind(self, kind: str):
+        """Buang semua key dengan elemen pertama `kind` (mis. semua "items")."""
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._data if k[0] == kind]:
+                del self._data[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.generation += 1
+        if self._data:
+            self._data.clear()
+            self.clears += 1
+
+    def applied(self, seq_before: Optional[int], seq_after: Optional[int],
+                keys: Optional[Iterable[Hashable]] = None):
+        """
+        Database sendiri baru commit tulisan yang menaikkan write_seq dari
+        seq_before ke seq_after. keys None = tidak tahu yang terdampak, buang semua.
+        """
+        with self._lock:
+            if keys is None or seq_before is None or self.write_seq != seq_before:
+                # Ada tulisan lain (dari luar) di antaranya yang belum diketahui
+                self._clear()
+            else:
+                self.generation += 1
+                for key in keys:
+                    if self._data.pop(key, None) is not None:
+                        self.invalidations += 1
+            self.write_seq = seq_after
+
+    def sync(self, write_seq: Optional[int]):
+        """Dipanggil saat data_version koneksi berubah; buang semua kalau ada tulisan dari luar."""
+        with self._lock:
+            if write_seq is not None and self.write_seq is not None and write_seq < self.write_seq:
+                return  # dibaca sebelum commit yang sudah di-applied(); tidak mundur
+            if write_seq != self.write_seq:
+                self._clear()
+                self.write_seq = write_seq
+
+    # ---------- statistik ----------
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "prefetched": self.prefetched,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "clears": self.clears,
+            }
@@ -0,0 +1,87 @@
+import calendar
+
+from matplotlib.figure import Figure
+
+
+MONTH_NAMES = ["Januari", "Februari", "Maret", "April", "Mei", "Juni",
+               "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
+
+
+def format_rupiah_axis(x, pos=None) -> str:
+    return f'Rp{x/1000:.0f}K' if x >= 1000 else f'Rp{x:.0f}'
+
+
+class SalesChart:
+    """
+    Grafik batang penjualan harian yang di-update secara incremental.
+
+    Axes dan BarContainer dibuat sekali dan dipakai ulang; ganti bulan/tahun
+    hanya mengubah tinggi batang, judul dan batas sumbu Y. Batang dibangun
+    ulang hanya kalau jumlah hari dalam bulan berubah (28/29/30/31).
+    """
+
+    BAR_COLOR = '#4A90D9'
+    BAR_EDGE_COLOR = '#2E5D8C'
+
+    def __init__(self, figure: Figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.ax = None
+        self.bars = None
+        self.title = None
+        self.num_days = None
+        self._ytick_width = None
+
+    def update(self, month: int, year: int, sales_data: list[tuple[int, int]]):
+        _, num_days = calendar.monthrange(year, month)
+        if self.bars is None or num_days != self.num_days:
+            self._build(num_days)
+
+        # Zero-fill missing days
+        sales_dict = {day: total for day, total in sales_data}
+        totals = [sales_dict.get(day, 0) for day in range(1, num_days + 1)]
+
+        for rect, total in zip(self.bars, totals):
+            rect.set_height(total)
+
+        self.title.set_text(f'GRAFIK PENJUALAN: {MONTH_NAMES[month - 1]} {year}')
+        ymax = max(max(totals), 1) * 1.05
+        self.ax.set_ylim(0, ymax)
+
+        # Label sumbu Y melebar (mis. Rp900K -> Rp1500K): hitung ulang margin
+        ytick_width = len(format_rupiah_axis(ymax))
+        if ytick_width != self._ytick_width:
+            self._ytick_width = ytick_width
+            self.figure.tight_layout()
+
+        # Digambar saat event loop senggang, bukan langsung
+        self.canvas.draw_idle()
+
+    def _build(self, num_days: int):
+        days = list(range(1, num_days + 1))
+
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        self.bars = ax.bar(days, [0] * num_days, color=self.BAR_COLOR,
+                           edgecolor=self.BAR_EDGE_COLOR, linewidth=0.5)
+
+        # Style the chart
+        ax.set_xlabel('Tanggal', fontsize=9)
+        ax.set_ylabel('Total Penjualan (Rp)', fontsize=9)
+        self.title = ax.set_title('GRAFIK PENJUALAN', fontsize=11, fontweight='bold')
+
+        # X-axis: show all days but rotate labels if crowded
+        ax.set_xticks(days)
+        ax.set_xticklabels(days, rotation=45 if num_days > 20 else 0,
+                           ha='right' if num_days > 20 else 'center', fontsize=7)
+
+        # Y-axis: format as currency
+        ax.yaxis.set_major_formatter(format_rupiah_axis)
+
+        # Add grid lines for readability
+        ax.grid(axis='y', alpha=0.3, linestyle='--')
+        ax.set_axisbelow(True)
+
+        self.ax = ax
+        self.num_days = num_days
+        self._ytick_width = None  # tight_layout dijalankan di update()
@@ -0,0 +1,361 @@
+"""
+Sinkronisasi incremental beberapa warung ke satu database pusat.
+
+Di warung, `export` menulis file batch kecil (JSON per baris, gzip) berisi
+order yang dibuat/dihapus sejak high-water mark terakhir yang sudah diakui
+pusat. Isinya dibaca dari outbox order_events (seq), jadi ukuran dan waktu
+ekspor sebanding dengan aktivitas sejak sync terakhir, bukan total riwayat.
+Sync pertama (atau kalau event yang dibutuhkan sudah dibuang, lihat
+ORDER_EVENTS_KEEP_DAYS) mengirim snapshot lengkap: semua order termasuk
+arsip, plus semua tombstone voided_orders.
+
+Di pusat, `import` menerapkan batch ke tabel store_orders/store_order_items
+dengan key (store_id, order_id), satu transaksi per file, lalu menulis file
+ack <store>.ack berisi seq yang sudah diterapkan. File ack itu dibawa balik
+ke warung dan dipakai `export` berikutnya. Import idempotent: batch yang
+sama (atau yang tumpang tindih karena ack belum sampai) boleh diterapkan
+ulang, dan order yang sudah dihapus tidak muncul lagi.
+
+    # di warung, tiap malam
+    python store_sync.py export --db pesanan_warung.db --store warung-a \\
+        --ack kirim/warung-a.ack --out-dir kirim/
+    # di kantor pusat
+    python store_sync.py import --central pusat.db --ack-dir kirim/ kirim/warung-a-*.sync.gz
+"""
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+
+from database_handler import Database
+
+
+FORMAT_VERSION = 1
+EVENT_BATCH = 5000
+
+
+@dataclass
+class ExportResult:
+    path: Optional[str]  # None kalau tidak ada perubahan
+    from_seq: int
+    to_seq: int
+    snapshot: bool
+    orders: int = 0
+    voided: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class ImportResult:
+    store_id: str
+    to_seq: int
+    orders: int = 0
+    voided: int = 0
+    skipped: bool = False  # seluruh batch sudah pernah diterapkan
+    elapsed_s: float = 0.0
+
+
+# ---------- ack (high-water mark yang sudah diterapkan pusat) ----------
+
+def read_ack(path: str) -> Optional[int]:
+    """seq yang sudah diterapkan pusat (None kalau belum pernah sync)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return int(json.load(f)["acked_seq"])
+    except FileNotFoundError:
+        return None
+
+
+def write_ack(path: str, store_id: str, acked_seq: int):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"store": store_id, "acked_seq": acked_seq}, f)
+    os.replace(tmp, path)
+
+
+# ---------- ekspor (di warung) ----------
+
+def _event_lines(db: Database, after_seq: int, to_seq: int) -> Iterator[list]:
+    """Baris batch dari order_events (after_seq, to_seq], dibaca per EVENT_BATCH lewat primary key."""
+    while after_seq < to_seq:
+        rows = db.list_order_events(after_seq, EVENT_BATCH)
+        if not rows:
+            return
+        for r in rows:
+            if r["seq"] > to_seq:
+                return
+            if r["kind"] == "created":
+                items = [[it["name"], it["price"], it["qty"], it["note"], it["subtotal"]]
+                         for it in json.loads(r["items"])]
+                yield ["c", r["seq"], r["order_id"], r["order_no"], r["created_at"], r["total"], items]
+            else:
+                yield ["v", r["seq"], r["order_id"]]
+        after_seq = rows[-1]["seq"]
+
+
+def _snapshot_lines(db: Database) -> Iterator[list]:
+    """Semua order (arsip + utama) lalu semua tombstone, dengan seq 0."""
+    order = None
+    for r in db.iter_order_item_rows(after_id=0, chunk_size=EVENT_BATCH):
+        if order is None or order[2] != r.order_id:
+            if order is not None:
+                yield order
+            order = ["c", 0, r.order_id, r.order_no, r.created_at, r.total, []]
+        if r.order_item_id is not None:
+            order[6].append([r.item_name, r.price, r.qty, r.note, r.subtotal])
+    if order is not None:
+        yield order
+    for order_id in db.list_voided_since(None):
+        yield ["v", 0, order_id]
+
+
+def export_changes(db: Database, store_id: str, acked_seq: Optional[int], out_dir: str) -> ExportResult:
+    """
+    Tulis perubahan sesudah `acked_seq` ke <out_dir>/<store>-<dari>-<sampai>.sync.gz.
+    Snapshot lengkap kalau acked_seq None (belum pernah sync) atau event
+    sesudahnya sudah dibuang. Jangan jalankan archive.py bersamaan dengan snapshot.
+    """
+    to_seq = db.last_event_seq()
+    first = db.first_event_seq()
+    # Ada celah kalau event sesudah acked_seq pernah ada tapi tidak lagi
+    # tersimpan semua (juga kalau semuanya sudah dibuang: first None)
+    gap = acked_seq is not None and to_seq > acked_seq and (first is None or first > acked_seq + 1)
+    snapshot = acked_seq is None or gap
+    acked_seq = acked_seq or 0
+    result = ExportResult(None, acked_seq, to_seq, snapshot)
+    if not snapshot and to_seq <= acked_seq:
+        return result
+
+    lines = _snapshot_lines(db) if snapshot else _event_lines(db, acked_seq, to_seq)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{store_id}-{acked_seq}-{to_seq}.sync.gz")
+    tmp_path = path + ".part"
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        f.write(dumps({
+            "format": FORMAT_VERSION, "store": store_id, "from_seq": acked_seq, "to_seq": to_seq,
+            "snapshot": snapshot, "exported_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }))
+        f.write("\n")
+        for line in lines:
+            f.write(dumps(line))
+            f.write("\n")
+            if line[0] == "c":
+                result.orders += 1
+            else:
+                result.voided += 1
+    os.replace(tmp_path, path)
+    result.path = path
+    result.bytes = os.path.getsize(path)
+    return result
+
+
+# ---------- impor (di pusat) ----------
+
+class CentralDatabase:
+    """Database pusat: order semua warung, dibedakan lewat store_id."""
+
+    CHUNK = 2000  # baris batch per executemany
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL;")
+        self.conn.execute("PRAGMA synchronous = NORMAL;")
+        self.init_schema()
+
+    def close(self):
+        self.conn.close()
+
+    def init_schema(self):
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sync_stores (
+            store_id TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL,
+            imported_at TEXT NOT NULL
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS store_orders (
+            store_id TEXT NOT NULL,
+            order_id INTEGER NOT NULL,
+            order_no TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (store_id, order_id)
+        ) WITHOUT ROWID;
+
+        -- line: urutan item di dalam order (0, 1, ...)
+        CREATE TABLE IF NOT EXISTS store_order_items (
+            store_id TEXT NOT NULL,
+            order_id INTEGER NOT NULL,
+            line INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            qty INTEGER NOT NULL,
+            note TEXT,
+            subtotal INTEGER NOT NULL,
+            PRIMARY KEY (store_id, order_id, line)
+        ) WITHOUT ROWID;
+
+        -- Tombstone supaya order yang sudah dihapus tidak muncul lagi saat batch diputar ulang
+        CREATE TABLE IF NOT EXISTS store_voided (
+            store_id TEXT NOT NULL,
+            order_id INTEGER NOT NULL,
+            PRIMARY KEY (store_id, order_id)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_store_orders_created_at ON store_orders(created_at);
+        """)
+
+    def last_seq(self, store_id: str) -> int:
+        row = self.conn.execute("SELECT last_seq FROM sync_stores WHERE store_id = ?", (store_id,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def import_batch(self, path: str) -> ImportResult:
+        """Terapkan satu file batch dalam satu transaksi."""
+        t0 = time.perf_counter()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != FORMAT_VERSION:
+                raise ValueError(f"{path}: format batch {header.get('format')} tidak dikenal")
+            store_id = header["store"]
+            result = ImportResult(store_id, header["to_seq"])
+
+            cur = self.conn.cursor()
+            cur.execute("BEGIN IMMEDIATE;")
+            try:
+                last = self.last_seq(store_id)
+                if not header["snapshot"]:
+                    if header["to_seq"] <= last:
+                        cur.execute("ROLLBACK;")
+                        result.to_seq = last
+                        result.skipped = True
+                        return result
+                    if header["from_seq"] > last:
+                        raise ValueError(f"{path}: batch mulai sesudah seq {header['from_seq']}, "
+                                         f"pusat baru sampai {last} (ada batch yang hilang)")
+
+                chunk = []
+                for line in f:
+                    event = json.loads(line)
+                    if event[1] and event[1] <= last:
+                        continue  # sudah diterapkan lewat batch sebelumnya
+                    chunk.append(event)
+                    if len(chunk) >= self.CHUNK:
+                        self._apply(cur, store_id, chunk, result)
+                        chunk = []
+                if chunk:
+                    self._apply(cur, store_id, chunk, result)
+
+                result.to_seq = max(last, header["to_seq"])
+                cur.execute("""
+                    INSERT INTO sync_stores(store_id, last_seq, imported_at) VALUES(?, ?, ?)
+                    ON CONFLICT(store_id) DO UPDATE SET last_seq = excluded.last_seq,
+                                                        imported_at = excluded.imported_at
+                """, (store_id, result.to_seq, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+                cur.execute("COMMIT;")
+            except Exception:
+                if self.conn.in_transaction:
+                    cur.execute("ROLLBACK;")
+                raise
+        result.elapsed_s = time.perf_counter() - t0
+        return result
+
+    def _apply(self, cur: sqlite3.Cursor, store_id: str, chunk: list, result: ImportResult):
+        """
+        Id order tidak pernah dipakai ulang di warung, jadi untuk satu order
+        'c' selalu datang sebelum 'v': order baru potongan ini ditulis dulu,
+        baru yang dihapus.
+        """
+        created = [e for e in chunk if e[0] == "c"]
+        voided = [e[2] for e in chunk if e[0] == "v"]
+
+        if created:
+            ids = [e[2] for e in created]
+            dead = {r[0] for r in cur.execute(
+                f"SELECT order_id FROM store_voided WHERE store_id = ? AND order_id IN ({','.join('?' * len(ids))})",
+                (store_id, *ids)
+            )}
+            created = [e for e in created if e[2] not in dead]
+            cur.executemany(
+                "INSERT OR REPLACE INTO store_orders(store_id, order_id, order_no, created_at, total) "
+                "VALUES(?, ?, ?, ?, ?)",
+                [(store_id, e[2], e[3], e[4], e[5]) for e in created]
+            )
+            cur.executemany(
+                "INSERT OR REPLACE INTO store_order_items(store_id, order_id, line, name, price, qty, note, subtotal) "
+                "VALUES(?, ?, ?, ?, ?, ?, ?, ?)",
+                [(store_id, e[2], line, *item) for e in created for line, item in enumerate(e[6])]
+            )
+            result.orders += len(created)
+
+        if voided:
+            rows = [(store_id, order_id) for order_id in voided]
+            cur.executemany("INSERT OR IGNORE INTO store_voided(store_id, order_id) VALUES(?, ?)", rows)
+            cur.executemany("DELETE FROM store_order_items WHERE store_id = ? AND order_id = ?", rows)
+            cur.executemany("DELETE FROM store_orders WHERE store_id = ? AND order_id = ?", rows)
+            result.voided += len(voided)
+
+
+def _batch_order(path: str) -> tuple:
+    """Urutkan file batch per store lalu seq awal (nama: <store>-<dari>-<sampai>.sync.gz)."""
+    name = os.path.basename(path)[:-len(".sync.gz")]
+    store, from_seq, to_seq = name.rsplit("-", 2)
+    return store, int(from_seq), int(to_seq)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Sync incremental order warung ke database pusat")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    ex = sub.add_parser("export", help="di warung: tulis batch perubahan sejak ack terakhir")
+    ex.add_argument("--db", default="pesanan_warung.db")
+    ex.add_argument("--store", required=True, help="id warung, mis. warung-a")
+    ex.add_argument("--ack", required=True, help="file ack dari pusat (belum ada = snapshot lengkap)")
+    ex.add_argument("--out-dir", required=True)
+
+    im = sub.add_parser("import", help="di pusat: terapkan file batch")
+    im.add_argument("--central", required=True, help="database pusat")
+    im.add_argument("--ack-dir", help="tulis <store>.ack ke folder ini")
+    im.add_argument("batches", nargs="+")
+    args = ap.parse_args(argv)
+
+    if args.command == "export":
+        db = Database(args.db, wal=True)
+        try:
+            db.init_schema()
+            result = export_changes(db, args.store, read_ack(args.ack), args.out_dir)
+        finally:
+            db.close()
+        if result.path is None:
+            print(f"tidak ada perubahan sesudah seq {result.from_seq}")
+        else:
+            kind = "snapshot" if result.snapshot else "incremental"
+            print(f"{kind} seq {result.from_seq}..{result.to_seq}: {result.orders} order, "
+                  f"{result.voided} dihapus -> {result.path} ({result.bytes} byte)")
+        return 0
+
+    central = CentralDatabase(args.central)
+    try:
+        for path in sorted(args.batches, key=_batch_order):
+            result = central.import_batch(path)
+            if result.skipped:
+                print(f"{path}: sudah diterapkan ({result.store_id} sampai seq {result.to_seq})")
+            else:
+                print(f"{path}: {result.orders} order, {result.voided} dihapus "
+                      f"({result.elapsed_s:.2f} s), {result.store_id} sampai seq {result.to_seq}")
+            if args.ack_dir:
+                write_ack(os.path.join(args.ack_dir, f"{result.store_id}.ack"), result.store_id, result.to_seq)
+    finally:
+        central.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import functools
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+
+TRACE_FORMAT = 1
+
+
+def encode_arg(value):
+    """Argumen method Database -> nilai JSON (datetime/date ditandai supaya bisa dikembalikan)."""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, dict):
+        return {k: encode_arg(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [encode_arg(v) for v in value]
+    return value
+
+
+def decode_arg(value):
+    if isinstance(value, dict):
+        if len(value) == 1 and "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if len(value) == 1 and "$d" in value:
+            return date.fromisoformat(value["$d"])
+        return {k: decode_arg(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_arg(v) for v in value]
+    return value
+
+
+class TraceRecorder:
+    """
+    Rekam setiap panggilan method publik Database (opsional, lihat
+    Database(recorder=...)) ke file trace untuk diputar ulang dengan
+    replay.py. Satu baris JSON per panggilan:
+
+        [detik sejak mulai, thread, method, args, kwargs, ms, error?]
+
+    Hanya panggilan terluar yang dicatat (get_order_with_items tidak ikut
+    mencatat get_order_by_id di dalamnya). Generator (iter_*) dicatat saat
+    habis dibaca/ditutup, dengan waktu total pembacaannya.
+
+    snapshot=True: salin database (backup API SQLite) ke <path>.db saat
+    Database pertama dipasang, supaya replay mulai dari isi yang sama.
+
+    Isi order (nama item, catatan) ikut tercatat; simpan file trace seperti
+    menyimpan database.
+    """
+
+    FLUSH_EVERY = 200  # baris
+
+    def __init__(self, path: str, snapshot: bool = False):
+        self.path = path
+        self.snapshot_path = path + ".db" if snapshot else None
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "wt", encoding="utf-8")
+        self._dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=repr).encode
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = {}  # thread ident -> nomor kecil
+        self._t0 = time.perf_counter()
+        self._started = False
+        self._pending = 0
+        self.calls = 0
+
+    def start(self, db) -> None:
+        """Dipanggil Database saat dipasang; header + snapshot hanya sekali."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            if self.snapshot_path:
+                if os.path.exists(self.snapshot_path):
+                    os.remove(self.snapshot_path)
+                dst = sqlite3.connect(self.snapshot_path)
+                try:
+                    db.conn.backup(dst)
+                finally:
+                    dst.close()
+            header = {
+                "format": TRACE_FORMAT,
+                "db": db.path,
+                "snapshot": self.snapshot_path,
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "wal": db.wal,
+                "cache_entries": db.cache.max_entries if db.cache is not None else 0,
+            }
+            self._file.write(self._dumps(header) + "\n")
+            self._t0 = time.perf_counter()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    # ---------- perekaman ----------
+
+    def wrap(self, name: str, fn):
+        """Bungkus method Database supaya panggilannya tercatat."""
+        @functools.wraps(fn)
+        def recorded(*args, **kwargs):
+            if self._depth():
+                return fn(*args, **kwargs)
+            # Iterable sekali-pakai (mis. generator order untuk create_orders_bulk)
+            # dijadikan list supaya bisa dicatat dan tetap dipakai method-nya
+            args = tuple(list(a) if isinstance(a, Iterator) else a for a in args)
+            t = time.perf_counter()
+            self._local.depth = 1
+            error = None
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self._local.depth = 0
+                if error is not None:
+                    self._write(t, name, args, kwargs, time.perf_counter() - t, error)
+            if isinstance(result, Iterator):
+                return self._wrap_iterator(t, name, args, kwargs, result)
+            self._write(t, name, args, kwargs, time.perf_counter() - t, None)
+            return result
+        return recorded
+
+    def _wrap_iterator(self, t: float, name: str, args, kwargs, it: Iterator):
+        spent = time.perf_counter() - t
+        error = None
+        try:
+            while True:
+                t1 = time.perf_counter()
+                self._local.depth = 1
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    self._local.depth = 0
+                    spent += time.perf_counter() - t1
+                yield item
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._write(t, name, args, kwargs, spent, error)
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def _write(self, t: float, name: str, args, kwargs, seconds: float, error: Optional[str]):
+        record = [round(t - self._t0, 6), self._thread(), name, encode_arg(args),
+                  encode_arg(kwargs), round(seconds * 1000, 3)]
+        if error is not None:
+            record.append(error)
+        line = self._dumps(record) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self.calls += 1
+            self._pending += 1
+            if self._pending >= self.FLUSH_EVERY:
+                self._file.flush()
+                self._pending = 0
+
+    def _thread(self) -> int:
+        ident = threading.get_ident()
+        n = self._threads.get(ident)
+        if n is None:
+            with self._lock:
+                n = self._threads.setdefault(ident, len(self._threads))
+        return n
+
+
+def read_trace(path: str) -> tuple[dict, list]:
+    """(header, [record]) diurutkan menurut waktu mulai panggilan."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path}: format trace {header.get('format')} tidak dikenal")
+        records = []
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # baris terakhir terpotong (aplikasi mati sebelum flush)
+    records.sort(key=lambda r: r[0])
+    return header, records
@@ -1,27 +1,68 @@
-from database_handler import Database, rupiah
+from async_db import AsyncDatabase
+from database_handler import OrderItemRow, rupiah
 from receipt_printer import ReceiptPrinter
+from escpos import send_raw
+from order_journal import OrderJournal
+from orders_model import OrdersTableModel
+from export import export_orders
 
 import calendar
-from datetime import datetime
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
+from datetime import date, datetime, timedelta
+from typing import Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QTableWidget, QTableWidgetItem, QHeaderView,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView,
     QPushButton, QMessageBox, QGroupBox, QComboBox, QSpinBox,
-    QScrollArea, QFrame, QSizePolicy
+    QScrollArea, QFrame, QSizePolicy, QFileDialog, QLineEdit
 )
 
 
 # -------------------- Tab 2: View Orders --------------------
+def _send_raw(db, data: bytes, target: str):
+    """Dijalankan lewat AsyncDatabase.submit: koneksi ke printer bisa
+    menunggu sampai timeout kalau printer mati atau tercabut."""
+    send_raw(data, target)
+
+
 class ViewOrdersWidget(QWidget):
     """Widget for viewing orders, order details, and sales analytics."""
 
-    def __init__(self, db: Database):
+    # Jeda sebelum grafik di-refresh setelah bulan/tahun diganti (ms), supaya
+    # menahan panah spinbox tidak memicu puluhan query + redraw
+    CHART_DEBOUNCE_MS = 150
+    # Jeda setelah berhenti mengetik sebelum pencarian dijalankan (ms)
+    SEARCH_DEBOUNCE_MS = 200
+    # Pilihan rentang waktu pencarian: (label, jumlah hari ke belakang; None = semua)
+    SEARCH_RANGES = [
+        ("Semua waktu", None),
+        ("Hari ini", 1),
+        ("7 hari terakhir", 7),
+        ("30 hari terakhir", 30),
+    ]
+    # Periode analitik item: (label, jumlah hari ke belakang; None = semua)
+    ANALYTICS_PERIODS = [
+        ("30 hari terakhir", 30),
+        ("90 hari terakhir", 90),
+        ("1 tahun terakhir", 365),
+        ("Semua waktu", None),
+    ]
+    ANALYTICS_TOP_N = 5
+    # Jumlah baris di atas/bawah order terpilih yang itemnya dimuat duluan
+    PREFETCH_RADIUS = 10
+
+    def __init__(self, db: AsyncDatabase, raw_printer: Optional[str] = None,
+                 journal: Optional[OrderJournal] = None):
+        """
+        raw_printer: target printer thermal ESC/POS ("tcp://host:port" atau
+        path device). Kalau diisi, CETAK STRUK langsung mencetak tanpa dialog;
+        kalau None, tampilkan preview HTML seperti biasa.
+        journal: kalau diisi, order yang belum di-commit ikut ditampilkan.
+        """
         super().__init__()
         self.db = db
+        self.raw_printer = raw_printer
         self.current_order_id = None
         self.current_order_no = None
         
@@ -52,19 +93,32 @@ class ViewOrdersWidget(QWidget):
 
         # ==================== ORDERS TABLE SECTION ====================
         title = QLabel("DAFTAR PESANAN")
-        title.setStyleSheet("font-weight: bold; font-size: 14px;")
+        title.setObjectName("sectionTitle")
         vlayout.addWidget(title)
 
-        # Tabel orders (tampilan awal)
-        self.tbl_orders = QTableWidget()
-        self.tbl_orders.setColumnCount(3)
-        self.tbl_orders.setHorizontalHeaderLabels(["Nomor Pesanan", "Waktu Pesanan", "Total Harga"])
+        # Kotak cari: nama item / catatan, hasil muncul sambil mengetik
+        search_layout = QHBoxLayout()
+        self.txt_search = QLineEdit()
+        self.txt_search.setPlaceholderText("Cari item atau catatan, mis. \"nasi gor\" atau \"pedas\"")
+        self.txt_search.setClearButtonEnabled(True)
+        search_layout.addWidget(self.txt_search, 1)
+        self.cmb_search_range = QComboBox()
+        self.cmb_search_range.addItems([label for label, _ in self.SEARCH_RANGES])
+        search_layout.addWidget(self.cmb_search_range)
+        vlayout.addLayout(search_layout)
+
+        # Tabel orders (tampilan awal), dimuat bertahap lewat model
+        self.orders_model = OrdersTableModel(self.db, journal=journal, parent=self)
+        self.tbl_orders = QTableView()
+        self.tbl_orders.setModel(self.orders_model)
+        self.tbl_orders.verticalHeader().setVisible(False)
         self.tbl_orders.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.tbl_orders.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.tbl_orders.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        self.tbl_orders.setSelectionBehavior(QTableWidget.SelectRows)
-        self.tbl_orders.setSelectionMode(QTableWidget.SingleSelection)
-        self.tbl_orders.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tbl_orders.setSelectionBehavior(QTableView.SelectRows)
+        # Ctrl/Shift-klik untuk memilih beberapa pesanan sekaligus (hapus massal)
+        self.tbl_orders.setSelectionMode(QTableView.ExtendedSelection)
+        self.tbl_orders.setEditTriggers(QTableView.NoEditTriggers)
         self.tbl_orders.setMinimumHeight(250)
         self.tbl_orders.setMaximumHeight(350)
         self.tbl_orders.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -72,7 +126,7 @@ class ViewOrdersWidget(QWidget):
 
         # ==================== ORDER DETAIL SECTION ====================
         self.lbl_detail = QLabel("Detail Pesanan: (pilih salah satu pesanan)")
-        self.lbl_detail.setStyleSheet("font-weight: bold;")
+        self.lbl_detail.setObjectName("boldLabel")
         vlayout.addWidget(self.lbl_detail)
 
         self.tbl_detail = QTableWidget()
@@ -104,6 +158,13 @@ class ViewOrdersWidget(QWidget):
         self.btn_delete.setEnabled(False)  # Disabled sampai ada order dipilih
         self.btn_delete.clicked.connect(self.on_delete_clicked)
         btn_layout.addWidget(self.btn_delete)
+
+        self.btn_export = QPushButton("EKSPOR DATA")
+        self.btn_export.setFixedHeight(45)
+        self.btn_export.setObjectName("secondaryButton")
+        self.btn_export.setToolTip("Ekspor pesanan pada bulan/tahun grafik ke CSV atau JSONL")
+        self.btn_export.clicked.connect(self.on_export_clicked)
+        btn_layout.addWidget(self.btn_export)
         
         btn_layout.addStretch(1)
         vlayout.addLayout(btn_layout)
@@ -131,45 +192,117 @@ class ViewOrdersWidget(QWidget):
         filter_layout.addStretch(1)
         analytics_layout.addLayout(filter_layout)
 
-        self.figure = Figure(figsize=(8, 3), dpi=100)
-        self.canvas = FigureCanvasQTAgg(self.figure)
-        self.canvas.setMinimumHeight(280)
-        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        analytics_layout.addWidget(self.canvas)
+        # Canvas matplotlib dibuat setelah tab tampil (lihat _init_chart);
+        # sementara itu placeholder setinggi canvas supaya layout tidak loncat
+        self.figure = None
+        self.canvas = None
+        self.sales_chart = None
+        self._chart_placeholder = QLabel("Memuat grafik...")
+        self._chart_placeholder.setAlignment(Qt.AlignCenter)
+        self._chart_placeholder.setMinimumHeight(280)
+        self._chart_placeholder.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._analytics_layout = analytics_layout
+        analytics_layout.addWidget(self._chart_placeholder)
 
         vlayout.addWidget(analytics_group)
 
+        # ANALISIS ITEM (menu terlaris, heatmap jam ramai, pasangan item)
+        items_group = QGroupBox("ANALISIS ITEM")
+        items_layout = QVBoxLayout(items_group)
+
+        period_layout = QHBoxLayout()
+        period_layout.addWidget(QLabel("Periode:"))
+        self.cmb_analytics_period = QComboBox()
+        self.cmb_analytics_period.addItems([label for label, _ in self.ANALYTICS_PERIODS])
+        period_layout.addWidget(self.cmb_analytics_period)
+        period_layout.addStretch(1)
+        items_layout.addLayout(period_layout)
+
+        # Sama seperti grafik penjualan: canvas + NumPy dibuat di _init_chart
+        self.item_analytics = None
+        self.item_canvas = None
+        self.item_charts = None
+        self._items_placeholder = QLabel("Memuat analisis...")
+        self._items_placeholder.setAlignment(Qt.AlignCenter)
+        self._items_placeholder.setMinimumHeight(300)
+        self._items_placeholder.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._items_layout = items_layout
+        items_layout.addWidget(self._items_placeholder)
+
+        vlayout.addWidget(items_group)
+
         vlayout.addStretch(1)
 
         scroll_area.setWidget(content_widget)
         main_layout.addWidget(scroll_area)
 
-        self.cmb_month.currentIndexChanged.connect(self.refresh_sales_chart)
-        self.spn_year.valueChanged.connect(self.refresh_sales_chart)
-        self.tbl_orders.itemSelectionChanged.connect(self.on_order_selected)
+        self._chart_timer = QTimer(self)
+        self._chart_timer.setSingleShot(True)
+        self._chart_timer.setInterval(self.CHART_DEBOUNCE_MS)
+        self._chart_timer.timeout.connect(self.refresh_sales_chart)
 
-        self.reload_orders()
-        self.refresh_sales_chart()  # chart render
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.apply_search)
 
+        self.txt_search.textChanged.connect(self._search_timer.start)
+        self.cmb_search_range.currentIndexChanged.connect(self.apply_search)
+        self.cmb_analytics_period.currentIndexChanged.connect(self.refresh_item_charts)
+        self.cmb_month.currentIndexChanged.connect(self.schedule_chart_refresh)
+        self.spn_year.valueChanged.connect(self.schedule_chart_refresh)
+        self.tbl_orders.selectionModel().selectionChanged.connect(self.on_order_selected)
 
-    def reload_orders(self):
-        orders = self.db.list_orders()
-        self.tbl_orders.setRowCount(len(orders))
+        self.reload_orders()
+        # Import matplotlib + render grafik sesudah frame pertama tab ini
+        QTimer.singleShot(0, self._init_chart)
 
-        for r, o in enumerate(orders):
-            # Simpan order_id di UserRole cell pertama supaya gampang diambil saat klik
-            it_no = QTableWidgetItem(o["order_no"])
-            it_no.setData(Qt.UserRole, int(o["id"]))
+    def _init_chart(self):
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+        from matplotlib.figure import Figure
+        from analytics import ItemAnalytics
+        from item_charts import ItemCharts
+        from sales_chart import SalesChart
 
-            it_time = QTableWidgetItem(o["created_at"])
-            it_total = QTableWidgetItem(rupiah(int(o["total"])))
-            it_total.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.figure = Figure(figsize=(8, 3), dpi=100)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.canvas.setMinimumHeight(280)
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._analytics_layout.replaceWidget(self._chart_placeholder, self.canvas)
+        self._chart_placeholder.deleteLater()
+        self._chart_placeholder = None
+        self.sales_chart = SalesChart(self.figure, self.canvas)
+        self.refresh_sales_chart()  # chart render
 
-            self.tbl_orders.setItem(r, 0, it_no)
-            self.tbl_orders.setItem(r, 1, it_time)
-            self.tbl_orders.setItem(r, 2, it_total)
+        item_figure = Figure(figsize=(12, 3.2), dpi=100)
+        self.item_canvas = FigureCanvasQTAgg(item_figure)
+        self.item_canvas.setMinimumHeight(300)
+        self.item_canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._items_layout.replaceWidget(self._items_placeholder, self.item_canvas)
+        self._items_placeholder.deleteLater()
+        self._items_placeholder = None
+        self.item_charts = ItemCharts(item_figure, self.item_canvas)
+        # Kolom item dimuat sekali di thread worker, lalu hanya ditambah yang baru
+        self.item_analytics = ItemAnalytics()
+        self.refresh_item_charts()
+
+
+    def apply_search(self):
+        """Terapkan teks cari + rentang waktu ke daftar pesanan."""
+        self._search_timer.stop()
+        days = self.SEARCH_RANGES[self.cmb_search_range.currentIndex()][1]
+        date_from = None if days is None else date.today() - timedelta(days=days - 1)
+        self.orders_model.set_search(self.txt_search.text(), date_from)
+        self.reload_orders()
+
+    def reload_orders(self):
+        # Hanya halaman pertama yang dimuat; sisanya diambil saat di-scroll.
+        # Diminta langsung karena view yang belum tampil tidak memanggil fetchMore
+        self.orders_model.reload()
+        self.orders_model.fetchMore()
 
         # Reset detail
+        self.db.cancel("order_detail")
         self.current_order_id = None
         self.current_order_no = None
         self.lbl_detail.setText("Detail Pesanan: (pilih salah satu pesanan)")
@@ -179,63 +312,117 @@ class ViewOrdersWidget(QWidget):
         self.btn_delete.setEnabled(False)
 
     def on_order_selected(self):
-        items = self.tbl_orders.selectedItems()
-        if not items:
+        if not self.tbl_orders.selectionModel().hasSelection():
             return
 
-        # karena SelectRows, selectedItems bisa banyak; ambil cell kolom 0 dari row terpilih
-        row = self.tbl_orders.currentRow()
+        row = self.tbl_orders.currentIndex().row()
         if row < 0:
             return
 
-        it_no = self.tbl_orders.item(row, 0)
-        order_id = int(it_no.data(Qt.UserRole))
-        order_no = it_no.text()
+        order_id, order_no = self.orders_model.order_at(row)
 
         self.current_order_id = order_id
         self.current_order_no = order_no
-        self.load_order_detail(order_id, order_no)
-        self.btn_print.setEnabled(True)
-        self.btn_delete.setEnabled(True)
+        if order_id is None:
+            # Order tertunda di journal: detail dari memori, belum bisa dicetak/dihapus
+            self.db.cancel("order_detail")
+            self._show_order_detail(f"{order_no} (tertunda)", [
+                OrderItemRow(it["name"], it["price"], it["qty"], it["note"], it["price"] * it["qty"], None)
+                for it in self.orders_model.pending_items(order_no)
+            ])
+        else:
+            self.load_order_detail(order_id, order_no)
+            self.prefetch_neighbours(row)
+        self.btn_print.setEnabled(order_id is not None)
+        self.btn_delete.setEnabled(order_id is not None)
+
+    def on_journal_flushed(self):
+        """Dipanggil setelah journal meng-commit order tertunda."""
+        self.orders_model.on_journal_flushed()
+        self.schedule_chart_refresh()
+        self.refresh_item_charts()
+
+    def selected_order_ids(self) -> list[tuple[int, str]]:
+        """(order_id, order_no) semua baris terpilih yang sudah ada di database."""
+        selected = []
+        for index in self.tbl_orders.selectionModel().selectedRows():
+            order_id, order_no = self.orders_model.order_at(index.row())
+            if order_id is not None:
+                selected.append((order_id, order_no))
+        return selected
 
     def on_delete_clicked(self):
-        if self.current_order_id is None:
+        selected = self.selected_order_ids()
+        if not selected:
             QMessageBox.warning(self, "Peringatan", "Pilih pesanan terlebih dahulu.")
             return
 
+        if len(selected) == 1:
+            label = f"pesanan {selected[0][1]}"
+        else:
+            label = f"{len(selected)} pesanan"
+
         # Confirmation dialog
         reply = QMessageBox.question(
             self,
             "Konfirmasi Hapus",
-            f"Apakah Anda yakin ingin menghapus pesanan {self.current_order_no}?\n\n"
+            f"Apakah Anda yakin ingin menghapus {label}?\n\n"
             "Tindakan ini tidak dapat dibatalkan.",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                self.db.delete_order(self.current_order_id)
-                QMessageBox.information(self, "Sukses", f"Pesanan {self.current_order_no} berhasil dihapus.")
-                self.reload_orders()
-                self.refresh_sales_chart()  # Refresh chart after deletion
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal menghapus pesanan:\n{e}")
+            self.btn_delete.setEnabled(False)
+            # Tercatat di voided_orders; banyak order dihapus per transaksi kecil.
+            # Ruang kosong baru dikembalikan kalau sudah banyak (RECLAIM_MIN_FREE_PAGES)
+            self.db.submit(
+                "void_orders", [order_id for order_id, _ in selected],
+                reason="dihapus dari View Orders",
+                on_result=lambda _: self._on_order_deleted(label),
+                on_error=self._on_delete_failed,
+            )
+
+    def _on_order_deleted(self, label: str):
+        QMessageBox.information(self, "Sukses", f"{label[0].upper()}{label[1:]} berhasil dihapus.")
+        self.reload_orders()
+        self.refresh_sales_chart()  # Refresh chart after deletion
+        self.refresh_item_charts()
+
+    def _on_delete_failed(self, e: Exception):
+        self.btn_delete.setEnabled(self.current_order_id is not None)
+        QMessageBox.critical(self, "Error", f"Gagal menghapus pesanan:\n{e}")
 
     def load_order_detail(self, order_id: int, order_no: str):
-        details = self.db.list_order_items(order_id)
+        # Hasil prefetch ada di cache bersama, jadi di thread worker pun cepat.
+        # key sama: klik order lain membatalkan request detail sebelumnya
+        self.db.submit(
+            "list_order_items", order_id,
+            on_result=lambda details: self._show_order_detail(order_no, details),
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Gagal memuat detail pesanan:\n{e}"),
+            key="order_detail",
+        )
 
+    def prefetch_neighbours(self, row: int):
+        """Muat item order di sekitar baris terpilih, supaya panah atas/bawah terasa instan."""
+        if self.db.db.cache is None:
+            return
+        ids = self.orders_model.neighbour_ids(row, self.PREFETCH_RADIUS)
+        if ids:
+            self.db.submit("prefetch_order_items", ids, key="order_prefetch")
+
+    def _show_order_detail(self, order_no: str, details):
         self.lbl_detail.setText(f"Detail Pesanan: {order_no}")
         self.tbl_detail.setVisible(True)
         self.tbl_detail.setRowCount(len(details))
 
         for r, d in enumerate(details):
-            it_name = QTableWidgetItem(d["item_name"])
-            it_qty = QTableWidgetItem(str(int(d["qty"])))
+            it_name = QTableWidgetItem(d.item_name)
+            it_qty = QTableWidgetItem(str(d.qty))
             it_qty.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
-            it_note = QTableWidgetItem(d["note"] or "")
-            it_sub = QTableWidgetItem(rupiah(int(d["subtotal"])))
+            it_note = QTableWidgetItem(d.note or "")
+            it_sub = QTableWidgetItem(rupiah(d.subtotal))
             it_sub.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
             self.tbl_detail.setItem(r, 0, it_name)
@@ -243,55 +430,74 @@ class ViewOrdersWidget(QWidget):
             self.tbl_detail.setItem(r, 2, it_note)
             self.tbl_detail.setItem(r, 3, it_sub)
 
+    def schedule_chart_refresh(self):
+        """Refresh grafik setelah input bulan/tahun berhenti berubah."""
+        self._chart_timer.start()
+
     def refresh_sales_chart(self):
         """Refresh the sales bar chart based on selected month/year."""
+        self._chart_timer.stop()
+        if self.sales_chart is None:
+            return  # _init_chart akan me-refresh sendiri
         month = self.cmb_month.currentIndex() + 1  # 1-indexed
         year = self.spn_year.value()
-        
-        # Get month name for title
-        month_names = ["Januari", "Februari", "Maret", "April", "Mei", "Juni",
-                       "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
-        month_name = month_names[month - 1]
-        
-        # Get number of days in the month
+
+        self.db.submit(
+            "get_monthly_sales", month, year,
+            on_result=lambda sales_data: self.sales_chart.update(month, year, sales_data),
+            on_error=lambda e: print(f"Warning: gagal memuat grafik penjualan: {e!r}"),
+            key="sales_chart",
+        )
+
+    def refresh_item_charts(self):
+        """Muat item baru ke ItemAnalytics lalu gambar ulang grafik analisis item."""
+        if self.item_charts is None:
+            return  # _init_chart akan me-refresh sendiri
+        label, days = self.ANALYTICS_PERIODS[self.cmb_analytics_period.currentIndex()]
+        since = None
+        if days is not None:
+            since = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+
+        self.db.submit(
+            self.item_analytics.report, self.ANALYTICS_TOP_N, since,
+            on_result=lambda report: self.item_charts.update(report, label),
+            on_error=lambda e: print(f"Warning: gagal memuat analisis item: {e!r}"),
+            key="item_analytics",
+        )
+
+    # FUNCTION EKSPOR
+
+    def on_export_clicked(self):
+        """Ekspor pesanan bulan/tahun yang dipilih di filter grafik."""
+        month = self.cmb_month.currentIndex() + 1
+        year = self.spn_year.value()
         _, num_days = calendar.monthrange(year, month)
-        
-        # Fetch sales data from database
-        sales_data = self.db.get_monthly_sales(month, year)
-        sales_dict = {day: total for day, total in sales_data}
-        
-        # Zero-fill missing days
-        days = list(range(1, num_days + 1))
-        totals = [sales_dict.get(day, 0) for day in days]
-        
-        # Clear and redraw the figure
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        # Create bar chart
-        bars = ax.bar(days, totals, color='#4A90D9', edgecolor='#2E5D8C', linewidth=0.5)
-        
-        # Style the chart
-        ax.set_xlabel('Tanggal', fontsize=9)
-        ax.set_ylabel('Total Penjualan (Rp)', fontsize=9)
-        ax.set_title(f'GRAFIK PENJUALAN: {month_name} {year}', fontsize=11, fontweight='bold')
-        
-        # X-axis: show all days but rotate labels if crowded
-        ax.set_xticks(days)
-        ax.set_xticklabels(days, rotation=45 if num_days > 20 else 0, ha='right' if num_days > 20 else 'center', fontsize=7)
-        
-        # Y-axis: format as currency
-        ax.yaxis.set_major_formatter(lambda x, p: f'Rp{x/1000:.0f}K' if x >= 1000 else f'Rp{x:.0f}')
-        
-        # Add grid lines for readability
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        ax.set_axisbelow(True)
-        
-        # Tight layout to prevent label cutoff
-        self.figure.tight_layout()
-        
-        # Redraw the canvas
-        self.canvas.draw()
+
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Ekspor Pesanan", f"pesanan_{year}-{month:02d}.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl)"
+        )
+        if not path:
+            return
+        fmt = "jsonl" if path.endswith(".jsonl") or selected.startswith("JSON") else "csv"
+
+        self.btn_export.setEnabled(False)
+        self.db.submit(
+            export_orders, path, fmt,
+            f"{year}-{month:02d}-01", f"{year}-{month:02d}-{num_days:02d}",
+            on_result=self._on_export_done,
+            on_error=self._on_export_failed,
+        )
+
+    def _on_export_done(self, result):
+        self.btn_export.setEnabled(True)
+        QMessageBox.information(
+            self, "Sukses", f"{result.orders} pesanan ({result.rows} baris) diekspor ke:\n{result.path}"
+        )
+
+    def _on_export_failed(self, e: Exception):
+        self.btn_export.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Gagal mengekspor pesanan:\n{e}")
 
     # FUNCTION PRINT STRUK
 
@@ -301,15 +507,29 @@ class ViewOrdersWidget(QWidget):
             QMessageBox.warning(self, "Peringatan", "Pilih pesanan terlebih dahulu.")
             return
 
+        order_id = self.current_order_id
+        self.db.submit(
+            "get_order_with_items", order_id,
+            on_result=lambda detail: self._print_order(order_id, detail),
+            on_error=self._on_print_failed,
+            key="print",
+        )
+
+    def _print_order(self, order_id: int, detail):
         try:
-            # Fetch order data from database
-            order = self.db.get_order_by_id(self.current_order_id)
-            if order is None:
-                raise ValueError(f"Order dengan ID {self.current_order_id} tidak ditemukan.")
-            
-            items = self.db.list_order_items(self.current_order_id)
-            
+            if detail is None:
+                raise ValueError(f"Order dengan ID {order_id} tidak ditemukan.")
+            order, items = detail
+
             # Delegate printing to ReceiptPrinter
-            self.receipt_printer.print_receipt(self, order, items)
+            if self.raw_printer:
+                # Render di sini (cepat), kirim ke printer di thread worker
+                data = self.receipt_printer.render_escpos(order, items)
+                self.db.submit(_send_raw, data, self.raw_printer, on_error=self._on_print_failed)
+            else:
+                self.receipt_printer.print_receipt(self, order, items)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Gagal mencetak struk:\n{e}")
+            self._on_print_failed(e)
+
+    def _on_print_failed(self, e: Exception):
+        QMessageBox.critical(self, "Error", f"Gagal mencetak struk:\n{e}")